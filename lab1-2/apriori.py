@@ -1,14 +1,42 @@
 from typing import (
     Any,
+    Callable,
     Dict,
     FrozenSet,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Set,
     Tuple,
 )
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from itertools import combinations
+from functools import partial
+from itertools import combinations, compress, groupby, islice, repeat
+from math import ceil, comb, log, sqrt
+from itemsets import ItemSetTable
+import numpy as np
+import os
+import pandas as pd
+import random
+from rules import RuleSet
+from stats import LevelStats, MiningStats, SamplingStats
+from tabular import ItemMatrix
+from time import perf_counter
+from transactions import TransactionStore
+
+
+# Максимальное количество подмножеств одной транзакции при подсчёте KEYS,
+# транзакции с большим количеством подмножеств обходят префиксное дерево
+KEYS_MAX_SUBSETS: int = 4096
+
+# Максимальное количество ключей подмножеств, обрабатываемых за одну операцию
+KEYS_BLOCK_SIZE: int = 1 << 20
+
+# Вероятность того, что поддержка набора по выборке отклонится от истинной
+# больше чем на epsilon (для оценки Хёфдинга при поиске по выборке)
+SAMPLING_DELTA: float = 0.05
 
 
 class OrderedType(int, Enum):
@@ -18,6 +46,30 @@ class OrderedType(int, Enum):
     LEXICAL_DESCENDING = 4
 
 
+class CountingType(int, Enum):
+    SCAN = 1
+    BITSET = 2
+    TRIE = 3
+    KEYS = 4
+
+
+class TrimmingType(int, Enum):
+    NONE = 1
+    TRIM = 2
+    TRIM_WEIGHTED = 3
+
+
+class OutputType(int, Enum):
+    ALL = 1
+    CLOSED = 2
+    MAXIMAL = 3
+
+
+class SamplingType(int, Enum):
+    VERIFY = 1
+    APPROXIMATE = 2
+
+
 def _calc_support(item_set: Set[int], data_set: List[Set[int]]) -> float:
     """Вычисляет поддержку для набора элементов.
 
@@ -28,7 +80,7 @@ def _calc_support(item_set: Set[int], data_set: List[Set[int]]) -> float:
     Возвращает:
         float: Поддержка набора элементов.
     """
-    return sum([item_set.issubset(transaction) for transaction in data_set]) / len(
+    return sum([transaction.issuperset(item_set) for transaction in data_set]) / len(
         data_set
     )
 
@@ -46,26 +98,484 @@ def _calc_support_candidate(
     Возвращает:
         Dict[Tuple[int], float]: Словарь, содержащий поддержку для каждого набора элементов-кандидата, где ключи - наборы элементов, а значения - их поддержки.
     """
+    supports = {item: _calc_support(item, data_set) for item in candidate}
     return {
-        item: _calc_support(item, data_set)
+        item: support for item, support in supports.items() if support >= min_support
+    }
+
+
+def _calc_support_candidate_weighted(
+    rows: List[Tuple[FrozenSet[int], int]],
+    candidate: List[Tuple[int]],
+    min_support: float,
+    n_transactions: int,
+) -> Dict[Tuple[int], float]:
+    """Вычисляет поддержку для наборов элементов-кандидатов по сокращённому набору
+    данных, в котором каждая строка - транзакция и количество её повторов.
+
+    Аргументы:
+        rows (List[Tuple[FrozenSet[int], int]]): Строки (транзакция, вес).
+        candidate (List[Tuple[int]]): Наборы элементов-кандидатов.
+        min_support (float): Минимальная поддержка, необходимая для того, чтобы набор элементов считался часто встречающимся.
+        n_transactions (int): Количество транзакций в исходном наборе данных.
+
+    Возвращает:
+        Dict[Tuple[int], float]: Поддержка часто встречающихся кандидатов.
+    """
+    supports = {
+        item: sum(
+            weight for transaction, weight in rows if transaction.issuperset(item)
+        )
+        / n_transactions
         for item in candidate
-        if (_calc_support(item, data_set) >= min_support)
     }
+    return {
+        item: support for item, support in supports.items() if support >= min_support
+    }
+
+
+def _build_candidate_trie(candidate: List[Tuple[int]]) -> Dict[int, Any]:
+    """Строит префиксное дерево кандидатов.
+
+    Внутренние узлы - словари по очередному элементу, в листьях (на глубине,
+    равной длине кандидатов) хранится номер кандидата в списке candidate.
+
+    Аргументы:
+        candidate (List[Tuple[int]]): Наборы элементов-кандидатов одной длины.
+
+    Возвращает:
+        Dict[int, Any]: Корень префиксного дерева.
+    """
+    root: Dict[int, Any] = {}
+    for index, item_set in enumerate(candidate):
+        node = root
+        for item in item_set[:-1]:
+            node = node.setdefault(item, {})
+        node[item_set[-1]] = index
+    return root
+
+
+def _count_trie(
+    node: Dict[int, Any],
+    transaction: Tuple[int],
+    start: int,
+    depth: int,
+    counts: List[int],
+    weight: int,
+):
+    """Увеличивает счётчики всех кандидатов префиксного дерева, содержащихся в
+    упорядоченной транзакции.
+
+    Аргументы:
+        node (Dict[int, Any]): Текущий узел дерева.
+        transaction (Tuple[int]): Упорядоченная транзакция.
+        start (int): Позиция транзакции, с которой ищется следующий элемент.
+        depth (int): Количество элементов, которые осталось найти.
+        counts (List[int]): Счётчики кандидатов.
+        weight (int): Вес транзакции.
+    """
+    if depth == 1:
+        for item in transaction[start:]:
+            index = node.get(item)
+            if index is not None:
+                counts[index] += weight
+        return
+    # Оставляем в транзакции место для остальных depth-1 элементов
+    for position in range(start, len(transaction) - depth + 1):
+        child = node.get(transaction[position])
+        if child is not None:
+            _count_trie(child, transaction, position + 1, depth - 1, counts, weight)
+
+
+def _calc_support_candidate_trie(
+    rows: List[Tuple[FrozenSet[int], int]],
+    candidate: List[Tuple[int]],
+    min_support: float,
+    n_transactions: int,
+) -> Dict[Tuple[int], float]:
+    """Вычисляет поддержку для наборов элементов-кандидатов за один проход по
+    транзакциям с помощью префиксного дерева кандидатов.
+
+    Каждая транзакция один раз обходит дерево и увеличивает счётчики всех
+    содержащихся в ней кандидатов, поэтому время растёт с объёмом данных, а не
+    с произведением количества кандидатов на количество транзакций.
+
+    Аргументы:
+        rows (List[Tuple[FrozenSet[int], int]]): Строки (транзакция, вес).
+        candidate (List[Tuple[int]]): Наборы элементов-кандидатов одной длины.
+        min_support (float): Минимальная поддержка, необходимая для того, чтобы набор элементов считался часто встречающимся.
+        n_transactions (int): Количество транзакций в исходном наборе данных.
+
+    Возвращает:
+        Dict[Tuple[int], float]: Поддержка часто встречающихся кандидатов.
+    """
+    if not candidate:
+        return {}
+    length = len(candidate[0])
+    root = _build_candidate_trie(candidate)
+    # Элементы, не входящие ни в одного кандидата, не нужны при обходе
+    items = frozenset(item for item_set in candidate for item in item_set)
+    counts = [0] * len(candidate)
+    for transaction, weight in rows:
+        transaction = tuple(sorted(items.intersection(transaction)))
+        if len(transaction) >= length:
+            _count_trie(root, transaction, 0, length, counts, weight)
+    return {
+        item_set: count / n_transactions
+        for item_set, count in zip(candidate, counts)
+        if count / n_transactions >= min_support
+    }
+
+
+def _calc_support_candidate_keys(
+    rows: List[Tuple[FrozenSet[int], int]],
+    candidate: List[Tuple[int]],
+    min_support: float,
+    n_transactions: int,
+) -> Dict[Tuple[int], float]:
+    """Вычисляет поддержку для наборов элементов-кандидатов за один проход по
+    транзакциям с помощью NumPy.
+
+    Элементы кандидатов нумеруются 0..m-1, и каждый набор длины k получает
+    целочисленный ключ - запись его номеров в системе счисления с основанием m.
+    Транзакции группируются по длине, для каждой группы все подмножества длины
+    k строятся одной операцией индексирования, их ключи ищутся среди ключей
+    кандидатов через np.searchsorted, а совпадения суммируются np.bincount.
+    Транзакции со слишком большим числом подмножеств и случаи, когда ключ не
+    помещается в int64, обрабатываются префиксным деревом.
+
+    Аргументы:
+        rows (List[Tuple[FrozenSet[int], int]]): Строки (транзакция, вес).
+        candidate (List[Tuple[int]]): Наборы элементов-кандидатов одной длины.
+        min_support (float): Минимальная поддержка, необходимая для того, чтобы набор элементов считался часто встречающимся.
+        n_transactions (int): Количество транзакций в исходном наборе данных.
+
+    Возвращает:
+        Dict[Tuple[int], float]: Поддержка часто встречающихся кандидатов.
+    """
+    if not candidate:
+        return {}
+    length = len(candidate[0])
+    items = sorted({item for item_set in candidate for item in item_set})
+    if len(items) ** length >= 2**63:
+        return _calc_support_candidate_trie(
+            rows, candidate, min_support, n_transactions
+        )
+    index = {item: i for i, item in enumerate(items)}
+    candidate_items = frozenset(items)
+
+    def subset_keys(array: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        # Ключ по схеме Горнера: ((c0 * m + c1) * m + c2)...
+        keys = array[:, columns[:, 0]]
+        for j in range(1, length):
+            keys = keys * len(items) + array[:, columns[:, j]]
+        return keys
+
+    # Номера элементов возрастают вместе с элементами, поэтому кандидаты и
+    # подмножества упорядоченных транзакций кодируются одинаково
+    keys = subset_keys(
+        np.array(
+            [[index[item] for item in item_set] for item_set in candidate],
+            dtype=np.int64,
+        ),
+        np.arange(length)[None, :],
+    )[:, 0]
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+
+    # Группируем транзакции по длине после удаления лишних элементов
+    groups: Dict[int, Tuple[List[List[int]], List[int]]] = {}
+    long_rows: List[Tuple[FrozenSet[int], int]] = []
+    for transaction, weight in rows:
+        transaction = sorted(map(index.__getitem__, candidate_items & transaction))
+        if len(transaction) < length:
+            continue
+        if comb(len(transaction), length) > KEYS_MAX_SUBSETS:
+            long_rows.append((frozenset(items[i] for i in transaction), weight))
+            continue
+        group = groups.setdefault(len(transaction), ([], []))
+        group[0].append(transaction)
+        group[1].append(weight)
+
+    counts = np.zeros(len(candidate), dtype=np.int64)
+    for size, (transactions, weights) in groups.items():
+        subsets = np.array(list(combinations(range(size), length)), dtype=np.intp)
+        step = max(KEYS_BLOCK_SIZE // len(subsets), 1)
+        for block in range(0, len(transactions), step):
+            block_transactions = np.array(
+                transactions[block : block + step], dtype=np.int64
+            )
+            block_weights = np.array(weights[block : block + step], dtype=np.int64)
+            block_keys = subset_keys(block_transactions, subsets)
+            positions = np.minimum(
+                np.searchsorted(sorted_keys, block_keys), len(sorted_keys) - 1
+            )
+            found = sorted_keys[positions] == block_keys
+            counts += np.bincount(
+                order[positions[found]],
+                weights=np.broadcast_to(block_weights[:, None], found.shape)[found],
+                minlength=len(candidate),
+            ).astype(np.int64)
+
+    if long_rows:
+        long_counts = [0] * len(candidate)
+        root = _build_candidate_trie(candidate)
+        for transaction, weight in long_rows:
+            _count_trie(
+                root, tuple(sorted(transaction)), 0, length, long_counts, weight
+            )
+        counts += np.array(long_counts, dtype=np.int64)
+
+    return {
+        item_set: count / n_transactions
+        for item_set, count in zip(candidate, counts.tolist())
+        if count / n_transactions >= min_support
+    }
+
+
+def _trim_transactions(
+    rows: Iterable[Tuple[FrozenSet[int], int]],
+    frequent: Iterable[Tuple[int]],
+    length: int,
+    merge: bool,
+) -> List[Tuple[FrozenSet[int], int]]:
+    """Сокращает набор данных после уровня length (как в AprioriTID).
+
+    Элемент, не входящий ни в один часто встречающийся набор длины length, не
+    входит и в более длинные, поэтому удаляется из транзакций. Транзакции
+    короче length+1 не могут содержать кандидатов следующего уровня и
+    удаляются. При merge одинаковые транзакции объединяются в одну строку с
+    суммарным весом.
+
+    Аргументы:
+        rows (Iterable[Tuple[FrozenSet[int], int]]): Строки (транзакция, вес).
+        frequent (Iterable[Tuple[int]]): Часто встречающиеся наборы длины length.
+        length (int): Длина наборов обработанного уровня.
+        merge (bool): Объединять одинаковые транзакции.
+
+    Возвращает:
+        List[Tuple[FrozenSet[int], int]]: Сокращённые строки.
+    """
+    items = frozenset(item for item_set in frequent for item in item_set)
+    trimmed: List[Tuple[FrozenSet[int], int]] = []
+    for transaction, weight in rows:
+        if len(transaction) > length:
+            transaction = transaction & items
+            if len(transaction) > length:
+                trimmed.append((transaction, weight))
+    if not merge:
+        return trimmed
+    weights: Dict[FrozenSet[int], int] = {}
+    for transaction, weight in trimmed:
+        weights[transaction] = weights.get(transaction, 0) + weight
+    return list(weights.items())
+
+
+def _build_tidsets(data_set: List[Set[Any]]) -> Dict[Any, int]:
+    """Строит вертикальное представление набора данных: для каждого элемента
+    битовое множество идентификаторов транзакций (TID), в которых он встречается.
+
+    Бит с номером i установлен, если элемент содержится в i-й транзакции.
+
+    Аргументы:
+        data_set (List[Set[Any]]): Набор данных.
+
+    Возвращает:
+        Dict[Any, int]: Словарь, где ключи - элементы, а значения - их битовые множества TID.
+    """
+    if isinstance(data_set, TransactionStore):
+        return data_set.tidsets()
+
+    tid_lists: Dict[Any, List[int]] = {}
+    for tid, transaction in enumerate(data_set):
+        for item in transaction:
+            tid_lists.setdefault(item, []).append(tid)
+
+    n_bytes = (len(data_set) + 7) // 8
+    tidsets: Dict[Any, int] = {}
+    for item, tids in tid_lists.items():
+        bits = bytearray(n_bytes)
+        for tid in tids:
+            bits[tid >> 3] |= 1 << (tid & 7)
+        tidsets[item] = int.from_bytes(bits, "little")
+    return tidsets
+
+
+def _calc_support_candidate_bitset(
+    item_tidsets: Dict[int, int],
+    parent_tidsets: Dict[Tuple[int], int],
+    candidate: List[Tuple[int]],
+    min_support: float,
+    n_transactions: int,
+) -> Tuple[Dict[Tuple[int], float], Dict[Tuple[int], int]]:
+    """Вычисляет поддержку для наборов элементов-кандидатов по битовым множествам TID.
+
+    Битовое множество кандидата длины k получается пересечением (AND) битового
+    множества его префикса длины k-1 с битовым множеством последнего элемента,
+    а поддержка - числом единичных бит в результате.
+
+    Аргументы:
+        item_tidsets (Dict[int, int]): Битовые множества TID элементов.
+        parent_tidsets (Dict[Tuple[int], int]): Битовые множества TID часто встречающихся наборов предыдущего уровня.
+        candidate (List[Tuple[int]]): Наборы элементов-кандидатов (упорядоченные кортежи).
+        min_support (float): Минимальная поддержка, необходимая для того, чтобы набор элементов считался часто встречающимся.
+        n_transactions (int): Количество транзакций в наборе данных.
+
+    Возвращает:
+        Tuple[Dict[Tuple[int], float], Dict[Tuple[int], int]]: Поддержка часто встречающихся кандидатов и их битовые множества TID.
+    """
+    supports: Dict[Tuple[int], float] = {}
+    tidsets: Dict[Tuple[int], int] = {}
+    for item_set in candidate:
+        if len(item_set) == 1:
+            tidset = item_tidsets[item_set[0]]
+        else:
+            tidset = parent_tidsets[item_set[:-1]] & item_tidsets[item_set[-1]]
+        support = tidset.bit_count() / n_transactions
+        if support >= min_support:
+            supports[item_set] = support
+            tidsets[item_set] = tidset
+    return supports, tidsets
+
+
+def _min_count(min_support: float, n_transactions: int) -> int:
+    """Вычисляет минимальное количество транзакций, при котором набор элементов
+    считается часто встречающимся, т.е. наименьшее count, для которого
+    count / n_transactions >= min_support.
+
+    Аргументы:
+        min_support (float): Порог поддержки.
+        n_transactions (int): Количество транзакций в наборе данных.
+
+    Возвращает:
+        int: Минимальное количество транзакций (0 для пустого набора данных).
+    """
+    if n_transactions == 0:
+        return 0
+    count = max(ceil(min_support * n_transactions), 0)
+    # Поправка на погрешность умножения с плавающей точкой
+    while count > 0 and (count - 1) / n_transactions >= min_support:
+        count -= 1
+    while count / n_transactions < min_support:
+        count += 1
+    return count
 
 
-def _apriori_gen(item_set: Set[Tuple[int]], length: int) -> Set[Tuple[int]]:
+def _encode_data_set(
+    data_set: List[Set[Any]],
+) -> Tuple[List[Any], List[FrozenSet[int]]]:
+    """Заменяет элементы транзакций их целочисленными идентификаторами.
+
+    Аргументы:
+        data_set (List[Set[Any]]): Набор данных.
+
+    Возвращает:
+        Tuple[List[Any], List[FrozenSet[int]]]: Словарь элементов (элемент с идентификатором i
+            находится на i-й позиции) и закодированный набор данных.
+    """
+    ids: Dict[Any, int] = {}
+    encoded = [
+        frozenset(ids.setdefault(item, len(ids)) for item in transaction)
+        for transaction in data_set
+    ]
+    return list(ids), encoded
+
+
+def _prepare_data_set(
+    data_set: Any, counting: CountingType, n_jobs: int = 1
+) -> Tuple[List[Any], Any, CountingType]:
+    """Приводит входные данные apriori() к закодированным транзакциям.
+
+    Таблица pd.DataFrame и булева матрица np.ndarray преобразуются в битовую
+    матрицу ItemMatrix. Транзакции хранилища и матрицы уже закодированы:
+    битовые множества строятся прямо по их массивам, остальным способам
+    подсчёта нужен список транзакций. Перебор транзакций (SCAN) для матрицы
+    заменяется пересечением её столбцов (BITSET).
+
+    Аргументы:
+        data_set (Any): Входные данные apriori().
+        counting (CountingType): Способ подсчёта поддержки.
+        n_jobs (int): Количество процессов.
+
+    Возвращает:
+        Tuple[List[Any], Any, CountingType]: Словарь элементов, закодированные
+            транзакции и способ подсчёта поддержки.
+    """
+    if isinstance(data_set, pd.DataFrame):
+        data_set = ItemMatrix.from_frame(data_set)
+    elif isinstance(data_set, np.ndarray):
+        data_set = ItemMatrix.from_array(data_set)
+
+    if isinstance(data_set, ItemMatrix):
+        vocabulary = data_set.vocabulary
+        if counting == CountingType.SCAN:
+            counting = CountingType.BITSET
+    elif isinstance(data_set, TransactionStore):
+        vocabulary = list(range(len(data_set.vocabulary)))
+    else:
+        vocabulary, encoded = _encode_data_set(data_set)
+        return vocabulary, encoded, counting
+
+    if counting == CountingType.BITSET and n_jobs == 1:
+        return vocabulary, data_set, counting
+    return vocabulary, list(data_set), counting
+
+
+def _apriori_gen_prefix(
+    item_set: Iterable[Tuple[int]], length: int
+) -> Tuple[List[Tuple[int]], int, int]:
+    """Генерирует кандидатов длины length соединением наборов с общим префиксом.
+
+    Наборы предыдущего уровня представлены упорядоченными кортежами
+    идентификаторов. Соединяются только пары с совпадающими первыми length-2
+    элементами, после чего отбрасываются кандидаты, у которых хотя бы одно
+    подмножество длины length-1 не является часто встречающимся.
+
+    Аргументы:
+        item_set (Iterable[Tuple[int]]): Часто встречающиеся наборы длины length-1.
+        length (int): Длина генерируемых наборов элементов.
+
+    Возвращает:
+        Tuple[List[Tuple[int]], int, int]: Упорядоченный список кандидатов, количество
+            сгенерированных соединением кандидатов и количество отброшенных из них.
+    """
+    frequent = set(item_set)
+    candidates: List[Tuple[int]] = []
+    n_generated = 0
+    n_pruned = 0
+    for _, group in groupby(sorted(frequent), key=lambda item: item[:-1]):
+        group = list(group)
+        for i, left in enumerate(group):
+            for right in group[i + 1 :]:
+                candidate = left + right[-1:]
+                n_generated += 1
+                # Подмножества без последнего и предпоследнего элемента - это
+                # соединяемые наборы, остальные проверяем по L(k-1)
+                if all(
+                    candidate[:m] + candidate[m + 1 :] in frequent
+                    for m in range(length - 2)
+                ):
+                    candidates.append(candidate)
+                else:
+                    n_pruned += 1
+    return candidates, n_generated, n_pruned
+
+
+def _apriori_gen(item_set: Set[FrozenSet[Any]], length: int) -> Set[FrozenSet[Any]]:
     """Генерирует наборы элементов конкретной длины.
 
     Аргументы:
-        item_set (Set[Tuple[int]]): Набор наборов элементов, на основе которого генерируются кандидаты.
+        item_set (Set[FrozenSet[Any]]): Набор наборов элементов, на основе которого генерируются кандидаты.
         length (int): Длина генерируемых наборов элементов.
 
     Возвращает:
-        Set[Tuple[int]]: Набор созданных наборов элементов.
+        Set[FrozenSet[Any]]: Набор созданных наборов элементов.
     """
-    return set(
-        [i.union(j) for i in item_set for j in item_set if len(i.union(j)) == length]
+    vocabulary, encoded = _encode_data_set(list(item_set))
+    candidates, _, _ = _apriori_gen_prefix(
+        (tuple(sorted(item)) for item in encoded), length
     )
+    return {frozenset(vocabulary[i] for i in candidate) for candidate in candidates}
 
 
 def _sort_items(
@@ -101,81 +611,1191 @@ def _sort_items(
         )
 
 
-def _generate_rules(L, confidence_threshold):
+def _sort_table(table: ItemSetTable, ordered: OrderedType) -> ItemSetTable:
+    """Сортирует наборы таблицы так же, как _sort_items() сортирует словари.
+
+    Аргументы:
+        table (ItemSetTable): Таблица наборов.
+        ordered (OrderedType): Тип порядка сортировки.
+
+    Возвращает:
+        ItemSetTable: Отсортированная таблица.
+    """
+    if ordered == OrderedType.SUPPORT_ASCENDING:
+        return table.sorted_by_support()
+    elif ordered == OrderedType.SUPPORT_DESCENDING:
+        return table.sorted_by_support(reverse=True)
+    elif ordered == OrderedType.LEXICAL_ASCENDING:
+        return table.sorted_lexically()
+    elif ordered == OrderedType.LEXICAL_DESCENDING:
+        return table.sorted_lexically(reverse=True)
+
+
+def _generate_rules(
+    L: List[Dict[FrozenSet[Any], float]],
+    confidence_threshold: float,
+    min_length: int = 2,
+) -> RuleSet:
     """Генерация ассоциативных правил из часто встречающихся наборов.
 
+    Заключения правил наращиваются по уровням (ap-genrules): заключение
+    расширяется следующими элементами набора, только если правило с ним прошло
+    порог уверенности. Уменьшение предпосылки не увеличивает уверенность,
+    поэтому из отброшенных заключений правил не получить. Уверенность всех
+    кандидатов одного уровня вычисляется сразу по массивам поддержек.
+
+    Поэтому правила упорядочены по размеру заключения: сначала все правила с
+    одноэлементным заключением, затем с двухэлементным и т.д., а внутри
+    размера - в порядке наборов в L. Правила одного набора не идут подряд,
+    как при переборе подмножеств каждого набора; для другого порядка правила
+    нужно отсортировать (например, RuleSet.sorted_by()).
+
     Аргументы:
         L (List[Dict[FrozenSet[Any], float]]): Список словарей с часто встречающимися наборами.
         confidence_threshold (float): Порог уверенности.
+        min_length (int): Минимальная длина наборов, из которых строятся правила
+            (наборы короче нужны только как предпосылки и заключения).
+
+    Возвращает:
+        RuleSet: Сгенерированные правила; при итерации - кортежи (предпосылка, заключение, уверенность).
+    """
+    # Наборы кодируем битовыми масками: i-й бит соответствует i-му элементу
+    bits = {
+        item: 1 << i
+        for i, item in enumerate(item for item_set in L[0] for item in item_set)
+    }
+    all_item_sets = [item_set for level in L for item_set in level]
+    all_item_bits = [
+        tuple(map(bits.__getitem__, item_set)) for item_set in all_item_sets
+    ]
+    masks = list(map(sum, all_item_bits))
+    supports: Dict[int, float] = dict(
+        zip(masks, (support for level in L for support in level.values()))
+    )
+    item_sets_by_mask: Dict[int, FrozenSet[Any]] = dict(zip(masks, all_item_sets))
+
+    rule_item_sets: List[int] = []
+    rule_antecedents: List[int] = []
+    rule_supports: List[np.ndarray] = []
+    rule_antecedent_supports: List[np.ndarray] = []
+
+    # Кандидат - набор, биты его элементов, предпосылка и позиция последнего
+    # элемента заключения среди этих битов. Начинаем с одноэлементных заключений.
+    candidates = [
+        (mask, item_bits, mask ^ bit, position)
+        for mask, item_bits in zip(masks, all_item_bits)
+        if len(item_bits) >= max(min_length, 2)
+        for position, bit in enumerate(item_bits)
+    ]
+    length = 1
+    while candidates:
+        item_sets, _, antecedents, _ = zip(*candidates)
+        item_set_support = np.fromiter(
+            map(supports.__getitem__, item_sets), float, len(item_sets)
+        )
+        antecedent_support = np.fromiter(
+            map(supports.__getitem__, antecedents), float, len(antecedents)
+        )
+        keep = item_set_support / antecedent_support >= confidence_threshold
+        rule_item_sets.extend(compress(item_sets, keep))
+        rule_antecedents.extend(compress(antecedents, keep))
+        rule_supports.append(item_set_support[keep])
+        rule_antecedent_supports.append(antecedent_support[keep])
+
+        # Расширяем принятые заключения элементами, стоящими после последнего,
+        # пока предпосылка остаётся непустой
+        length += 1
+        candidates = [
+            (mask, item_bits, antecedent ^ item_bits[next_position], next_position)
+            for mask, item_bits, antecedent, position in compress(candidates, keep)
+            if len(item_bits) > length
+            for next_position in range(position + 1, len(item_bits))
+        ]
+
+    if not rule_antecedents:
+        return RuleSet.empty()
+
+    # Предпосылки и заключения - часто встречающиеся наборы, берём их из L
+    rule_consequents = list(map(int.__xor__, rule_item_sets, rule_antecedents))
+    return RuleSet.from_supports(
+        list(map(item_sets_by_mask.__getitem__, rule_antecedents)),
+        list(map(item_sets_by_mask.__getitem__, rule_consequents)),
+        np.concatenate(rule_supports),
+        np.concatenate(rule_antecedent_supports),
+        np.fromiter(
+            map(supports.__getitem__, rule_consequents), float, len(rule_consequents)
+        ),
+    )
+
+
+def _subsets(item_set: Any) -> Iterator[Any]:
+    """Возвращает подмножества набора на один элемент короче.
+
+    Аргументы:
+        item_set (Any): Упорядоченный кортеж или frozenset.
+
+    Возвращает:
+        Iterator[Any]: Подмножества того же типа, что и item_set.
+    """
+    if isinstance(item_set, tuple):
+        return (item_set[:m] + item_set[m + 1 :] for m in range(len(item_set)))
+    return (item_set - {item} for item in item_set)
+
+
+def _compact_level(
+    previous: Dict[Any, float], current: Dict[Any, float], output: OutputType
+) -> Dict[Any, float]:
+    """Оставляет в уровне previous только замкнутые или максимальные наборы.
+
+    Набор длины k-1 не максимален, если часто встречается хоть одно его
+    надмножество длины k, и не замкнут, если поддержка такого надмножества
+    равна его поддержке. Надмножества длиннее k проверять не нужно: их
+    подмножества длины k тоже часто встречаются и имеют не меньшую поддержку.
+
+    Аргументы:
+        previous (Dict[Any, float]): Часто встречающиеся наборы длины k-1.
+        current (Dict[Any, float]): Все часто встречающиеся наборы длины k.
+        output (OutputType): CLOSED или MAXIMAL.
+
+    Возвращает:
+        Dict[Any, float]: Замкнутые или максимальные наборы длины k-1.
+    """
+    dropped = set()
+    for item_set, support in current.items():
+        for subset in _subsets(item_set):
+            if output == OutputType.MAXIMAL or previous[subset] == support:
+                dropped.add(subset)
+    return {
+        item_set: support
+        for item_set, support in previous.items()
+        if item_set not in dropped
+    }
+
+
+def _compact_levels(
+    L: List[Dict[Any, float]], output: OutputType
+) -> List[Dict[Any, float]]:
+    """Оставляет во всех уровнях только замкнутые или максимальные наборы.
+
+    Аргументы:
+        L (List[Dict[Any, float]]): Все часто встречающиеся наборы по уровням.
+        output (OutputType): Режим вывода.
 
     Возвращает:
-        List[Tuple[FrozenSet, FrozenSet, float]]: Список сгенерированных правил в формате (предпосылка, заключение, уверенность).
+        List[Dict[Any, float]]: Наборы режима output по уровням.
     """
-    rules = []
-    # Итерация по всем наборам начиная со второго уровня (наборы размера 2 и более)
-    for frequent_itemsets in L[1:]:
-        for itemset, support in frequent_itemsets.items():
-            for i in range(1, len(itemset)):
-                # Генерация всех возможных предпосылок размера i
-                antecedents = combinations(itemset, i)
-                itemset_support = frequent_itemsets[itemset]
-                for antecedent in antecedents:
-                    antecedent = frozenset(antecedent)
-                    consequent = itemset - antecedent
-                    antecedent_support = L[i - 1][antecedent]
-                    # Вычисление уверенности для правила
-                    confidence = itemset_support / antecedent_support
-                    if confidence >= confidence_threshold:
-                        rules.append((antecedent, consequent, confidence))
-    return rules
+    if output == OutputType.ALL:
+        return L
+    return [
+        _compact_level(Lk, L[k + 1], output) if k + 1 < len(L) else Lk
+        for k, Lk in enumerate(L)
+    ]
+
+
+def expand_closed(
+    closed: List[Dict[FrozenSet[Any], float]],
+) -> List[Dict[FrozenSet[Any], float]]:
+    """Восстанавливает все часто встречающиеся наборы по замкнутым.
+
+    Поддержка набора равна наибольшей поддержке его замкнутых надмножеств,
+    поэтому уровни восстанавливаются сверху вниз: каждый набор длины k
+    передаёт свою поддержку подмножествам длины k-1.
+
+    Аргументы:
+        closed (List[Dict[FrozenSet[Any], float]]): Результат apriori() с
+            output=OutputType.CLOSED.
+
+    Возвращает:
+        List[Dict[FrozenSet[Any], float]]: Тот же результат, что и apriori() с
+            output=OutputType.ALL (без сортировки).
+    """
+    L: List[Dict[FrozenSet[Any], float]] = [dict(Lk) for Lk in closed]
+    for k in range(len(L) - 1, 0, -1):
+        previous = L[k - 1]
+        for item_set, support in L[k].items():
+            for subset in _subsets(item_set):
+                if previous.get(subset, 0.0) < support:
+                    previous[subset] = support
+    return L
+
+
+# Функции подсчёта поддержки по строкам (транзакция, вес) для способов подсчёта
+_ROW_COUNTERS: Dict[CountingType, Callable] = {
+    CountingType.SCAN: _calc_support_candidate_weighted,
+    CountingType.TRIE: _calc_support_candidate_trie,
+    CountingType.KEYS: _calc_support_candidate_keys,
+}
+
+
+def _iter_encoded_levels(
+    encoded: List[FrozenSet[int]],
+    min_support: float,
+    counting: CountingType = CountingType.SCAN,
+    stats: Optional[MiningStats] = None,
+    callback: Optional[Callable[[LevelStats], None]] = None,
+    trimming: TrimmingType = TrimmingType.NONE,
+    max_len: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[Dict[Tuple[int], float]]:
+    """Поуровневый поиск часто встречающихся наборов в закодированном наборе данных,
+    возвращающий каждый уровень сразу после подсчёта.
+
+    Аргументы:
+        encoded (List[FrozenSet[int]]): Транзакции из идентификаторов элементов.
+        min_support (float): Порог поддержки.
+        counting (CountingType): Способ подсчёта поддержки.
+        stats (Optional[MiningStats]): Статистика, в которую записываются уровни.
+        callback (Optional[Callable[[LevelStats], None]]): Функция, вызываемая
+            после каждого уровня.
+        trimming (TrimmingType): Сокращение набора данных после каждого уровня
+            (не применяется при подсчёте битовыми множествами).
+        max_len (Optional[int]): Максимальная длина наборов.
+        deadline (Optional[float]): Момент времени (perf_counter()), после
+            которого следующий уровень не начинается.
+
+    Возвращает:
+        Iterator[Dict[Tuple[int], float]]: Словари с часто встречающимися наборами
+            (упорядоченными кортежами идентификаторов) каждой длины. Первый
+            уровень возвращается всегда, пустые уровни после него - нет.
+    """
+    if stats is None:
+        stats = MiningStats()
+    n_transactions = len(encoded)
+
+    # Генерируем начальные кандидаты для часто встречающихся множеств (C1)
+    # и вычисляем поддержку для каждого из них
+    level = stats.level(1)
+    start = perf_counter()
+    if counting == CountingType.BITSET:
+        item_tidsets = _build_tidsets(encoded)
+        C1: List[Tuple[int]] = [(item,) for item in sorted(item_tidsets)]
+        generated = perf_counter()
+        L1, tidsets = _calc_support_candidate_bitset(
+            item_tidsets, {}, C1, min_support, n_transactions
+        )
+    else:
+        C1 = [
+            (item,)
+            for item in sorted(
+                {item for transaction in encoded for item in transaction}
+            )
+        ]
+        generated = perf_counter()
+        # Рабочий набор данных: строки (транзакция, количество повторов)
+        rows = list(zip(encoded, repeat(1)))
+        if counting == CountingType.SCAN:
+            L1 = _calc_support_candidate(encoded, C1, min_support)
+        else:
+            L1 = _ROW_COUNTERS[counting](rows, C1, min_support, n_transactions)
+    level.generation_time = generated - start
+    level.counting_time = perf_counter() - generated
+    level.n_generated = level.n_counted = len(C1)
+    level.n_frequent = len(L1)
+    level.n_transactions = n_transactions
+
+    trim = counting != CountingType.BITSET and trimming != TrimmingType.NONE
+    merge = trimming == TrimmingType.TRIM_WEIGHTED
+    if trim:
+        rows = _trim_transactions(rows, L1, 1, merge)
+        level.counting_time = perf_counter() - generated
+    stats.finish_level(level, callback)
+    yield L1
+
+    # previous - наборы последнего уровня, по которым строятся кандидаты
+    previous = L1
+    k: int = 2
+    while (max_len is None or k <= max_len) and (
+        deadline is None or perf_counter() < deadline
+    ):
+        level = stats.level(k)
+        start = perf_counter()
+        # Генерируем новое множество кандидатов
+        Ck, level.n_generated, level.n_pruned = _apriori_gen_prefix(previous, k)
+        generated = perf_counter()
+        # Вычисляем поддержку для каждого кандидата в Ck
+        if counting == CountingType.BITSET:
+            Lk, tidsets = _calc_support_candidate_bitset(
+                item_tidsets, tidsets, Ck, min_support, n_transactions
+            )
+        elif counting == CountingType.SCAN and not trim:
+            Lk = _calc_support_candidate(encoded, Ck, min_support)
+        else:
+            level.n_transactions = len(rows)
+            Lk = _ROW_COUNTERS[counting](rows, Ck, min_support, n_transactions)
+            if trim and Lk:
+                rows = _trim_transactions(rows, Lk, k, merge)
+        level.generation_time = generated - start
+        level.counting_time = perf_counter() - generated
+        level.n_counted = len(Ck)
+        level.n_frequent = len(Lk)
+        if level.n_transactions is None:
+            level.n_transactions = n_transactions
+        stats.finish_level(level, callback)
+        if not Lk:
+            break
+        yield Lk
+        previous = Lk
+        k += 1
+
+
+def _mine_levels(
+    encoded: List[FrozenSet[int]],
+    min_support: float,
+    counting: CountingType = CountingType.SCAN,
+    stats: Optional[MiningStats] = None,
+    callback: Optional[Callable[[LevelStats], None]] = None,
+    trimming: TrimmingType = TrimmingType.NONE,
+    output: OutputType = OutputType.ALL,
+) -> List[Dict[Tuple[int], float]]:
+    """Поуровневый поиск часто встречающихся наборов в закодированном наборе данных.
+
+    Аргументы:
+        encoded (List[FrozenSet[int]]): Транзакции из идентификаторов элементов.
+        min_support (float): Порог поддержки.
+        counting (CountingType): Способ подсчёта поддержки.
+        stats (Optional[MiningStats]): Статистика, в которую записываются уровни.
+        callback (Optional[Callable[[LevelStats], None]]): Функция, вызываемая
+            после каждого уровня.
+        trimming (TrimmingType): Сокращение набора данных после каждого уровня
+            (не применяется при подсчёте битовыми множествами).
+        output (OutputType): Какие наборы сохранять. При CLOSED и MAXIMAL
+            уровень k-1 сокращается сразу после подсчёта уровня k, полностью
+            хранится только последний подсчитанный уровень.
+
+    Возвращает:
+        List[Dict[Tuple[int], float]]: Список словарей с часто встречающимися наборами
+            (упорядоченными кортежами идентификаторов) каждой длины.
+    """
+    L: List[Dict[Tuple[int], float]] = []
+    for Lk in _iter_encoded_levels(
+        encoded, min_support, counting, stats, callback, trimming
+    ):
+        if L and output != OutputType.ALL:
+            L[-1] = _compact_level(L[-1], Lk, output)
+        L.append(Lk)
+    return L
+
+
+def _decode_levels(
+    encoded_L: List[Dict[Tuple[int], float]],
+    vocabulary: List[Any],
+    order: Optional[OrderedType] = None,
+) -> List[Dict[FrozenSet[Any], float]]:
+    """Заменяет идентификаторы в найденных наборах исходными элементами.
+
+    Аргументы:
+        encoded_L (List[Dict[Tuple[int], float]]): Часто встречающиеся наборы из идентификаторов.
+        vocabulary (List[Any]): Словарь элементов.
+        order (Optional[OrderedType]): Порядок сортировки.
+
+    Возвращает:
+        List[Dict[FrozenSet[Any], float]]: Список словарей с часто встречающимися наборами.
+    """
+    L: List[Dict[FrozenSet[Any], float]] = []
+    for Lk in encoded_L:
+        Lk = {
+            frozenset(vocabulary[item] for item in item_set): support
+            for item_set, support in Lk.items()
+        }
+        if order:
+            Lk = _sort_items(Lk, order)
+        L.append(Lk)
+    return L
+
+
+def _mine_partition(
+    mine: Callable[[List[FrozenSet[int]], float], List[Dict[Any, float]]],
+    partition: List[FrozenSet[int]],
+    min_support: float,
+) -> List[Tuple[int]]:
+    """Находит локально часто встречающиеся наборы в части набора данных (первый проход SON).
+
+    Аргументы:
+        mine (Callable): Функция поиска частых наборов по уровням.
+        partition (List[FrozenSet[int]]): Часть закодированного набора данных.
+        min_support (float): Порог поддержки.
+
+    Возвращает:
+        List[Tuple[int]]: Локально часто встречающиеся наборы.
+    """
+    return [
+        tuple(sorted(item_set))
+        for Lk in mine(partition, min_support)
+        for item_set in Lk
+    ]
+
+
+def _count_partition(
+    partition: List[FrozenSet[int]], candidates: List[Tuple[int]]
+) -> List[int]:
+    """Подсчитывает количество транзакций части набора данных, содержащих каждый
+    кандидат (второй проход SON).
+
+    Аргументы:
+        partition (List[FrozenSet[int]]): Часть закодированного набора данных.
+        candidates (List[Tuple[int]]): Наборы элементов-кандидатов.
+
+    Возвращает:
+        List[int]: Количество транзакций для каждого кандидата.
+    """
+    return _count_candidates(_build_tidsets(partition), candidates)
+
+
+def _count_candidates(
+    item_tidsets: Dict[Any, int], candidates: List[Tuple[Any]]
+) -> List[int]:
+    """Подсчитывает количество транзакций, содержащих каждый кандидат, по
+    битовым множествам TID элементов.
+
+    Аргументы:
+        item_tidsets (Dict[Any, int]): Битовые множества TID элементов.
+        candidates (List[Tuple[Any]]): Наборы элементов-кандидатов.
+
+    Возвращает:
+        List[int]: Количество транзакций для каждого кандидата.
+    """
+    counts = []
+    for candidate in candidates:
+        tidset = item_tidsets.get(candidate[0], 0)
+        for item in candidate[1:]:
+            tidset &= item_tidsets.get(item, 0)
+        counts.append(tidset.bit_count())
+    return counts
+
+
+def _mine_sample(
+    encoded: List[FrozenSet[int]],
+    min_support: float,
+    sample_fraction: float,
+    sampling: SamplingType,
+    seed: Optional[int],
+    mine: Callable[[List[FrozenSet[int]], float], List[Dict[Tuple[int], float]]],
+) -> Tuple[List[Dict[Tuple[int], float]], SamplingStats]:
+    """Поиск часто встречающихся наборов по случайной выборке (алгоритм Тойвонена).
+
+    По оценке Хёфдинга поддержка набора по выборке из m транзакций отличается
+    от истинной больше чем на epsilon = sqrt(ln(2 / SAMPLING_DELTA) / (2m)) с
+    вероятностью не выше SAMPLING_DELTA. Выборка обрабатывается с порогом,
+    пониженным по мультипликативной оценке Чернова на
+    sqrt(2 * min_support * ln(1 / SAMPLING_DELTA) / m): набор с поддержкой
+    min_support не попадает в результат по выборке с вероятностью не выше
+    SAMPLING_DELTA. Для малых порогов это понижение намного меньше epsilon.
+
+    При VERIFY для найденных наборов и их отрицательной границы (наборов вне
+    результата, все подмножества которых в нём есть) подсчитывается точная
+    поддержка за один проход по всем транзакциям. Если ни один набор границы
+    не часто встречается, результат точный, иначе такие наборы возвращаются
+    как промахи: их надмножества могли быть пропущены. При APPROXIMATE
+    возвращаются наборы с поддержкой по выборке не ниже min_support, а
+    поддержки известны с точностью epsilon.
+
+    Аргументы:
+        encoded (List[FrozenSet[int]]): Транзакции из идентификаторов элементов.
+        min_support (float): Порог поддержки.
+        sample_fraction (float): Доля транзакций в выборке.
+        sampling (SamplingType): Проверять ли результат по всем транзакциям.
+        seed (Optional[int]): Начальное значение генератора случайных чисел.
+        mine (Callable): Функция поиска частых наборов по уровням.
+
+    Возвращает:
+        Tuple[List[Dict[Tuple[int], float]], SamplingStats]: Часто встречающиеся
+            наборы каждой длины и сведения о поиске (промахи в виде кортежей
+            идентификаторов).
+    """
+    if not 0 < sample_fraction <= 1:
+        raise ValueError("sample_fraction must be in (0, 1]")
+    n_transactions = len(encoded)
+    sample_size = max(ceil(sample_fraction * n_transactions), 1)
+    epsilon = sqrt(log(2 / SAMPLING_DELTA) / (2 * sample_size))
+    lowering = sqrt(2 * min_support * log(1 / SAMPLING_DELTA) / sample_size)
+    # Порог не опускается ниже одной транзакции выборки: наборы, не
+    # встретившиеся в ней ни разу, попадают в отрицательную границу
+    lowered_support = min(min_support, max(min_support - lowering, 1 / sample_size))
+    info = SamplingStats(sample_size, n_transactions, lowered_support, epsilon)
+    if n_transactions == 0:
+        return [{}], info
+
+    tids = sorted(random.Random(seed).sample(range(n_transactions), sample_size))
+    sample = [encoded[tid] for tid in tids]
+    if sampling == SamplingType.APPROXIMATE:
+        sample_L = mine(sample, min_support)
+        return [Lk for Lk in sample_L if Lk] or [{}], info
+
+    sample_L = mine(sample, info.lowered_support)
+
+    # Отрицательная граница: элементы вне результата и кандидаты каждого уровня
+    # (все их подмножества найдены), не оказавшиеся часто встречающимися
+    items = {item for transaction in encoded for item in transaction}
+    border = [(item,) for item in sorted(items) if (item,) not in sample_L[0]]
+    for k, Lk in enumerate(sample_L[1:] + [{}], 2):
+        candidates, _, _ = _apriori_gen_prefix(sample_L[k - 2], k)
+        border.extend(candidate for candidate in candidates if candidate not in Lk)
+    info.n_negative_border = len(border)
+
+    # Один проход по всем данным для найденных наборов и границы
+    found = [item_set for Lk in sample_L for item_set in Lk]
+    counts = _count_candidates(_build_tidsets(encoded), found + border)
+    min_count = _min_count(min_support, n_transactions)
+    info.verified = True
+    info.misses = [
+        item_set
+        for item_set, count in zip(border, counts[len(found) :])
+        if count >= min_count
+    ]
+
+    L: List[Dict[Tuple[int], float]] = [{}]
+    for item_set, count in zip(found + border, counts):
+        if count >= min_count:
+            while len(L) < len(item_set):
+                L.append({})
+            L[len(item_set) - 1][item_set] = count / n_transactions
+    return L, info
+
+
+def _resolve_n_jobs(n_jobs: Optional[int], n_transactions: int) -> int:
+    """Определяет количество процессов для поиска.
+
+    Аргументы:
+        n_jobs (Optional[int]): Запрошенное количество процессов (None или
+            отрицательное значение - все ядра).
+        n_transactions (int): Количество транзакций в наборе данных.
+
+    Возвращает:
+        int: Количество процессов; 1, если транзакций меньше, чем процессов
+            (в том числе для пустого набора данных).
+    """
+    if n_jobs == 0:
+        raise ValueError("n_jobs must not be 0")
+    if n_jobs is None or n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    if n_transactions < n_jobs:
+        return 1
+    return n_jobs
+
+
+def _mine_son(
+    encoded: List[FrozenSet[int]],
+    min_support: float,
+    mine: Callable[[List[FrozenSet[int]], float], List[Dict[Any, float]]],
+    n_jobs: int,
+) -> List[Dict[Tuple[int], float]]:
+    """Параллельный поиск часто встречающихся наборов по алгоритму SON.
+
+    Набор данных делится на части, в каждой из которых в отдельном процессе
+    ищутся локально часто встречающиеся наборы. Их объединение - глобальные
+    кандидаты, точная поддержка которых подсчитывается вторым параллельным
+    проходом. Любой часто встречающийся набор является локально часто
+    встречающимся хотя бы в одной части, поэтому результат совпадает с
+    однопроцессным.
+
+    Аргументы:
+        encoded (List[FrozenSet[int]]): Транзакции из идентификаторов элементов.
+        min_support (float): Порог поддержки.
+        mine (Callable): Функция поиска частых наборов по уровням для одной части.
+        n_jobs (int): Количество процессов, не больше количества транзакций
+            (см. _resolve_n_jobs()).
+
+    Возвращает:
+        List[Dict[Tuple[int], float]]: Список словарей с часто встречающимися наборами каждой длины.
+    """
+    n_transactions = len(encoded)
+    size = ceil(n_transactions / n_jobs)
+    partitions = [encoded[i : i + size] for i in range(0, n_transactions, size)]
+
+    # Локальный порог по количеству: count / n >= min_support в каждой части
+    local_min_support = _min_count(min_support, n_transactions) / n_transactions
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        local_item_sets = executor.map(
+            _mine_partition, repeat(mine), partitions, repeat(local_min_support)
+        )
+        candidates = sorted(set().union(*local_item_sets))
+        partition_counts = executor.map(
+            _count_partition, partitions, repeat(candidates)
+        )
+        counts = [sum(count) for count in zip(*partition_counts)]
+
+    L: List[Dict[Tuple[int], float]] = [{}]
+    for candidate, count in zip(candidates, counts):
+        support = count / n_transactions
+        if support >= min_support:
+            while len(L) < len(candidate):
+                L.append({})
+            L[len(candidate) - 1][candidate] = support
+    return L
 
 
 def apriori(
     data_set: List[Set[Any]],
     min_support: int,
-    confidence_threshold: float,
+    confidence_threshold: Optional[float],
     order: Optional[OrderedType] = None,
+    counting: CountingType = CountingType.SCAN,
+    n_jobs: Optional[int] = 1,
+    stats: Optional[MiningStats] = None,
+    callback: Optional[Callable[[LevelStats], None]] = None,
+    trimming: TrimmingType = TrimmingType.NONE,
+    output: OutputType = OutputType.ALL,
+    sample_fraction: Optional[float] = None,
+    sampling: SamplingType = SamplingType.VERIFY,
+    seed: Optional[int] = None,
+    as_table: bool = False,
 ) -> List[Dict[FrozenSet[Any], float]]:
     """Алгоритм Априори для поиска часто встречающихся множеств элементов.
 
     Аргументы:
-        data_set (List[Set[Any]]): Входные данные.
+        data_set (List[Set[Any]]): Входные данные или хранилище транзакций
+            TransactionStore (тогда элементы наборов - идентификаторы предметов).
+            Без копирования в память хранилище обрабатывается только при
+            counting=BITSET и n_jobs=1, в остальных случаях транзакции
+            загружаются в список целиком. Также принимаются таблица
+            pd.DataFrame (элементы - "столбец=значение", числовые столбцы
+            разбиваются на интервалы), булева матрица one-hot np.ndarray
+            (элементы - номера столбцов) и ItemMatrix с другим разбиением;
+            поддержка для них считается по упакованной битовой матрице
+            (SCAN заменяется на BITSET), см. ItemMatrix.from_frame().
         min_support (int): Порог поддержки.
+        confidence_threshold (Optional[float]): Порог уверенности. При None правила
+            не генерируются.
+        order (Optional[OrderedType]): Порядок сортировки.
+        counting (CountingType): Способ подсчёта поддержки: перебором транзакций
+            для каждого кандидата (SCAN), пересечением битовых множеств TID
+            (BITSET), обходом префиксного дерева кандидатов каждой транзакцией
+            (TRIE) или сопоставлением ключей подмножеств транзакций с ключами
+            кандидатов средствами NumPy (KEYS).
+        n_jobs (Optional[int]): Количество процессов. При значении больше 1
+            (None или -1 - все ядра) данные делятся на части и обрабатываются
+            параллельно по алгоритму SON. Если транзакций меньше, чем
+            процессов, поиск выполняется в одном процессе; 0 недопустим.
+        stats (Optional[MiningStats]): Статистика выполнения, заполняемая по ходу
+            работы: время фаз и, для каждого уровня, количество кандидатов,
+            найденных наборов, время генерации и подсчёта и пик памяти. При
+            параллельном поиске заполняется только время фаз.
+        callback (Optional[Callable[[LevelStats], None]]): Функция, вызываемая со
+            статистикой уровня после его обработки (только при n_jobs=1).
+        trimming (TrimmingType): Сокращение набора данных после каждого уровня
+            (при всех способах подсчёта, кроме BITSET): TRIM удаляет элементы, не
+            вошедшие в часто встречающиеся наборы, и слишком короткие
+            транзакции, TRIM_WEIGHTED дополнительно объединяет одинаковые
+            транзакции в одну строку с весом. Результат не меняется.
+        output (OutputType): Какие часто встречающиеся наборы возвращать: все
+            (ALL), только замкнутые (CLOSED - нет надмножества с той же
+            поддержкой) или только максимальные (MAXIMAL - нет часто
+            встречающегося надмножества). Наборы отбрасываются по мере поиска.
+            Все наборы с поддержками восстанавливаются из замкнутых функцией
+            expand_closed(), по ней же строятся правила. Для MAXIMAL поддержки
+            подмножеств неизвестны, поэтому confidence_threshold должен быть None.
+        sample_fraction (Optional[float]): Доля транзакций в случайной выборке.
+            Если задана, поиск выполняется по выборке в одном процессе (алгоритм
+            Тойвонена, см. _mine_sample()), а сведения о нём записываются в
+            stats.sampling.
+        sampling (SamplingType): При VERIFY результат проверяется одним проходом
+            по всем транзакциям: поддержки точные, а если stats.sampling.misses
+            не пуст, часть наборов могла быть пропущена и нужен полный поиск.
+            При APPROXIMATE проверки нет, поддержки известны с точностью
+            stats.sampling.epsilon.
+        seed (Optional[int]): Начальное значение генератора выборки.
+        as_table (bool): Вернуть наборы таблицей ItemSetTable (номера предметов
+            в массивах NumPy) вместо списка словарей; прежний формат можно
+            получить методом to_levels().
+
+    Возвращает:
+        Tuple[List[Dict[FrozenSet[Any], float]], RuleSet]: Список часто встречающихся
+            наборов элементов (или ItemSetTable при as_table) и правил. Правила
+            хранятся по столбцам (с метриками поддержки, уверенности, лифта,
+            левериджа и убедительности), при итерации выдаются кортежами
+            (предпосылка, заключение, уверенность).
+    """
+    if output == OutputType.MAXIMAL and confidence_threshold is not None:
+        raise ValueError("rules cannot be generated from maximal item sets")
+    if stats is None:
+        stats = MiningStats()
+
+    n_jobs = _resolve_n_jobs(n_jobs, len(data_set))
+    with stats.tracing():
+        # Кодируем элементы целыми числами, наборы храним упорядоченными кортежами
+        with stats.phase("encode"):
+            vocabulary, encoded, counting = _prepare_data_set(
+                data_set, counting, n_jobs
+            )
+        with stats.phase("mining"):
+            if sample_fraction is not None:
+                encoded_L, stats.sampling = _mine_sample(
+                    encoded,
+                    min_support,
+                    sample_fraction,
+                    sampling,
+                    seed,
+                    partial(
+                        _mine_levels,
+                        counting=counting,
+                        stats=stats,
+                        trimming=trimming,
+                    ),
+                )
+                encoded_L = _compact_levels(encoded_L, output)
+            elif n_jobs == 1:
+                encoded_L = _mine_levels(
+                    encoded, min_support, counting, stats, callback, trimming, output
+                )
+            else:
+                encoded_L = _compact_levels(
+                    _mine_son(
+                        encoded,
+                        min_support,
+                        partial(_mine_levels, counting=counting, trimming=trimming),
+                        n_jobs,
+                    ),
+                    output,
+                )
+
+        # Возвращаем исходные элементы вместо идентификаторов
+        with stats.phase("decode"):
+            if as_table:
+                L = ItemSetTable.from_encoded(encoded_L, vocabulary)
+            else:
+                L = _decode_levels(encoded_L, vocabulary)
+            if sample_fraction is not None:
+                stats.sampling.misses = [
+                    frozenset(vocabulary[item] for item in item_set)
+                    for item_set in stats.sampling.misses
+                ]
+        with stats.phase("sort"):
+            if order and as_table:
+                L = _sort_table(L, order)
+            elif order:
+                L = [_sort_items(Lk, order) for Lk in L]
+
+        with stats.phase("rules"):
+            levels = L.to_levels() if as_table else L
+            if confidence_threshold is None:
+                rules = RuleSet.empty()
+            elif output == OutputType.CLOSED:
+                rules = _generate_rules(expand_closed(levels), confidence_threshold)
+            else:
+                rules = _generate_rules(levels, confidence_threshold)
+    return L, rules
+
+
+def iter_levels(
+    data_set: List[Set[Any]],
+    min_support: float,
+    order: Optional[OrderedType] = None,
+    counting: CountingType = CountingType.SCAN,
+    trimming: TrimmingType = TrimmingType.NONE,
+    max_len: Optional[int] = None,
+    max_item_sets: Optional[int] = None,
+    timeout: Optional[float] = None,
+    stats: Optional[MiningStats] = None,
+    callback: Optional[Callable[[LevelStats], None]] = None,
+) -> Iterator[Dict[FrozenSet[Any], float]]:
+    """Ленивый вариант apriori(): возвращает уровни часто встречающихся наборов
+    по одному, сразу после подсчёта.
+
+    Следующий уровень ищется, только когда его запрашивают, поэтому прерванный
+    перебор не тратит время на более длинные наборы. Поиск выполняется в
+    одном процессе.
+
+    Аргументы:
+        data_set (List[Set[Any]]): Входные данные, хранилище транзакций или
+            таблица (как в apriori()).
+        min_support (float): Порог поддержки.
+        order (Optional[OrderedType]): Порядок сортировки наборов уровня.
+        counting (CountingType): Способ подсчёта поддержки.
+        trimming (TrimmingType): Сокращение набора данных после каждого уровня.
+        max_len (Optional[int]): Максимальная длина наборов (2 - только пары).
+        max_item_sets (Optional[int]): Максимальное общее количество наборов.
+            Уровень, на котором оно достигнуто, обрезается и становится последним.
+        timeout (Optional[float]): Время (секунды), после которого новые уровни
+            не начинаются. Начатый уровень досчитывается.
+        stats (Optional[MiningStats]): Статистика уровней.
+        callback (Optional[Callable[[LevelStats], None]]): Функция, вызываемая со
+            статистикой уровня после его обработки.
+
+    Возвращает:
+        Iterator[Dict[FrozenSet[Any], float]]: Часто встречающиеся наборы длины
+            1, 2, ... с их поддержкой.
+    """
+    if stats is None:
+        stats = MiningStats()
+    deadline = perf_counter() + timeout if timeout is not None else None
+    vocabulary, encoded, counting = _prepare_data_set(data_set, counting)
+
+    n_item_sets = 0
+    for Lk in _iter_encoded_levels(
+        encoded, min_support, counting, stats, callback, trimming, max_len, deadline
+    ):
+        level = _decode_levels([Lk], vocabulary, order)[0]
+        # Уровень обрезается после сортировки, чтобы при order остались
+        # первые в этом порядке наборы
+        if max_item_sets is not None:
+            level = dict(islice(level.items(), max_item_sets - n_item_sets))
+        yield level
+        n_item_sets += len(level)
+        if max_item_sets is not None and n_item_sets >= max_item_sets:
+            return
+
+
+def _iter_rule_sets(
+    levels: Iterable[Dict[FrozenSet[Any], float]], confidence_threshold: float
+) -> Iterator[RuleSet]:
+    """Генерирует правила по мере поступления уровней: для каждого уровня -
+    правила из его наборов.
+
+    Аргументы:
+        levels (Iterable[Dict[FrozenSet[Any], float]]): Уровни часто встречающихся
+            наборов, начиная с первого (например, iter_levels()).
+        confidence_threshold (float): Порог уверенности.
+
+    Возвращает:
+        Iterator[RuleSet]: Непустые наборы правил уровней 2, 3, ...
+    """
+    # Поддержки предыдущих уровней нужны для предпосылок и заключений
+    L: List[Dict[FrozenSet[Any], float]] = []
+    for Lk in levels:
+        L.append(Lk)
+        if len(L) > 1:
+            rules = _generate_rules(L, confidence_threshold, len(L))
+            if len(rules):
+                yield rules
+
+
+def iter_rules(
+    levels: Iterable[Dict[FrozenSet[Any], float]], confidence_threshold: float
+) -> Iterator[Tuple[FrozenSet[Any], FrozenSet[Any], float]]:
+    """Лениво генерирует ассоциативные правила по уровням часто встречающихся
+    наборов: правила из наборов длины k выдаются сразу после получения уровня k.
+
+    Аргументы:
+        levels (Iterable[Dict[FrozenSet[Any], float]]): Уровни часто встречающихся
+            наборов, начиная с первого (например, iter_levels()).
         confidence_threshold (float): Порог уверенности.
+
+    Возвращает:
+        Iterator[Tuple[FrozenSet[Any], FrozenSet[Any], float]]: Правила
+            (предпосылка, заключение, уверенность).
+    """
+    for rules in _iter_rule_sets(levels, confidence_threshold):
+        yield from rules
+
+
+def top_rules(
+    levels: Iterable[Dict[FrozenSet[Any], float]],
+    confidence_threshold: float,
+    n: int,
+    metric: str = "confidence",
+) -> RuleSet:
+    """Находит n правил с наибольшим значением метрики, храня в памяти не больше
+    n лучших правил и правила текущего уровня.
+
+    Аргументы:
+        levels (Iterable[Dict[FrozenSet[Any], float]]): Уровни часто встречающихся
+            наборов, начиная с первого (например, iter_levels()).
+        confidence_threshold (float): Порог уверенности.
+        n (int): Количество правил.
+        metric (str): Название метрики из rules.METRICS.
+
+    Возвращает:
+        RuleSet: Лучшие правила по убыванию метрики.
+    """
+    best = RuleSet.empty()
+    for rules in _iter_rule_sets(levels, confidence_threshold):
+        best = RuleSet.concat([best, rules]).sorted_by(metric)[:n]
+    return best
+
+
+def apriori_update(
+    L: List[Dict[FrozenSet[Any], float]],
+    data_set: List[Set[Any]],
+    increment: List[Set[Any]],
+    min_support: float,
+    confidence_threshold: Optional[float],
+    order: Optional[OrderedType] = None,
+) -> Tuple[List[Dict[FrozenSet[Any], float]], RuleSet]:
+    """Обновляет результат apriori() после добавления новых транзакций (алгоритм FUP).
+
+    На уровне k кандидаты строятся по обновлённому L(k-1). Поддержка каждого
+    кандидата подсчитывается только по новым транзакциям: для наборов, которые
+    были часто встречающимися раньше, количество в старых данных уже известно.
+    Набор, не бывший часто встречающимся, может им стать, только если он
+    достаточно часто встречается в новых транзакциях, поэтому старые данные
+    просматриваются лишь для таких кандидатов.
+
+    Аргументы:
+        L (List[Dict[FrozenSet[Any], float]]): Часто встречающиеся наборы старых данных,
+            найденные с тем же порогом поддержки.
+        data_set (List[Set[Any]]): Старые транзакции (могут отсутствовать).
+        increment (List[Set[Any]]): Добавленные транзакции.
+        min_support (float): Порог поддержки.
+        confidence_threshold (Optional[float]): Порог уверенности. При None правила
+            не генерируются.
         order (Optional[OrderedType]): Порядок сортировки.
 
     Возвращает:
-        Tuple[
-            List[Dict[FrozenSet[Any], float]],
-            List[Tuple[FrozenSet[Any], FrozenSet[Any], float]]
-        ]: Список часто встречающихся наборов элементов и правил в формате (предпосылка, заключение, уверенность).
+        Tuple[List[Dict[FrozenSet[Any], float]], RuleSet]: Тот же результат, что и
+            apriori() для объединения старых и новых транзакций.
     """
-    # Генерируем начальные кандидаты для часто встречающихся множеств (C1)
-    C1: Set[FrozenSet[Any]] = {
-        frozenset([item]) for transaction in data_set for item in transaction
-    }
+    n_transactions = len(data_set)
+    n_total = n_transactions + len(increment)
+    min_count = _min_count(min_support, n_total)
+    if n_transactions:
+        # Набор, не бывший часто встречающимся, встречался в старых данных не более
+        # old_min_count - 1 раз, значит в новых он должен встретиться хотя бы столько раз
+        increment_min_count = min_count - _min_count(min_support, n_transactions) + 1
+    else:
+        increment_min_count = min_count
 
-    # Вычисляем поддержку для каждого кандидата в C1
-    L1: Dict[FrozenSet[Any], float] = _calc_support_candidate(data_set, C1, min_support)
-    if order:
-        L1 = _sort_items(L1, order)
+    # Кодируем элементы целыми числами, как в apriori()
+    ids: Dict[Any, int] = {}
+    old_counts = {
+        tuple(sorted(ids.setdefault(item, len(ids)) for item in item_set)): round(
+            support * n_transactions
+        )
+        for Lk in L
+        for item_set, support in Lk.items()
+    }
+    encoded_increment = [
+        frozenset(ids.setdefault(item, len(ids)) for item in transaction)
+        for transaction in increment
+    ]
+    increment_tidsets = _build_tidsets(encoded_increment)
+    # Битовые множества старых данных строятся только при необходимости
+    old_tidsets: Optional[Dict[int, int]] = None
 
-    # Сохраняем часто встречающиеся множества и их поддержку
-    L: List[Dict[FrozenSet[Any], float]] = [L1]
-    k: int = 2
+    encoded_L: List[Dict[Tuple[int], float]] = []
+    k = 1
     while True:
-        # Генерируем новое множество кандидатов
-        Ck: Set[FrozenSet[Any]] = _apriori_gen(L[k - 2], k)
-        # Вычисляем поддержку для каждого кандидата в Ck
-        Lk: Dict[FrozenSet[Any], float] = _calc_support_candidate(
-            data_set, Ck, min_support
-        )
-        if not Lk:
+        if k == 1:
+            Ck = sorted(
+                {item_set for item_set in old_counts if len(item_set) == 1}
+                | {(item,) for item in increment_tidsets}
+            )
+        else:
+            Ck, _, _ = _apriori_gen_prefix(encoded_L[k - 2], k)
+
+        counts = dict(zip(Ck, _count_candidates(increment_tidsets, Ck)))
+        new_candidates = [
+            candidate
+            for candidate in Ck
+            if candidate not in old_counts and counts[candidate] >= increment_min_count
+        ]
+        if new_candidates:
+            if old_tidsets is None:
+                old_tidsets = _build_tidsets(
+                    [
+                        frozenset(
+                            ids.setdefault(item, len(ids)) for item in transaction
+                        )
+                        for transaction in data_set
+                    ]
+                )
+            for candidate, count in zip(
+                new_candidates, _count_candidates(old_tidsets, new_candidates)
+            ):
+                old_counts[candidate] = count
+
+        Lk: Dict[Tuple[int], float] = {}
+        for candidate in Ck:
+            if candidate in old_counts:
+                count = old_counts[candidate] + counts[candidate]
+                if count >= min_count:
+                    Lk[candidate] = count / n_total
+        if not Lk and encoded_L:
             break
-        if order:
-            Lk = _sort_items(Lk, order)
-        L.append(Lk)
+        encoded_L.append(Lk)
         k += 1
 
-    rules = _generate_rules(L, confidence_threshold)
+    L = _decode_levels(encoded_L, list(ids), order)
+    rules = (
+        _generate_rules(L, confidence_threshold)
+        if confidence_threshold is not None
+        else RuleSet.empty()
+    )
+    return L, rules
+
+
+class _FPNode:
+    """Узел FP-дерева."""
+
+    __slots__ = ("item", "count", "parent", "children")
+
+    def __init__(self, item: Any, parent: Optional["_FPNode"]):
+        self.item = item
+        self.count: int = 0
+        self.parent = parent
+        self.children: Dict[Any, "_FPNode"] = {}
+
+
+def _build_fp_tree(
+    patterns: List[Tuple[List[Any], int]], rank: Dict[Any, int]
+) -> Dict[Any, List[_FPNode]]:
+    """Строит FP-дерево по списку шаблонов и возвращает его таблицу заголовков.
+
+    Аргументы:
+        patterns (List[Tuple[List[Any], int]]): Шаблоны (набор элементов, количество).
+            Элементы, отсутствующие в rank, отбрасываются.
+        rank (Dict[Any, int]): Порядковые номера частых элементов (меньше - чаще).
+
+    Возвращает:
+        Dict[Any, List[_FPNode]]: Таблица заголовков: для каждого элемента список его узлов в дереве.
+    """
+    root = _FPNode(None, None)
+    header: Dict[Any, List[_FPNode]] = {}
+    for items, count in patterns:
+        node = root
+        for item in sorted((i for i in items if i in rank), key=rank.__getitem__):
+            child = node.children.get(item)
+            if child is None:
+                child = _FPNode(item, node)
+                node.children[item] = child
+                header.setdefault(item, []).append(child)
+            child.count += count
+            node = child
+    return header
+
+
+def _mine_fp_tree(
+    header: Dict[Any, List[_FPNode]],
+    rank: Dict[Any, int],
+    suffix: FrozenSet[Any],
+    min_count: int,
+    result: Dict[FrozenSet[Any], int],
+):
+    """Рекурсивно извлекает часто встречающиеся наборы из FP-дерева.
+
+    Аргументы:
+        header (Dict[Any, List[_FPNode]]): Таблица заголовков FP-дерева.
+        rank (Dict[Any, int]): Порядковые номера частых элементов.
+        suffix (FrozenSet[Any]): Суффикс, для которого построено (условное) дерево.
+        min_count (int): Минимальное количество транзакций для частого набора.
+        result (Dict[FrozenSet[Any], int]): Словарь, в который записываются наборы и их количество.
+    """
+    # Обходим элементы от самых редких к самым частым
+    for item in sorted(header, key=rank.__getitem__, reverse=True):
+        nodes = header[item]
+        count = sum(node.count for node in nodes)
+        if count < min_count:
+            continue
+        item_set = suffix | {item}
+        result[item_set] = count
+
+        # Условная база шаблонов: префиксные пути ко всем узлам элемента
+        patterns: List[Tuple[List[Any], int]] = []
+        item_counts: Dict[Any, int] = {}
+        for node in nodes:
+            path = []
+            parent = node.parent
+            while parent.item is not None:
+                path.append(parent.item)
+                parent = parent.parent
+            if path:
+                patterns.append((path, node.count))
+                for path_item in path:
+                    item_counts[path_item] = item_counts.get(path_item, 0) + node.count
+
+        conditional_rank = {
+            i: rank[i] for i, c in item_counts.items() if c >= min_count
+        }
+        if conditional_rank:
+            conditional_header = _build_fp_tree(patterns, conditional_rank)
+            _mine_fp_tree(
+                conditional_header, conditional_rank, item_set, min_count, result
+            )
+
+
+def _fpgrowth_levels(
+    data_set: List[Set[Any]], min_support: float
+) -> List[Dict[FrozenSet[Any], float]]:
+    """Поиск часто встречающихся наборов с помощью FP-дерева.
+
+    Аргументы:
+        data_set (List[Set[Any]]): Входные данные.
+        min_support (float): Порог поддержки.
+
+    Возвращает:
+        List[Dict[FrozenSet[Any], float]]: Список словарей с часто встречающимися наборами каждой длины.
+    """
+    n_transactions = len(data_set)
+    if n_transactions == 0:
+        return [{}]
+
+    # Первый проход: считаем частоту каждого элемента
+    item_counts: Dict[Any, int] = {}
+    for transaction in data_set:
+        for item in transaction:
+            item_counts[item] = item_counts.get(item, 0) + 1
+
+    min_count = _min_count(min_support, n_transactions)
+    frequent = [item for item, count in item_counts.items() if count >= min_count]
+    frequent.sort(key=item_counts.__getitem__, reverse=True)
+    rank = {item: i for i, item in enumerate(frequent)}
+
+    # Второй проход: строим FP-дерево и извлекаем из него частые наборы
+    header = _build_fp_tree([(transaction, 1) for transaction in data_set], rank)
+    counts: Dict[FrozenSet[Any], int] = {}
+    _mine_fp_tree(header, rank, frozenset(), min_count, counts)
+
+    L: List[Dict[FrozenSet[Any], float]] = [{}]
+    for item_set, count in counts.items():
+        while len(L) < len(item_set):
+            L.append({})
+        L[len(item_set) - 1][item_set] = count / n_transactions
+    return L
+
+
+def fpgrowth(
+    data_set: List[Set[Any]],
+    min_support: float,
+    confidence_threshold: Optional[float],
+    order: Optional[OrderedType] = None,
+    n_jobs: Optional[int] = 1,
+    stats: Optional[MiningStats] = None,
+) -> List[Dict[FrozenSet[Any], float]]:
+    """Алгоритм FP-Growth для поиска часто встречающихся множеств элементов.
+
+    Делает два прохода по данным (подсчёт элементов и построение FP-дерева) и не
+    генерирует кандидатов. Аргументы и результат совпадают с apriori().
+
+    Аргументы:
+        data_set (List[Set[Any]]): Входные данные.
+        min_support (float): Порог поддержки.
+        confidence_threshold (Optional[float]): Порог уверенности. При None правила
+            не генерируются.
+        order (Optional[OrderedType]): Порядок сортировки.
+        n_jobs (Optional[int]): Количество процессов для параллельной обработки
+            по алгоритму SON (None или -1 - все ядра, 0 недопустим).
+        stats (Optional[MiningStats]): Статистика выполнения. Заполняется только
+            время фаз: поиск по FP-дереву не разбивается на уровни.
+
+    Возвращает:
+        Tuple[List[Dict[FrozenSet[Any], float]], RuleSet]: Список часто встречающихся
+            наборов элементов и правил. Правила хранятся по столбцам (с метриками
+            поддержки, уверенности, лифта, левериджа и убедительности), при итерации
+            выдаются кортежами (предпосылка, заключение, уверенность).
+    """
+    if stats is None:
+        stats = MiningStats()
+
+    n_jobs = _resolve_n_jobs(n_jobs, len(data_set))
+    with stats.tracing():
+        if n_jobs == 1:
+            with stats.phase("mining"):
+                L = _fpgrowth_levels(data_set, min_support)
+        else:
+            with stats.phase("encode"):
+                vocabulary, encoded = _encode_data_set(data_set)
+            with stats.phase("mining"):
+                encoded_L = _mine_son(encoded, min_support, _fpgrowth_levels, n_jobs)
+            with stats.phase("decode"):
+                L = _decode_levels(encoded_L, vocabulary)
+        with stats.phase("sort"):
+            if order:
+                L = [_sort_items(Lk, order) for Lk in L]
+
+        with stats.phase("rules"):
+            rules = (
+                _generate_rules(L, confidence_threshold)
+                if confidence_threshold is not None
+                else RuleSet.empty()
+            )
     return L, rules
@@ -0,0 +1,339 @@
+from apriori import CountingType, TrimmingType, apriori, fpgrowth
+import argparse
+from datetime import datetime, timezone
+from functools import partial
+import json
+import numpy as np
+import platform
+import subprocess
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+)
+
+
+# Алгоритмы, сравниваемые по умолчанию
+ENGINES: Dict[str, Callable] = {
+    "apriori": apriori,
+    "apriori_trim": partial(apriori, trimming=TrimmingType.TRIM_WEIGHTED),
+    "apriori_bitset": partial(apriori, counting=CountingType.BITSET),
+    "apriori_trie": partial(apriori, counting=CountingType.TRIE),
+    "apriori_keys": partial(apriori, counting=CountingType.KEYS),
+    "fpgrowth": fpgrowth,
+}
+
+# Параметры наборов данных по умолчанию
+DATA_SETS: List[Dict[str, Any]] = [
+    {"n_transactions": 1000, "avg_length": 10, "n_items": 100},
+    {"n_transactions": 5000, "avg_length": 10, "n_items": 100},
+]
+
+MIN_SUPPORTS: List[float] = [0.05, 0.02]
+
+# Допустимое относительное увеличение времени при сравнении результатов
+REGRESSION_THRESHOLD: float = 0.2
+
+# Поля записи с результатами измерения; по остальным полям (алгоритм,
+# параметры данных, порог поддержки) сопоставляются запуски
+RESULT_FIELDS = ("time", "peak_memory", "n_item_sets")
+
+# Количество подряд выбранных шаблонов, не добавивших в транзакцию новых
+# элементов, после которого транзакция завершается
+MAX_STALE_DRAWS: int = 10
+
+
+def generate_transactions(
+    n_transactions: int,
+    avg_length: float,
+    n_items: int,
+    n_patterns: int = 100,
+    avg_pattern_length: float = 4,
+    correlation: float = 0.5,
+    corruption: float = 0.5,
+    seed: int = 0,
+) -> List[FrozenSet[int]]:
+    """Генерирует синтетические транзакции по схеме генератора IBM Quest.
+
+    Сначала создаются n_patterns потенциально частых наборов (шаблонов) длины
+    ~Poisson(avg_pattern_length). Часть элементов каждого шаблона берётся из
+    предыдущего (в среднем доля correlation), остальные выбираются случайно.
+    Шаблонам назначаются веса ~Exp(1) и уровни искажения ~N(corruption, 0.1).
+    Транзакция длины ~Poisson(avg_length) (не больше n_items) заполняется
+    шаблонами, выбранными по весам, причём из шаблона удаляются элементы, пока
+    случайное число меньше его уровня искажения. Заполнение прекращается после
+    MAX_STALE_DRAWS шаблонов подряд, не добавивших новых элементов.
+
+    Аргументы:
+        n_transactions (int): Количество транзакций.
+        avg_length (float): Средняя длина транзакции.
+        n_items (int): Количество различных элементов.
+        n_patterns (int): Количество шаблонов (чем меньше, тем плотнее данные).
+        avg_pattern_length (float): Средняя длина шаблона.
+        correlation (float): Средняя доля элементов, общих с предыдущим шаблоном.
+        corruption (float): Средний уровень искажения шаблонов.
+        seed (int): Начальное значение генератора случайных чисел.
+
+    Возвращает:
+        List[FrozenSet[int]]: Транзакции из номеров элементов.
+    """
+    rng = np.random.default_rng(seed)
+
+    patterns: List[np.ndarray] = []
+    for _ in range(n_patterns):
+        length = min(max(rng.poisson(avg_pattern_length), 1), n_items)
+        items = np.zeros(0, dtype=np.int64)
+        if patterns:
+            n_common = min(
+                int(round(min(rng.exponential(correlation), 1.0) * length)),
+                len(patterns[-1]),
+            )
+            items = rng.choice(patterns[-1], n_common, replace=False)
+        while len(items) < length:
+            items = np.unique(
+                np.concatenate([items, rng.integers(0, n_items, length - len(items))])
+            )
+        patterns.append(items)
+
+    weights = rng.exponential(1.0, n_patterns)
+    weights /= weights.sum()
+    corruptions = np.clip(rng.normal(corruption, 0.1, n_patterns), 0.0, 1.0)
+
+    transactions: List[FrozenSet[int]] = []
+    lengths = np.clip(rng.poisson(avg_length, n_transactions), 1, n_items)
+    for length in lengths:
+        transaction: set = set()
+        # Шаблоны могут покрывать не все элементы, а искажённый шаблон - быть
+        # пустым, поэтому число безрезультатных выборов ограничено
+        n_stale = 0
+        while len(transaction) < length and n_stale < MAX_STALE_DRAWS:
+            pattern = rng.choice(n_patterns, p=weights)
+            items = patterns[pattern]
+            # Искажаем шаблон: удаляем элементы, пока случайное число меньше уровня
+            n_dropped = 0
+            while n_dropped < len(items) and rng.random() < corruptions[pattern]:
+                n_dropped += 1
+            if n_dropped:
+                items = rng.choice(items, len(items) - n_dropped, replace=False)
+            # Шаблон, не помещающийся в транзакцию, в половине случаев добавляется
+            # целиком, иначе транзакция завершается
+            if transaction and len(transaction) + len(items) > length:
+                if rng.random() < 0.5:
+                    transaction.update(items.tolist())
+                break
+            size = len(transaction)
+            transaction.update(items.tolist())
+            n_stale = n_stale + 1 if len(transaction) == size else 0
+        transactions.append(frozenset(transaction))
+    return transactions
+
+
+def measure(
+    engine: Callable, data_set: List[FrozenSet[int]], min_support: float, repeat: int
+) -> Dict[str, Any]:
+    """Измеряет время и пиковую память одного алгоритма.
+
+    Время - минимальное из repeat запусков. Память измеряется отдельным запуском
+    под tracemalloc, чтобы не искажать время.
+
+    Аргументы:
+        engine (Callable): Алгоритм с интерфейсом apriori().
+        data_set (List[FrozenSet[int]]): Набор данных.
+        min_support (float): Порог поддержки.
+        repeat (int): Количество запусков для измерения времени.
+
+    Возвращает:
+        Dict[str, Any]: Время (секунды), пиковая память (байты) и количество
+            найденных наборов каждой длины.
+    """
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        item_sets, _ = engine(data_set, min_support, None)
+        times.append(perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        engine(data_set, min_support, None)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "time": min(times),
+        "peak_memory": peak_memory,
+        "n_item_sets": [len(level) for level in item_sets if level],
+    }
+
+
+def run_benchmark(
+    engines: Dict[str, Callable] = ENGINES,
+    data_sets: List[Dict[str, Any]] = DATA_SETS,
+    min_supports: List[float] = MIN_SUPPORTS,
+    repeat: int = 3,
+    verbose: bool = False,
+) -> List[Dict[str, Any]]:
+    """Перебирает наборы данных, пороги поддержки и алгоритмы и измеряет каждый запуск.
+
+    Аргументы:
+        engines (Dict[str, Callable]): Алгоритмы по названиям.
+        data_sets (List[Dict[str, Any]]): Параметры generate_transactions() для наборов данных.
+        min_supports (List[float]): Пороги поддержки.
+        repeat (int): Количество запусков для измерения времени.
+        verbose (bool): Выводить результаты по мере измерения.
+
+    Возвращает:
+        List[Dict[str, Any]]: Записи с параметрами запуска и результатами measure().
+    """
+    results = []
+    for parameters in data_sets:
+        data_set = generate_transactions(**parameters)
+        for min_support in min_supports:
+            for name, engine in engines.items():
+                record = {"engine": name, **parameters, "min_support": min_support}
+                record.update(measure(engine, data_set, min_support, repeat))
+                if verbose:
+                    print(
+                        f"{name:16} {parameters} min_support={min_support}: "
+                        f"{record['time']:.3f} с, {record['peak_memory'] / 2**20:.1f} МБ"
+                    )
+                results.append(record)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    """Возвращает хэш текущего коммита или None, если git недоступен."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results: List[Dict[str, Any]], filename: str):
+    """Сохраняет результаты в JSON вместе с коммитом и версией Python.
+
+    Аргументы:
+        results (List[Dict[str, Any]]): Результаты run_benchmark().
+        filename (str): Имя JSON-файла.
+    """
+    document = {
+        "commit": _git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(document, file, ensure_ascii=False, indent=2)
+
+
+def load_results(filename: str) -> List[Dict[str, Any]]:
+    """Загружает результаты, сохранённые save_results().
+
+    Аргументы:
+        filename (str): Имя JSON-файла.
+
+    Возвращает:
+        List[Dict[str, Any]]: Записи результатов.
+    """
+    with open(filename, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def _record_key(record: Dict[str, Any]) -> tuple:
+    """Возвращает параметры запуска записи в виде ключа для сопоставления."""
+    return tuple(
+        sorted(
+            (field, value)
+            for field, value in record.items()
+            if field not in RESULT_FIELDS
+        )
+    )
+
+
+def compare_results(
+    baseline: List[Dict[str, Any]],
+    current: List[Dict[str, Any]],
+    threshold: float = REGRESSION_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """Находит регрессии: запуски, время которых выросло больше чем на threshold,
+    или результат которых (количество наборов) изменился.
+
+    Сравниваются только запуски с одинаковыми параметрами (все поля, кроме RESULT_FIELDS).
+
+    Аргументы:
+        baseline (List[Dict[str, Any]]): Базовые результаты.
+        current (List[Dict[str, Any]]): Новые результаты.
+        threshold (float): Допустимое относительное увеличение времени.
+
+    Возвращает:
+        List[Dict[str, Any]]: Параметры запуска, базовое и новое время и причина.
+    """
+    baseline_by_key = {_record_key(record): record for record in baseline}
+    regressions = []
+    for record in current:
+        key = _record_key(record)
+        old = baseline_by_key.get(key)
+        if old is None:
+            continue
+        if record["n_item_sets"] != old["n_item_sets"]:
+            reason = "result"
+        elif record["time"] > old["time"] * (1 + threshold):
+            reason = "time"
+        else:
+            continue
+        regressions.append(
+            {
+                **dict(key),
+                "baseline_time": old["time"],
+                "time": record["time"],
+                "reason": reason,
+            }
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Замер времени и памяти алгоритмов поиска частых наборов"
+    )
+    parser.add_argument("-o", "--output", help="JSON-файл для сохранения результатов")
+    parser.add_argument("-c", "--compare", help="JSON-файл с базовыми результатами")
+    parser.add_argument(
+        "-e",
+        "--engine",
+        action="append",
+        choices=list(ENGINES),
+        help="алгоритм (по умолчанию все)",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-t", "--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    engines = {name: ENGINES[name] for name in args.engine or ENGINES}
+    results = run_benchmark(engines, repeat=args.repeat, verbose=True)
+    if args.output:
+        save_results(results, args.output)
+
+    if args.compare:
+        regressions = compare_results(
+            load_results(args.compare), results, args.threshold
+        )
+        for regression in regressions:
+            print(f"Регрессия: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import numpy as np
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+class ItemSetTable:
+    """Часто встречающиеся наборы в компактном целочисленном представлении.
+
+    Предметы заменены номерами в словаре vocabulary, упорядоченном по
+    возрастанию предметов, поэтому порядок номеров совпадает с лексическим.
+    Наборы длины k хранятся строками массива items[k - 1] формы (n, k) с
+    номерами по возрастанию, а их поддержки - массивом supports[k - 1].
+    """
+
+    def __init__(
+        self,
+        vocabulary: List[Any],
+        items: List[np.ndarray],
+        supports: List[np.ndarray],
+    ):
+        self.vocabulary = vocabulary
+        self.items = items
+        self.supports = supports
+        self._ids: Optional[Dict[Any, int]] = None
+        self._rows: List[Optional[Dict[Tuple[int, ...], int]]] = [None] * len(items)
+
+    @classmethod
+    def from_encoded(
+        cls, encoded_L: List[Dict[Tuple[int], float]], vocabulary: List[Any]
+    ) -> "ItemSetTable":
+        """Строит таблицу по наборам из идентификаторов (как в _mine_levels()).
+
+        Аргументы:
+            encoded_L (List[Dict[Tuple[int], float]]): Наборы каждой длины.
+            vocabulary (List[Any]): Словарь элементов (элемент с идентификатором
+                i находится на i-й позиции).
+
+        Возвращает:
+            ItemSetTable: Таблица наборов.
+        """
+        try:
+            order = sorted(range(len(vocabulary)), key=vocabulary.__getitem__)
+        except TypeError:
+            # Несравнимые предметы остаются в порядке словаря
+            order = list(range(len(vocabulary)))
+        rank = np.empty(len(vocabulary), dtype=np.int32)
+        rank[order] = np.arange(len(vocabulary), dtype=np.int32)
+
+        items: List[np.ndarray] = []
+        supports: List[np.ndarray] = []
+        for k, Lk in enumerate(encoded_L, 1):
+            rows = np.array(list(Lk), dtype=np.int32).reshape(len(Lk), k)
+            rows = np.sort(rank[rows], axis=1)
+            level_supports = np.fromiter(Lk.values(), float, len(Lk))
+            # Строки храним в лексическом порядке
+            lexical = np.lexsort(rows.T[::-1])
+            items.append(rows[lexical])
+            supports.append(level_supports[lexical])
+        return cls([vocabulary[i] for i in order], items, supports)
+
+    @classmethod
+    def from_levels(cls, L: List[Dict[FrozenSet[Any], float]]) -> "ItemSetTable":
+        """Строит таблицу по результату apriori().
+
+        Аргументы:
+            L (List[Dict[FrozenSet[Any], float]]): Часто встречающиеся наборы.
+
+        Возвращает:
+            ItemSetTable: Таблица наборов.
+        """
+        ids: Dict[Any, int] = {}
+        encoded_L: List[Dict[Tuple[int], float]] = []
+        for Lk in L:
+            encoded_L.append({})
+            for item_set, support in Lk.items():
+                row = tuple(sorted(ids.setdefault(item, len(ids)) for item in item_set))
+                encoded_L[-1][row] = support
+        return cls.from_encoded(encoded_L, list(ids))
+
+    def __len__(self) -> int:
+        return sum(len(level_supports) for level_supports in self.supports)
+
+    def __iter__(self) -> Iterator[Tuple[FrozenSet[Any], float]]:
+        for rows, level_supports in zip(self.items, self.supports):
+            for row, support in zip(rows.tolist(), level_supports.tolist()):
+                yield frozenset(map(self.vocabulary.__getitem__, row)), support
+
+    def __repr__(self) -> str:
+        return (
+            f"ItemSetTable({len(self)} item sets, {len(self.vocabulary)} items, "
+            f"{self.nbytes} bytes)"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Объём массивов наборов и поддержек в байтах."""
+        return sum(rows.nbytes for rows in self.items) + sum(
+            level_supports.nbytes for level_supports in self.supports
+        )
+
+    def encode(self, item_set: Iterable[Any]) -> Tuple[int, ...]:
+        """Заменяет предметы набора их номерами.
+
+        Аргументы:
+            item_set (Iterable[Any]): Набор предметов.
+
+        Возвращает:
+            Tuple[int, ...]: Номера предметов по возрастанию.
+        """
+        if self._ids is None:
+            self._ids = {item: i for i, item in enumerate(self.vocabulary)}
+        return tuple(sorted(map(self._ids.__getitem__, item_set)))
+
+    def support(self, item_set: Iterable[Any]) -> Optional[float]:
+        """Возвращает поддержку набора или None, если он не часто встречается.
+
+        Аргументы:
+            item_set (Iterable[Any]): Набор предметов.
+
+        Возвращает:
+            Optional[float]: Поддержка набора.
+        """
+        try:
+            row = self.encode(item_set)
+        except KeyError:
+            return None
+        k = len(row)
+        if not 0 < k <= len(self.items):
+            return None
+        # Индекс строк уровня строится при первом обращении к нему
+        if self._rows[k - 1] is None:
+            self._rows[k - 1] = {
+                tuple(level_row): i
+                for i, level_row in enumerate(self.items[k - 1].tolist())
+            }
+        index = self._rows[k - 1].get(row)
+        return None if index is None else float(self.supports[k - 1][index])
+
+    def _permute(self, orders: List[np.ndarray]) -> "ItemSetTable":
+        """Возвращает таблицу с переставленными строками каждого уровня."""
+        return ItemSetTable(
+            self.vocabulary,
+            [rows[order] for rows, order in zip(self.items, orders)],
+            [
+                level_supports[order]
+                for level_supports, order in zip(self.supports, orders)
+            ],
+        )
+
+    def sorted_by_support(self, reverse: bool = False) -> "ItemSetTable":
+        """Сортирует наборы каждого уровня по поддержке (устойчиво).
+
+        Аргументы:
+            reverse (bool): Сортировать по убыванию.
+
+        Возвращает:
+            ItemSetTable: Отсортированная таблица.
+        """
+        return self._permute(
+            [
+                np.argsort(-s if reverse else s, kind="stable")
+                for s in self.supports
+            ]
+        )
+
+    def sorted_lexically(self, reverse: bool = False) -> "ItemSetTable":
+        """Сортирует наборы каждого уровня в лексическом порядке, как
+        _sort_items() с OrderedType.LEXICAL_*.
+
+        Номера предметов упорядочены так же, как предметы, поэтому сравниваются
+        строки целых чисел, а не сами предметы.
+
+        Аргументы:
+            reverse (bool): По убыванию: наборы сравниваются по предметам,
+                упорядоченным по убыванию.
+
+        Возвращает:
+            ItemSetTable: Отсортированная таблица.
+        """
+        if reverse:
+            # Первый ключ np.lexsort - последний, т.е. наибольший предмет набора
+            return self._permute([np.lexsort(rows.T)[::-1] for rows in self.items])
+        return self._permute([np.lexsort(rows.T[::-1]) for rows in self.items])
+
+    def to_levels(self) -> List[Dict[FrozenSet[Any], float]]:
+        """Преобразует таблицу в формат результата apriori().
+
+        Возвращает:
+            List[Dict[FrozenSet[Any], float]]: Словари наборов каждой длины в
+                порядке строк таблицы.
+        """
+        vocabulary = self.vocabulary
+        return [
+            {
+                frozenset(map(vocabulary.__getitem__, row)): support
+                for row, support in zip(rows.tolist(), level_supports.tolist())
+            }
+            for rows, level_supports in zip(self.items, self.supports)
+        ]
@@ -1,13 +1,24 @@
-from apriori import apriori, OrderedType
+from apriori import apriori, fpgrowth, CountingType, OrderedType, SamplingType
 import matplotlib.pyplot as plt
-import pandas as pd
+from mining import MiningCache
+import os
 from prettytable import PrettyTable
+from stats import MiningStats
 from time import time
-from typing import List, Tuple, Dict, Set, FrozenSet
+from transactions import (
+    decode_item_sets,
+    decode_rules,
+    load_transaction_store,
+    load_transactions,
+)
+from typing import Callable, List, Optional, Tuple, Dict, Set, FrozenSet
 
 
 TEST_DATA_FILENAME: str = "baskets.csv"
 
+# Алгоритм поиска частых наборов: apriori или fpgrowth
+MINER: Callable = apriori
+
 
 def print_apriori_result(item_sets: List[Dict[FrozenSet, float]]):
     """Выводит результат алгоритма Априори.
@@ -52,40 +63,97 @@ def parse_csv_file(filename: str) -> List[Set[str]]:
     Возвращает:
         List[Set[str]]: Список транзакций.
     """
-    csv_file = pd.read_csv(filename, encoding="windows-1251")
-    data = []
-    for _, row in csv_file.iterrows():
-        data_row = []
-        for _, item in enumerate(row):
-            if pd.isna(item):
-                continue
-            data_row.append(str(item))
-        data.append(set(data_row))
-    return data
+    transactions, items = load_transactions(filename)
+    return [{items[item] for item in transaction} for transaction in transactions]
 
 
 def run_apriori_file(
-    filename: str, min_support: float, confidence_threshold: float
+    filename: str,
+    min_support: float,
+    confidence_threshold: float,
+    miner: Callable = apriori,
+    n_jobs: Optional[int] = 1,
+    cache: Optional[MiningCache] = None,
+    stats: Optional[MiningStats] = None,
+    sample_fraction: Optional[float] = None,
+    sampling: SamplingType = SamplingType.VERIFY,
 ) -> Tuple[
-    List[Dict[FrozenSet, float]], List[Tuple[FrozenSet, FrozenSet, float]], float
+    List[Dict[FrozenSet, float]],
+    List[Tuple[FrozenSet, FrozenSet, float]],
+    float,
+    float,
 ]:
-    """Запускает алгоритм Априори для файла и возращает результат и время выполнения.
+    """Запускает алгоритм Априори для файла и возращает результат, время загрузки
+    данных и время выполнения алгоритма.
+
+    Транзакции читаются из кэша <filename>.cache, который создаётся при первой
+    загрузке файла и пересоздаётся при изменении его содержимого. Для apriori
+    в одном процессе поддержка подсчитывается битовыми множествами прямо по
+    отображённому в память кэшу, поэтому файл не загружается в память целиком;
+    другие алгоритмы и параллельный поиск загружают транзакции списком.
 
     Аргументы:
         filename (str): Имя csv-файла.
         min_support (float): Порог поддержки.
+        confidence_threshold (float): Порог уверенности.
+        miner (Callable): Алгоритм поиска частых наборов (apriori или fpgrowth).
+        n_jobs (Optional[int]): Количество процессов (None или -1 - все ядра).
+        cache (Optional[MiningCache]): Кэш результатов поиска. Если для файла уже
+            есть результат с порогом поддержки не выше min_support, то заново
+            генерируются только правила.
+        stats (Optional[MiningStats]): Статистика выполнения miner (заполняется,
+            только если поиск действительно выполнялся; fpgrowth() заполняет
+            только время фаз).
+        sample_fraction (Optional[float]): Доля транзакций в случайной выборке
+            для поиска по выборке (только apriori, см. apriori(); для других
+            алгоритмов - ValueError). Сведения о проверке результата
+            записываются в stats.sampling.
+        sampling (SamplingType): Режим поиска по выборке.
 
     Возвращает:
-        Tuple[List[Dict[FrozenSet, float]], List[Tuple[FrozenSet, FrozenSet, float]], float]:
-            Результат работы алгоритма Априори и время выполнения.
+        Tuple[List[Dict[FrozenSet, float]], List[Tuple[FrozenSet, FrozenSet, float]], float, float]:
+            Результат работы алгоритма Априори, время загрузки и время выполнения.
     """
-    transactions = parse_csv_file(filename)
+    if sample_fraction is not None and miner is not apriori:
+        raise ValueError("sample_fraction is only supported by apriori")
 
     start = time()
-    frequent_item_sets, rules = apriori(transactions, min_support, confidence_threshold)
+    transactions = load_transaction_store(filename)
+    load_end = time()
+
+    kwargs = {"n_jobs": n_jobs}
+    if miner is apriori:
+        kwargs["counting"] = CountingType.BITSET
+    if stats is not None:
+        kwargs["stats"] = stats
+    if sample_fraction is not None:
+        kwargs["sample_fraction"] = sample_fraction
+        kwargs["sampling"] = sampling
+    if cache is None:
+        frequent_item_sets, rules = miner(
+            transactions, min_support, confidence_threshold, **kwargs
+        )
+    else:
+        stat = os.stat(filename)
+        # Результаты поиска по выборке кэшируются отдельно от точных
+        key = (
+            os.path.abspath(filename),
+            stat.st_mtime_ns,
+            stat.st_size,
+            miner,
+            sample_fraction,
+            sampling if sample_fraction is not None else None,
+        )
+        result = cache.get(key, lambda: transactions, min_support, miner, **kwargs)
+        frequent_item_sets, rules = result.query(min_support, confidence_threshold)
     end = time()
 
-    return frequent_item_sets, rules, end - start
+    return (
+        decode_item_sets(frequent_item_sets, transactions.vocabulary),
+        decode_rules(rules, transactions.vocabulary),
+        load_end - start,
+        end - load_end,
+    )
 
 
 def make_figure_bar(
@@ -116,6 +184,71 @@ def make_figure_bar(
     plt.ylabel(y_label)
 
 
+def make_figure_stats(stats: MiningStats):
+    """Создает графики статистики apriori() по уровням: количество кандидатов
+    и наборов, время генерации и подсчёта, пиковый объём памяти.
+
+    Аргументы:
+        stats (MiningStats): Статистика выполнения apriori().
+    """
+    lengths = [level.length for level in stats.levels]
+    title = "Статистика алгоритма Априори по уровням"
+
+    # Пик памяти есть, только если статистика собиралась с trace_memory=True
+    trace_memory = any(level.peak_memory is not None for level in stats.levels)
+    figure, axes = plt.subplots(1, 3 if trace_memory else 2, figsize=(15, 5))
+    counts_axis, time_axis = axes[:2]
+    figure.canvas.manager.set_window_title(title)
+    figure.suptitle(f"{title} (файл {TEST_DATA_FILENAME})")
+
+    width = 0.2
+    for i, (field, label) in enumerate(
+        [
+            ("n_generated", "Сгенерировано"),
+            ("n_pruned", "Отброшено"),
+            ("n_counted", "Подсчитано"),
+            ("n_frequent", "Частых наборов"),
+        ]
+    ):
+        counts_axis.bar(
+            [length + (i - 1.5) * width for length in lengths],
+            [getattr(level, field) for level in stats.levels],
+            width=width,
+            edgecolor="k",
+            linewidth=1,
+            label=label,
+        )
+    counts_axis.set_xlabel("Длина набора")
+    counts_axis.set_ylabel("Количество")
+    counts_axis.legend()
+
+    generation_times = [level.generation_time for level in stats.levels]
+    time_axis.bar(lengths, generation_times, edgecolor="k", label="Генерация")
+    time_axis.bar(
+        lengths,
+        [level.counting_time for level in stats.levels],
+        bottom=generation_times,
+        edgecolor="k",
+        label="Подсчёт поддержки",
+    )
+    time_axis.set_xlabel("Длина набора")
+    time_axis.set_ylabel("Время (секунды)")
+    time_axis.legend()
+
+    if trace_memory:
+        memory_axis = axes[2]
+        memory_axis.bar(
+            lengths,
+            [(level.peak_memory or 0) / 2**20 for level in stats.levels],
+            edgecolor="k",
+            color="b",
+            alpha=0.5,
+        )
+        memory_axis.set_xlabel("Длина набора")
+        memory_axis.set_ylabel("Пиковая память (МБ)")
+    figure.tight_layout()
+
+
 def first_task():
     print(
         "Задание №1. Демонстрация алгоритма Априори для небольшого набора данных.",
@@ -133,7 +266,7 @@ def first_task():
     min_support: float = 0.1
     confidence_threshold: float = 0.1
 
-    frequent_item_sets, rules = apriori(
+    frequent_item_sets, rules = MINER(
         transactions, min_support, confidence_threshold, OrderedType.LEXICAL_ASCENDING
     )
 
@@ -156,8 +289,8 @@ def second_task():
     min_support: float = 0.01
     confidence_threshold: float = 0.3
 
-    frequent_item_sets, rules, calc_time = run_apriori_file(
-        TEST_DATA_FILENAME, min_support, confidence_threshold
+    frequent_item_sets, rules, load_time, calc_time = run_apriori_file(
+        TEST_DATA_FILENAME, min_support, confidence_threshold, MINER
     )
 
     print(f"Файл с тестовыми данными: {TEST_DATA_FILENAME}")
@@ -168,6 +301,7 @@ def second_task():
     print("\nПравила:", end="\n")
     print_rules(rules)
 
+    print(f"Время загрузки данных: {round(load_time, 3):.3f} секунд")
     print(f"Время работы алгоритма: {round(calc_time, 3):.3f} секунд", end="\n\n")
 
 
@@ -177,17 +311,23 @@ def third_task():
     min_support: float = 0.01
     confidence_thresholds: List[float] = [0.1, 0.2, 0.3, 0.4, 0.5]
 
+    # Частые наборы ищутся один раз, для каждого порога генерируются только правила
+    cache = MiningCache()
+    # Поиск выполняется только при первом запуске, его статистика и выводится.
+    # Память не отслеживается: tracemalloc в разы замедляет поиск
+    stats = MiningStats()
     frequent_item_sets_list: List[List[Set[OrderedType]]] = []
     rules_list: List[List[Tuple[FrozenSet, FrozenSet, float]]] = []
     execution_times: List[float] = []
     for threshold in confidence_thresholds:
         print(f"Старт алгоритма с порогом достоверности: {threshold}...")
-        item_sets, rules, calc_time = run_apriori_file(
-            TEST_DATA_FILENAME, min_support, threshold
+        item_sets, rules, load_time, calc_time = run_apriori_file(
+            TEST_DATA_FILENAME, min_support, threshold, MINER, cache=cache, stats=stats
         )
         frequent_item_sets_list.append(item_sets)
         rules_list.append(rules)
         execution_times.append(calc_time)
+        print(f"Время загрузки данных: {round(load_time, 3):.3f} секунд")
         print(f"Время работы алгоритма: {round(calc_time, 3):.3f} секунд")
     print("", end="\n")
 
@@ -207,6 +347,11 @@ def third_task():
         "Зависимость количества найденных правил от порога достоверности",
     )
 
+    print(stats, end="\n\n")
+    # Статистику по уровням собирает только apriori()
+    if stats.levels:
+        make_figure_stats(stats)
+
     plt.show()
 
 
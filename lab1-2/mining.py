@@ -0,0 +1,248 @@
+from apriori import (
+    OrderedType,
+    _generate_rules,
+    _sort_items,
+    apriori,
+    apriori_update,
+)
+from collections import OrderedDict
+from rules import RuleSet
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+
+# Максимальное количество результатов в кэше по умолчанию
+CACHE_SIZE: int = 8
+
+
+class MiningResult:
+    """Часто встречающиеся наборы, найденные один раз при минимальном пороге
+    поддержки. По ним без повторного поиска отвечает на запросы с любым
+    большим порогом поддержки и любым порогом уверенности.
+    """
+
+    def __init__(
+        self,
+        item_sets: List[Dict[FrozenSet[Any], float]],
+        min_support: float,
+        n_transactions: Optional[int] = None,
+    ):
+        self.item_sets = item_sets
+        self.min_support = min_support
+        self.n_transactions = n_transactions
+
+    @classmethod
+    def mine(
+        cls,
+        data_set: List[Set[Any]],
+        min_support: float,
+        miner: Callable = apriori,
+        **kwargs,
+    ) -> "MiningResult":
+        """Ищет часто встречающиеся наборы без генерации правил.
+
+        Аргументы:
+            data_set (List[Set[Any]]): Входные данные.
+            min_support (float): Порог поддержки.
+            miner (Callable): Алгоритм поиска частых наборов (apriori или fpgrowth).
+            **kwargs: Дополнительные аргументы алгоритма.
+
+        Возвращает:
+            MiningResult: Результат поиска.
+        """
+        item_sets, _ = miner(data_set, min_support, None, **kwargs)
+        return cls(item_sets, min_support, len(data_set))
+
+    def update(
+        self, data_set: List[Set[Any]], increment: List[Set[Any]]
+    ) -> "MiningResult":
+        """Обновляет результат после добавления транзакций без полного повторного
+        поиска (алгоритм FUP, см. apriori_update()).
+
+        Аргументы:
+            data_set (List[Set[Any]]): Транзакции, по которым был получен результат.
+            increment (List[Set[Any]]): Добавленные транзакции.
+
+        Возвращает:
+            MiningResult: Результат для объединения data_set и increment.
+        """
+        if self.n_transactions is not None and self.n_transactions != len(data_set):
+            raise ValueError(
+                f"data_set has {len(data_set)} transactions, "
+                f"the result was mined from {self.n_transactions}"
+            )
+        item_sets, _ = apriori_update(
+            self.item_sets,
+            data_set,
+            increment,
+            self.min_support,
+            None,
+        )
+        return MiningResult(
+            item_sets, self.min_support, len(data_set) + len(increment)
+        )
+
+    def frequent_item_sets(
+        self, min_support: Optional[float] = None, order: Optional[OrderedType] = None
+    ) -> List[Dict[FrozenSet[Any], float]]:
+        """Возвращает часто встречающиеся наборы для порога поддержки не ниже
+        того, с которым выполнялся поиск.
+
+        Аргументы:
+            min_support (Optional[float]): Порог поддержки (по умолчанию - порог поиска).
+            order (Optional[OrderedType]): Порядок сортировки.
+
+        Возвращает:
+            List[Dict[FrozenSet[Any], float]]: Список словарей с часто встречающимися наборами.
+        """
+        if min_support is None:
+            min_support = self.min_support
+        if min_support < self.min_support:
+            raise ValueError(
+                f"min_support {min_support} is lower than the mined {self.min_support}"
+            )
+
+        L: List[Dict[FrozenSet[Any], float]] = []
+        for level in self.item_sets:
+            Lk = {
+                item_set: support
+                for item_set, support in level.items()
+                if support >= min_support
+            }
+            # Если нет частых наборов длины k, то нет и более длинных
+            if not Lk and L:
+                break
+            if order:
+                Lk = _sort_items(Lk, order)
+            L.append(Lk)
+        return L
+
+    def rules(
+        self, confidence_threshold: float, min_support: Optional[float] = None
+    ) -> RuleSet:
+        """Генерирует ассоциативные правила для заданных порогов.
+
+        Аргументы:
+            confidence_threshold (float): Порог уверенности.
+            min_support (Optional[float]): Порог поддержки (по умолчанию - порог поиска).
+
+        Возвращает:
+            RuleSet: Правила; при итерации - кортежи (предпосылка, заключение, уверенность).
+        """
+        return _generate_rules(
+            self.frequent_item_sets(min_support), confidence_threshold
+        )
+
+    def query(
+        self,
+        min_support: float,
+        confidence_threshold: float,
+        order: Optional[OrderedType] = None,
+    ) -> Tuple[List[Dict[FrozenSet[Any], float]], RuleSet]:
+        """Возвращает тот же результат, что и apriori() с заданными порогами.
+
+        Аргументы:
+            min_support (float): Порог поддержки.
+            confidence_threshold (float): Порог уверенности.
+            order (Optional[OrderedType]): Порядок сортировки.
+
+        Возвращает:
+            Tuple[List[Dict[FrozenSet[Any], float]], RuleSet]: Список часто
+                встречающихся наборов элементов и правил.
+        """
+        L = self.frequent_item_sets(min_support, order)
+        return L, _generate_rules(L, confidence_threshold)
+
+
+class MiningCache:
+    """Кэш результатов поиска для пар (набор данных, порог поддержки) с
+    вытеснением давно не использованных (LRU).
+
+    Запрос с порогом поддержки выше, чем у уже найденного результата для того же
+    набора данных, обслуживается этим результатом без повторного поиска.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._results: "OrderedDict[Tuple[Hashable, float], MiningResult]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self):
+        self._results.clear()
+
+    def get(
+        self,
+        key: Hashable,
+        data_set: Callable[[], List[Set[Any]]],
+        min_support: float,
+        miner: Callable = apriori,
+        **kwargs,
+    ) -> MiningResult:
+        """Возвращает результат поиска для набора данных с ключом key, при
+        отсутствии подходящего результата выполняет поиск.
+
+        Аргументы:
+            key (Hashable): Ключ набора данных (должен меняться вместе с данными).
+            data_set (Callable[[], List[Set[Any]]]): Функция, загружающая набор данных.
+                Вызывается только при промахе кэша.
+            min_support (float): Порог поддержки.
+            miner (Callable): Алгоритм поиска частых наборов.
+            **kwargs: Дополнительные аргументы алгоритма.
+
+        Возвращает:
+            MiningResult: Результат поиска с порогом поддержки не выше min_support.
+        """
+        for cache_key, result in self._results.items():
+            if cache_key[0] == key and result.min_support <= min_support:
+                self._results.move_to_end(cache_key)
+                return result
+
+        result = MiningResult.mine(data_set(), min_support, miner, **kwargs)
+        self._results[(key, min_support)] = result
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return result
+
+
+def sweep(
+    data_set: List[Set[Any]],
+    min_supports: List[float],
+    confidence_thresholds: List[float],
+    miner: Callable = apriori,
+    **kwargs,
+) -> Dict[Tuple[float, float], Tuple[List[Dict[FrozenSet[Any], float]], RuleSet]]:
+    """Перебирает пороги поддержки и уверенности, выполняя поиск частых наборов
+    один раз при наименьшем пороге поддержки.
+
+    Аргументы:
+        data_set (List[Set[Any]]): Входные данные.
+        min_supports (List[float]): Пороги поддержки.
+        confidence_thresholds (List[float]): Пороги уверенности.
+        miner (Callable): Алгоритм поиска частых наборов.
+        **kwargs: Дополнительные аргументы алгоритма.
+
+    Возвращает:
+        Dict[Tuple[float, float], Tuple[List[Dict[FrozenSet[Any], float]], RuleSet]]:
+            Результаты apriori() для каждой пары (порог поддержки, порог уверенности).
+    """
+    result = MiningResult.mine(data_set, min(min_supports), miner, **kwargs)
+    return {
+        (min_support, confidence_threshold): result.query(
+            min_support, confidence_threshold
+        )
+        for min_support in min_supports
+        for confidence_threshold in confidence_thresholds
+    }
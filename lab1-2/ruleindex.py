@@ -0,0 +1,327 @@
+import json
+import numpy as np
+import os
+from rules import METRICS, RuleSet
+import shutil
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+
+# Формат файлов индекса (увеличивается при несовместимых изменениях)
+INDEX_VERSION: int = 1
+
+# Наибольшее количество ячеек (корзина, правило) в одном блоке счётчиков
+QUERY_BLOCK_CELLS: int = 1 << 22
+
+# Массивы индекса, сохраняемые в отдельные файлы <имя>.npy
+_ARRAYS: Tuple[str, ...] = (
+    "antecedent_offsets",
+    "antecedent_items",
+    "consequent_offsets",
+    "consequent_items",
+    "antecedent_postings_offsets",
+    "antecedent_postings",
+    "consequent_postings_offsets",
+    "consequent_postings",
+) + METRICS
+
+
+def _to_csr(
+    item_sets: Iterable[FrozenSet[Any]], ids: Dict[Any, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Записывает наборы в формате CSR, пополняя словарь идентификаторов ids.
+
+    Аргументы:
+        item_sets (Iterable[FrozenSet[Any]]): Наборы предметов.
+        ids (Dict[Any, int]): Идентификаторы предметов.
+
+    Возвращает:
+        Tuple[np.ndarray, np.ndarray]: Смещения наборов (int64) и идентификаторы
+            их предметов по возрастанию (int32).
+    """
+    rows = [sorted(ids.setdefault(item, len(ids)) for item in s) for s in item_sets]
+    lengths = np.fromiter(map(len, rows), np.int64, len(rows))
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    items = np.fromiter(
+        (item for row in rows for item in row), np.int32, int(offsets[-1])
+    )
+    return offsets, items
+
+
+def _invert(
+    offsets: np.ndarray, items: np.ndarray, n_items: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Строит инвертированный индекс предмет -> номера наборов (тоже CSR).
+
+    Аргументы:
+        offsets (np.ndarray): Смещения наборов.
+        items (np.ndarray): Предметы наборов.
+        n_items (int): Количество различных предметов.
+
+    Возвращает:
+        Tuple[np.ndarray, np.ndarray]: Смещения списков предметов и номера
+            наборов в каждом списке по возрастанию.
+    """
+    rows = np.repeat(np.arange(len(offsets) - 1, dtype=np.int32), np.diff(offsets))
+    order = np.argsort(items, kind="stable")
+    counts = np.bincount(items, minlength=n_items)
+    postings_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    return postings_offsets, rows[order]
+
+
+def _gather(
+    offsets: np.ndarray, values: np.ndarray, rows: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Собирает строки rows массива CSR в один массив без цикла Python.
+
+    Аргументы:
+        offsets (np.ndarray): Смещения строк.
+        values (np.ndarray): Значения строк.
+        rows (np.ndarray): Номера собираемых строк.
+
+    Возвращает:
+        Tuple[np.ndarray, np.ndarray]: Значения строк подряд и для каждого
+            значения - позиция его строки в rows.
+    """
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    ends = np.cumsum(lengths)
+    positions = np.arange(ends[-1] if len(ends) else 0) + np.repeat(
+        starts - ends + lengths, lengths
+    )
+    return values[positions], np.repeat(np.arange(len(rows)), lengths)
+
+
+class RuleIndex:
+    """Индекс ассоциативных правил для поиска рекомендаций по корзине.
+
+    Предпосылки и заключения правил хранятся в формате CSR из идентификаторов
+    предметов, для каждого предмета хранится список правил, в предпосылке
+    (заключении) которых он встречается. Правило подходит к корзине, если
+    количество предметов корзины в его предпосылке равно длине предпосылки,
+    поэтому поиск сводится к подсчёту np.bincount по спискам предметов корзины.
+    """
+
+    def __init__(self, vocabulary: List[Any], arrays: Dict[str, np.ndarray]):
+        self.vocabulary = vocabulary
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        self.antecedent_lengths = np.diff(self.antecedent_offsets)
+        self.consequent_lengths = np.diff(self.consequent_offsets)
+        self._ids = {item: i for i, item in enumerate(vocabulary)}
+
+    @classmethod
+    def from_rules(cls, rules: RuleSet) -> "RuleIndex":
+        """Строит индекс по правилам (например, результату apriori()).
+
+        Аргументы:
+            rules (RuleSet): Набор правил.
+
+        Возвращает:
+            RuleIndex: Индекс правил.
+        """
+        ids: Dict[Any, int] = {}
+        arrays: Dict[str, np.ndarray] = {}
+        for side, item_sets in [
+            ("antecedent", rules.antecedents),
+            ("consequent", rules.consequents),
+        ]:
+            offsets, items = _to_csr(item_sets, ids)
+            arrays[f"{side}_offsets"] = offsets
+            arrays[f"{side}_items"] = items
+        for side in ("antecedent", "consequent"):
+            (
+                arrays[f"{side}_postings_offsets"],
+                arrays[f"{side}_postings"],
+            ) = _invert(arrays[f"{side}_offsets"], arrays[f"{side}_items"], len(ids))
+        for metric in METRICS:
+            arrays[metric] = np.asarray(getattr(rules, metric), dtype=np.float64)
+        return cls(list(ids), arrays)
+
+    def __len__(self) -> int:
+        return len(self.antecedent_lengths)
+
+    def __repr__(self) -> str:
+        return f"RuleIndex({len(self)} rules, {len(self.vocabulary)} items)"
+
+    def _decode(self, positions: np.ndarray) -> RuleSet:
+        """Возвращает правила с номерами positions в виде RuleSet.
+
+        Аргументы:
+            positions (np.ndarray): Номера правил.
+
+        Возвращает:
+            RuleSet: Набор правил в порядке positions.
+        """
+        item_sets: Dict[str, List[FrozenSet[Any]]] = {}
+        for side in ("antecedent", "consequent"):
+            offsets = getattr(self, f"{side}_offsets")
+            items = getattr(self, f"{side}_items")
+            item_sets[side] = [
+                frozenset(map(self.vocabulary.__getitem__, items[start:end].tolist()))
+                for start, end in zip(
+                    offsets[positions].tolist(), offsets[positions + 1].tolist()
+                )
+            ]
+        return RuleSet(
+            item_sets["antecedent"],
+            item_sets["consequent"],
+            *(np.asarray(getattr(self, metric)[positions]) for metric in METRICS),
+        )
+
+    def _count(self, side: str, baskets: List[np.ndarray]) -> np.ndarray:
+        """Подсчитывает для каждой корзины и каждого правила количество
+        предметов корзины в предпосылке (заключении) правила.
+
+        Аргументы:
+            side (str): "antecedent" или "consequent".
+            baskets (List[np.ndarray]): Корзины из идентификаторов предметов.
+
+        Возвращает:
+            np.ndarray: Матрица счётчиков формы (len(baskets), len(self)).
+        """
+        items = np.concatenate(baskets).astype(np.int64)
+        basket_of_item = np.repeat(np.arange(len(baskets)), [len(b) for b in baskets])
+        rules, positions = _gather(
+            getattr(self, f"{side}_postings_offsets"),
+            getattr(self, f"{side}_postings"),
+            items,
+        )
+        cells = basket_of_item[positions] * len(self) + rules
+        return np.bincount(cells, minlength=len(baskets) * len(self)).reshape(
+            len(baskets), len(self)
+        )
+
+    def _encode(self, basket: Iterable[Any]) -> np.ndarray:
+        """Заменяет предметы корзины идентификаторами, пропуская неизвестные.
+
+        Аргументы:
+            basket (Iterable[Any]): Корзина.
+
+        Возвращает:
+            np.ndarray: Идентификаторы различных известных предметов корзины.
+        """
+        ids = self._ids
+        return np.array(
+            sorted({ids[item] for item in basket if item in ids}), dtype=np.int64
+        )
+
+    def query_batch(
+        self,
+        baskets: Iterable[Iterable[Any]],
+        metric: str = "confidence",
+        n: Optional[int] = None,
+        skip_owned: bool = False,
+    ) -> List[RuleSet]:
+        """Находит для каждой корзины правила, предпосылка которых содержится в ней.
+
+        Корзины обрабатываются блоками так, чтобы матрица счётчиков блока
+        содержала не больше QUERY_BLOCK_CELLS ячеек.
+
+        Аргументы:
+            baskets (Iterable[Iterable[Any]]): Корзины покупателей.
+            metric (str): Метрика из METRICS, по убыванию которой упорядочиваются
+                правила (при равенстве - в порядке исходного набора правил).
+            n (Optional[int]): Наибольшее количество правил для корзины.
+            skip_owned (bool): Пропускать правила, всё заключение которых уже
+                есть в корзине.
+
+        Возвращает:
+            List[RuleSet]: Подходящие правила для каждой корзины.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"unknown metric: {metric}")
+        values = np.asarray(getattr(self, metric))
+        encoded = [self._encode(basket) for basket in baskets]
+        block_size = max(1, QUERY_BLOCK_CELLS // max(1, len(self)))
+
+        results: List[RuleSet] = []
+        for start in range(0, len(encoded), block_size):
+            block = encoded[start : start + block_size]
+            matched = self._count("antecedent", block) == self.antecedent_lengths
+            if skip_owned:
+                matched &= self._count("consequent", block) < self.consequent_lengths
+            for row in matched:
+                positions = np.flatnonzero(row)
+                order = np.argsort(-values[positions], kind="stable")
+                results.append(self._decode(positions[order[:n]]))
+        return results
+
+    def query(
+        self,
+        basket: Iterable[Any],
+        metric: str = "confidence",
+        n: Optional[int] = None,
+        skip_owned: bool = False,
+    ) -> RuleSet:
+        """Находит правила, предпосылка которых содержится в корзине.
+
+        Аргументы:
+            basket (Iterable[Any]): Корзина покупателя.
+            metric (str): Метрика из METRICS для упорядочивания по убыванию.
+            n (Optional[int]): Наибольшее количество правил.
+            skip_owned (bool): Пропускать правила, всё заключение которых уже
+                есть в корзине.
+
+        Возвращает:
+            RuleSet: Подходящие правила.
+        """
+        return self.query_batch([basket], metric, n, skip_owned)[0]
+
+    def save(self, index_dir: str):
+        """Сохраняет индекс в каталог: массивы в файлы .npy, предметы в
+        vocabulary.json (поэтому предметы должны сериализоваться в JSON).
+
+        Аргументы:
+            index_dir (str): Каталог индекса.
+        """
+        # Собираем индекс во временном каталоге и подменяем им старый целиком
+        tmp_dir = f"{index_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for name in _ARRAYS:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(self, name))
+        with open(
+            os.path.join(tmp_dir, "vocabulary.json"), "w", encoding="utf-8"
+        ) as file:
+            json.dump(self.vocabulary, file, ensure_ascii=False)
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as file:
+            json.dump({"version": INDEX_VERSION, "n_rules": len(self)}, file)
+
+        shutil.rmtree(index_dir, ignore_errors=True)
+        os.replace(tmp_dir, index_dir)
+
+
+def load_rule_index(index_dir: str, mmap: bool = True) -> RuleIndex:
+    """Загружает индекс, сохранённый RuleIndex.save().
+
+    Аргументы:
+        index_dir (str): Каталог индекса.
+        mmap (bool): Отображать массивы в память (np.load(mmap_mode="r")) вместо
+            чтения, тогда загрузка не зависит от количества правил.
+
+    Возвращает:
+        RuleIndex: Индекс правил.
+    """
+    with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as file:
+        meta = json.load(file)
+    if meta.get("version") != INDEX_VERSION:
+        raise ValueError(
+            f"unsupported index version {meta.get('version')} in {index_dir}"
+        )
+    with open(os.path.join(index_dir, "vocabulary.json"), encoding="utf-8") as file:
+        vocabulary = json.load(file)
+    arrays = {
+        name: np.load(
+            os.path.join(index_dir, f"{name}.npy"), mmap_mode="r" if mmap else None
+        )
+        for name in _ARRAYS
+    }
+    return RuleIndex(vocabulary, arrays)
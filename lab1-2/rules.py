@@ -0,0 +1,182 @@
+import numpy as np
+from typing import (
+    Any,
+    Callable,
+    FrozenSet,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+
+# Метрики правил, хранящиеся в RuleSet отдельными столбцами
+METRICS: Tuple[str, ...] = ("support", "confidence", "lift", "leverage", "conviction")
+
+
+class RuleSet:
+    """Ассоциативные правила в столбцовом представлении.
+
+    Предпосылки и заключения хранятся списками, а метрики - массивами NumPy.
+    Для совместимости со списком кортежей при итерации и индексации правило
+    возвращается как (предпосылка, заключение, уверенность).
+    """
+
+    def __init__(
+        self,
+        antecedents: List[FrozenSet[Any]],
+        consequents: List[FrozenSet[Any]],
+        support: np.ndarray,
+        confidence: np.ndarray,
+        lift: np.ndarray,
+        leverage: np.ndarray,
+        conviction: np.ndarray,
+    ):
+        self.antecedents = antecedents
+        self.consequents = consequents
+        self.support = support
+        self.confidence = confidence
+        self.lift = lift
+        self.leverage = leverage
+        self.conviction = conviction
+
+    @classmethod
+    def from_supports(
+        cls,
+        antecedents: List[FrozenSet[Any]],
+        consequents: List[FrozenSet[Any]],
+        item_set_support: np.ndarray,
+        antecedent_support: np.ndarray,
+        consequent_support: np.ndarray,
+    ) -> "RuleSet":
+        """Вычисляет метрики всех правил сразу по массивам поддержек.
+
+        Аргументы:
+            antecedents (List[FrozenSet[Any]]): Предпосылки правил.
+            consequents (List[FrozenSet[Any]]): Заключения правил.
+            item_set_support (np.ndarray): Поддержки наборов (предпосылка + заключение).
+            antecedent_support (np.ndarray): Поддержки предпосылок.
+            consequent_support (np.ndarray): Поддержки заключений.
+
+        Возвращает:
+            RuleSet: Набор правил.
+        """
+        confidence = item_set_support / antecedent_support
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lift = confidence / consequent_support
+            conviction = np.where(
+                confidence < 1.0,
+                (1.0 - consequent_support) / (1.0 - confidence),
+                np.inf,
+            )
+        leverage = item_set_support - antecedent_support * consequent_support
+        return cls(
+            antecedents,
+            consequents,
+            item_set_support,
+            confidence,
+            lift,
+            leverage,
+            conviction,
+        )
+
+    @classmethod
+    def empty(cls) -> "RuleSet":
+        """Создаёт пустой набор правил.
+
+        Возвращает:
+            RuleSet: Набор правил без правил.
+        """
+        return cls([], [], *(np.zeros(0) for _ in METRICS))
+
+    @classmethod
+    def concat(cls, rule_sets: Sequence["RuleSet"]) -> "RuleSet":
+        """Объединяет несколько наборов правил в один.
+
+        Аргументы:
+            rule_sets (Sequence[RuleSet]): Наборы правил.
+
+        Возвращает:
+            RuleSet: Правила всех наборов в исходном порядке.
+        """
+        if not rule_sets:
+            return cls.empty()
+        return cls(
+            [item_set for rules in rule_sets for item_set in rules.antecedents],
+            [item_set for rules in rule_sets for item_set in rules.consequents],
+            *(
+                np.concatenate([getattr(rules, metric) for rules in rule_sets])
+                for metric in METRICS
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.antecedents)
+
+    def __iter__(self) -> Iterator[Tuple[FrozenSet[Any], FrozenSet[Any], float]]:
+        return zip(self.antecedents, self.consequents, self.confidence.tolist())
+
+    def __getitem__(
+        self, index: Union[int, slice, Sequence[int], np.ndarray]
+    ) -> Union[Tuple[FrozenSet[Any], FrozenSet[Any], float], "RuleSet"]:
+        if isinstance(index, (int, np.integer)):
+            return (
+                self.antecedents[index],
+                self.consequents[index],
+                float(self.confidence[index]),
+            )
+        # Срез, массив индексов или булева маска
+        positions = np.arange(len(self))[index]
+        return RuleSet(
+            [self.antecedents[i] for i in positions],
+            [self.consequents[i] for i in positions],
+            *(getattr(self, metric)[positions] for metric in METRICS),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (RuleSet, list)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"RuleSet({len(self)} rules)"
+
+    def sorted_by(self, metric: str = "confidence", reverse: bool = True) -> "RuleSet":
+        """Сортирует правила по значению метрики.
+
+        Аргументы:
+            metric (str): Название метрики из METRICS.
+            reverse (bool): Сортировать по убыванию.
+
+        Возвращает:
+            RuleSet: Отсортированный набор правил.
+        """
+        values = getattr(self, metric)
+        order = np.argsort(-values if reverse else values, kind="stable")
+        return self[order]
+
+    def map_items(self, function: Callable[[Any], Any]) -> "RuleSet":
+        """Заменяет предметы в предпосылках и заключениях правил.
+
+        Аргументы:
+            function (Callable[[Any], Any]): Функция преобразования предмета.
+
+        Возвращает:
+            RuleSet: Набор правил с преобразованными предметами.
+        """
+        return RuleSet(
+            [frozenset(map(function, item_set)) for item_set in self.antecedents],
+            [frozenset(map(function, item_set)) for item_set in self.consequents],
+            *(getattr(self, metric) for metric in METRICS),
+        )
+
+    def to_list(self) -> List[Tuple[FrozenSet[Any], FrozenSet[Any], float]]:
+        """Возвращает правила списком кортежей (предпосылка, заключение, уверенность).
+
+        Возвращает:
+            List[Tuple[FrozenSet[Any], FrozenSet[Any], float]]: Список правил.
+        """
+        return list(self)
@@ -0,0 +1,179 @@
+from contextlib import contextmanager
+from time import perf_counter
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+
+# Фазы, время которых учитывается для всего поиска
+PHASES = ("encode", "mining", "decode", "sort", "rules")
+
+
+class LevelStats:
+    """Статистика одного уровня алгоритма Априори (наборы длины length)."""
+
+    def __init__(self, length: int):
+        self.length = length
+        # Количество кандидатов, полученных соединением L(k-1)
+        self.n_generated: int = 0
+        # Количество кандидатов, отброшенных проверкой подмножеств
+        self.n_pruned: int = 0
+        # Количество кандидатов, для которых подсчитывалась поддержка
+        self.n_counted: int = 0
+        # Количество найденных часто встречающихся наборов
+        self.n_frequent: int = 0
+        # Количество строк набора данных, просмотренных при подсчёте
+        self.n_transactions: Optional[int] = None
+        self.generation_time: float = 0.0
+        self.counting_time: float = 0.0
+        # Пиковый объём выделенной памяти на уровне (байты), если она отслеживалась
+        self.peak_memory: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает статистику уровня словарём.
+
+        Возвращает:
+            Dict[str, Any]: Значения всех полей.
+        """
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        return (
+            f"LevelStats(length={self.length}, generated={self.n_generated}, "
+            f"pruned={self.n_pruned}, counted={self.n_counted}, "
+            f"frequent={self.n_frequent})"
+        )
+
+
+class SamplingStats:
+    """Сведения о поиске по случайной выборке транзакций (алгоритм Тойвонена)."""
+
+    def __init__(
+        self,
+        sample_size: int,
+        n_transactions: int,
+        lowered_support: float,
+        epsilon: float,
+    ):
+        self.sample_size = sample_size
+        self.n_transactions = n_transactions
+        # Порог поддержки, с которым обрабатывалась выборка
+        self.lowered_support = lowered_support
+        # Граница отклонения поддержки по выборке от истинной (с вероятностью
+        # 1 - SAMPLING_DELTA для каждого набора)
+        self.epsilon = epsilon
+        # Количество наборов отрицательной границы
+        self.n_negative_border: int = 0
+        # Выполнялась ли проверка по всем транзакциям
+        self.verified: bool = False
+        # Наборы отрицательной границы, оказавшиеся часто встречающимися: их
+        # надмножества могли быть пропущены, нужен повторный поиск
+        self.misses: List[Any] = []
+
+    @property
+    def exact(self) -> bool:
+        """Результат проверен и совпадает с точным."""
+        return self.verified and not self.misses
+
+    def __repr__(self) -> str:
+        return (
+            f"SamplingStats(sample_size={self.sample_size}, "
+            f"epsilon={self.epsilon:.4f}, verified={self.verified}, "
+            f"misses={len(self.misses)})"
+        )
+
+
+class MiningStats:
+    """Статистика выполнения apriori(): по уровням и по фазам всего поиска.
+
+    Передаётся в apriori() аргументом stats и заполняется во время работы.
+
+    Аргументы:
+        trace_memory (bool): Отслеживать пиковый объём памяти через tracemalloc.
+            Заметно замедляет работу, поэтому время при этом завышено.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.levels: List[LevelStats] = []
+        # Время фаз из PHASES (секунды)
+        self.times: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.peak_memory: Optional[int] = None
+        # Сведения о поиске по выборке, если он выполнялся
+        self.sampling: Optional[SamplingStats] = None
+
+    def level(self, length: int) -> LevelStats:
+        """Начинает уровень: создаёт его статистику и сбрасывает пик памяти.
+
+        Аргументы:
+            length (int): Длина наборов уровня.
+
+        Возвращает:
+            LevelStats: Статистика уровня.
+        """
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        level = LevelStats(length)
+        self.levels.append(level)
+        return level
+
+    def finish_level(
+        self,
+        level: LevelStats,
+        callback: Optional[Callable[[LevelStats], None]] = None,
+    ):
+        """Завершает уровень: запоминает пик памяти и вызывает callback.
+
+        Аргументы:
+            level (LevelStats): Статистика уровня.
+            callback (Optional[Callable[[LevelStats], None]]): Функция, вызываемая
+                после каждого уровня.
+        """
+        if self.trace_memory and tracemalloc.is_tracing():
+            level.peak_memory = tracemalloc.get_traced_memory()[1]
+            self.peak_memory = max(self.peak_memory or 0, level.peak_memory)
+        if callback is not None:
+            callback(level)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Измеряет время фазы name и прибавляет его к times[name].
+
+        Аргументы:
+            name (str): Название фазы из PHASES.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] += perf_counter() - start
+
+    @contextmanager
+    def tracing(self) -> Iterator[None]:
+        """Включает tracemalloc на время поиска, если trace_memory и он ещё не включён."""
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Возвращает статистику уровней списком словарей (например, для JSON).
+
+        Возвращает:
+            List[Dict[str, Any]]: Статистика каждого уровня.
+        """
+        return [level.to_dict() for level in self.levels]
+
+    def __repr__(self) -> str:
+        times = ", ".join(f"{name}={value:.3f}s" for name, value in self.times.items())
+        return f"MiningStats({len(self.levels)} levels, {times})"
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+
+# Количество интервалов (квантилей) для числовых столбцов по умолчанию
+DEFAULT_BINS: int = 4
+
+# Количество строк, распаковываемых за раз при переборе транзакций
+CHUNK_SIZE: int = 10000
+
+
+class ItemMatrix:
+    """Табличные данные как упакованная битовая матрица предметов.
+
+    Строка packed[j] - упакованный по 8 бит в байте (младший бит первым)
+    столбец j исходной булевой матрицы, т.е. битовое множество TID предмета
+    vocabulary[j]. Поддержка набора - количество единиц в побитовом AND его
+    столбцов, поэтому apriori() с counting=BITSET работает прямо по матрице,
+    не создавая множество предметов для каждой строки.
+    """
+
+    def __init__(self, packed: np.ndarray, n_transactions: int, vocabulary: List[Any]):
+        self.packed = packed
+        self.n_transactions = n_transactions
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_array(
+        cls, matrix: np.ndarray, labels: Optional[Sequence[Any]] = None
+    ) -> "ItemMatrix":
+        """Строит матрицу по булевой матрице one-hot (строки - транзакции).
+
+        Аргументы:
+            matrix (np.ndarray): Матрица формы (транзакции, предметы).
+            labels (Optional[Sequence[Any]]): Предметы столбцов (по умолчанию
+                номера столбцов).
+
+        Возвращает:
+            ItemMatrix: Битовая матрица.
+        """
+        matrix = np.asarray(matrix, dtype=bool)
+        if matrix.ndim != 2:
+            raise ValueError(f"expected a 2-dimensional matrix, got {matrix.ndim}")
+        if labels is None:
+            labels = range(matrix.shape[1])
+        if len(labels) != matrix.shape[1]:
+            raise ValueError("labels must match the number of columns")
+        packed = np.packbits(matrix.T, axis=1, bitorder="little")
+        return cls(packed, matrix.shape[0], list(labels))
+
+    @classmethod
+    def from_frame(
+        cls, data: pd.DataFrame, bins: Union[int, Dict[str, Any]] = DEFAULT_BINS
+    ) -> "ItemMatrix":
+        """Строит матрицу по таблице: каждое значение столбца становится
+        предметом "столбец=значение".
+
+        Булевы столбцы (например, результат pd.get_dummies()) дают один предмет
+        с названием столбца без "=значение", присутствующий в строках со
+        значением True (пропуск pd.NA считается False).
+        Числовые столбцы с большим, чем bins, количеством различных значений
+        разбиваются на интервалы, и предметом становится интервал. Пропуски
+        предметов не дают.
+
+        Аргументы:
+            data (pd.DataFrame): Таблица (строки - транзакции).
+            bins (Union[int, Dict[str, Any]]): Количество интервалов равной
+                частоты (pd.qcut) для числовых столбцов или словарь с ним для
+                отдельных столбцов; значение словаря - количество интервалов
+                или список их границ (pd.cut). Столбцы не из словаря
+                разбиваются на DEFAULT_BINS интервалов.
+
+        Возвращает:
+            ItemMatrix: Битовая матрица.
+        """
+        rows: List[np.ndarray] = []
+        vocabulary: List[Any] = []
+        for col in data.columns:
+            column = data[col]
+            if pd.api.types.is_bool_dtype(column):
+                # Столбец типа boolean может содержать pd.NA
+                values = column.fillna(False).to_numpy(dtype=bool)
+                rows.append(np.packbits(values, bitorder="little"))
+                vocabulary.append(col)
+                continue
+
+            col_bins = bins.get(col, DEFAULT_BINS) if isinstance(bins, dict) else bins
+            if pd.api.types.is_numeric_dtype(column):
+                if not isinstance(col_bins, int):
+                    column = pd.cut(column, col_bins, right=False)
+                elif column.nunique() > col_bins:
+                    column = pd.qcut(column, col_bins, duplicates="drop")
+            categorical = pd.Categorical(column)
+            codes = categorical.codes
+            for code, value in enumerate(categorical.categories):
+                rows.append(np.packbits(codes == code, bitorder="little"))
+                vocabulary.append(f"{col}={value}")
+
+        n_bytes = (len(data) + 7) // 8
+        packed = np.array(rows, dtype=np.uint8).reshape(len(rows), n_bytes)
+        return cls(packed, len(data), vocabulary)
+
+    def __len__(self) -> int:
+        return self.n_transactions
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[FrozenSet[int], List[FrozenSet[int]]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        bits = (self.packed[:, index >> 3] >> (index & 7)) & 1
+        return frozenset(np.flatnonzero(bits).tolist())
+
+    def __iter__(self) -> Iterator[FrozenSet[int]]:
+        # Размер порции кратен 8, чтобы порции не делили байты столбцов
+        chunk_size = (CHUNK_SIZE + 7) // 8 * 8
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            block = np.unpackbits(
+                self.packed[:, start // 8 : (stop + 7) // 8],
+                axis=1,
+                count=stop - start,
+                bitorder="little",
+            )
+            for row in block.T:
+                yield frozenset(np.flatnonzero(row).tolist())
+
+    def tidsets(self) -> Dict[int, int]:
+        """Возвращает битовые множества TID предметов - строки packed в виде
+        целых чисел (предметы, не встречающиеся ни разу, пропускаются).
+
+        Возвращает:
+            Dict[int, int]: Словарь, где ключи - предметы, а значения - их битовые множества TID.
+        """
+        tidsets = {
+            item: int.from_bytes(row.tobytes(), "little")
+            for item, row in enumerate(self.packed)
+        }
+        return {item: tidset for item, tidset in tidsets.items() if tidset}
@@ -1,13 +1,30 @@
 import apyori
+import random
 import unittest
+from unittest.mock import patch
 from apriori import (
+    CountingType,
     OrderedType,
+    OutputType,
+    SamplingType,
+    TrimmingType,
+    _build_tidsets,
     _calc_support,
     _calc_support_candidate,
     _apriori_gen,
+    _apriori_gen_prefix,
+    _min_count,
     _sort_items,
+    _trim_transactions,
     apriori,
+    apriori_update,
+    expand_closed,
+    fpgrowth,
+    iter_levels,
+    iter_rules,
+    top_rules,
 )
+from stats import PHASES, MiningStats
 
 
 class TestAprioriAlgorithm(unittest.TestCase):
@@ -41,12 +58,40 @@ class TestAprioriAlgorithm(unittest.TestCase):
             _calc_support_candidate(data_set, candidate, min_support), expected
         )
 
+    def test_build_tidsets(self):
+        data_set = [{"a", "b"}, {"b", "c", "a"}, {"a", "c"}, {"a", "b", "c", "e"}]
+        expected = {"a": 0b1111, "b": 0b1011, "c": 0b1110, "e": 0b1000}
+        self.assertEqual(_build_tidsets(data_set), expected)
+
+    def test_min_count(self):
+        self.assertEqual(_min_count(0.5, 5), 3)
+        self.assertEqual(_min_count(0.6, 5), 3)
+        self.assertEqual(_min_count(0.01, 7500), 75)
+        self.assertEqual(_min_count(0.0, 10), 0)
+        self.assertEqual(_min_count(0.5, 0), 0)
+
     def test_apriori_gen(self):
         item_set = {frozenset(["a"]), frozenset(["b"]), frozenset(["c"])}
         length = 2
         expected = {frozenset(["a", "b"]), frozenset(["a", "c"]), frozenset(["b", "c"])}
         self.assertEqual(_apriori_gen(item_set, length), expected)
 
+    def test_apriori_gen_prefix(self):
+        item_set = [(0, 1), (0, 2), (1, 2), (1, 3), (2, 3)]
+        length = 3
+        # Все подмножества обоих кандидатов часто встречаются
+        candidates, n_generated, n_pruned = _apriori_gen_prefix(item_set, length)
+        self.assertEqual(candidates, [(0, 1, 2), (1, 2, 3)])
+        self.assertEqual(n_generated, 2)
+        self.assertEqual(n_pruned, 0)
+
+        item_set = [(0, 1), (0, 2), (0, 3), (1, 2)]
+        # (0, 1, 3) и (0, 2, 3) отбрасываются: (1, 3) и (2, 3) не часто встречаются
+        candidates, n_generated, n_pruned = _apriori_gen_prefix(item_set, length)
+        self.assertEqual(candidates, [(0, 1, 2)])
+        self.assertEqual(n_generated, 3)
+        self.assertEqual(n_pruned, 2)
+
     def test_sort_items_support_ascending(self):
         input_dict = {"a": 2, "b": 1, "c": 3}
         expected = {"b": 1, "a": 2, "c": 3}
@@ -143,6 +188,414 @@ class TestAprioriAlgorithm(unittest.TestCase):
 
         self.assertEqual(apriori_supports, apyori_supports_converted)
 
+    def test_apriori_bitset_with_apyori(self):
+        data_set = [
+            {"хлеб", "молоко"},
+            {"хлеб", "печенье", "пиво", "яйца"},
+            {"молоко", "печенье", "пиво", "кола"},
+            {"хлеб", "молоко", "печенье", "пиво"},
+            {"хлеб", "молоко", "печенье", "кола"},
+        ]
+        min_support = 0.2
+        confidence_threshold = 0.5
+
+        scan_supports, scan_rules = apriori(
+            data_set, min_support, confidence_threshold, OrderedType.LEXICAL_ASCENDING
+        )
+        bitset_supports, bitset_rules = apriori(
+            data_set,
+            min_support,
+            confidence_threshold,
+            OrderedType.LEXICAL_ASCENDING,
+            counting=CountingType.BITSET,
+        )
+        apyori_supports = apyori.apriori(data_set, min_support=min_support)
+        apyori_supports_converted = self._convert_apyori_result(apyori_supports)
+
+        self.assertEqual(bitset_supports, apyori_supports_converted)
+        self.assertEqual(bitset_supports, scan_supports)
+        self.assertEqual(frozenset(bitset_rules), frozenset(scan_rules))
+
+    def test_fpgrowth(self):
+        data_set = [
+            {"хлеб", "молоко"},
+            {"хлеб", "печенье", "пиво", "яйца"},
+            {"молоко", "печенье", "пиво", "кола"},
+            {"хлеб", "молоко", "печенье", "пиво"},
+            {"хлеб", "молоко", "печенье", "кола"},
+        ]
+
+        for min_support in [0.2, 0.5, 0.9]:
+            apriori_supports, apriori_rules = apriori(
+                data_set, min_support, 0.5, OrderedType.LEXICAL_ASCENDING
+            )
+            fpgrowth_supports, fpgrowth_rules = fpgrowth(
+                data_set, min_support, 0.5, OrderedType.LEXICAL_ASCENDING
+            )
+            self.assertEqual(fpgrowth_supports, apriori_supports)
+            self.assertEqual(frozenset(fpgrowth_rules), frozenset(apriori_rules))
+
+    def test_fpgrowth_empty(self):
+        supports, rules = fpgrowth([], 0.5, 0.5)
+        expected_supports, expected_rules = apriori([], 0.5, 0.5)
+        self.assertEqual(supports, expected_supports)
+        self.assertEqual(rules, expected_rules)
+
+    def test_fpgrowth_with_apyori(self):
+        data_set = [
+            {"хлеб", "молоко"},
+            {"хлеб", "печенье", "пиво", "яйца"},
+            {"молоко", "печенье", "пиво", "кола"},
+            {"хлеб", "молоко", "печенье", "пиво"},
+            {"хлеб", "молоко", "печенье", "кола"},
+        ]
+        min_support = 0.5
+        confidence_threshold = 0.5
+
+        fpgrowth_supports, fpgrowth_rules = fpgrowth(
+            data_set, min_support, confidence_threshold, OrderedType.LEXICAL_ASCENDING
+        )
+        apyori_supports = apyori.apriori(data_set, min_support=min_support)
+        apyori_supports_converted = self._convert_apyori_result(apyori_supports)
+
+        self.assertEqual(fpgrowth_supports, apyori_supports_converted)
+
+    def test_n_jobs(self):
+        data_set = [
+            {"хлеб", "молоко"},
+            {"хлеб", "печенье", "пиво", "яйца"},
+            {"молоко", "печенье", "пиво", "кола"},
+            {"хлеб", "молоко", "печенье", "пиво"},
+            {"хлеб", "молоко", "печенье", "кола"},
+        ]
+        min_support = 0.2
+        confidence_threshold = 0.5
+
+        expected_supports, expected_rules = apriori(
+            data_set, min_support, confidence_threshold, OrderedType.LEXICAL_ASCENDING
+        )
+        for miner, kwargs in [
+            (apriori, {"counting": CountingType.SCAN}),
+            (apriori, {"counting": CountingType.BITSET}),
+            (fpgrowth, {}),
+        ]:
+            supports, rules = miner(
+                data_set,
+                min_support,
+                confidence_threshold,
+                OrderedType.LEXICAL_ASCENDING,
+                n_jobs=2,
+                **kwargs,
+            )
+            self.assertEqual(supports, expected_supports)
+            self.assertEqual(list(supports[1]), list(expected_supports[1]))
+            self.assertEqual(frozenset(rules), frozenset(expected_rules))
+
+    def test_n_jobs_fallback(self):
+        data_set = [{"хлеб", "молоко"}, {"хлеб", "пиво"}]
+        expected_supports, expected_rules = apriori(data_set, 0.5, 0.5)
+        for miner in [apriori, fpgrowth]:
+            self.assertEqual(miner([], 0.5, 0.5, n_jobs=2), apriori([], 0.5, 0.5))
+            # Транзакций меньше, чем процессов
+            supports, rules = miner(data_set, 0.5, 0.5, n_jobs=4)
+            self.assertEqual(supports, expected_supports)
+            self.assertEqual(frozenset(rules), frozenset(expected_rules))
+            with self.assertRaises(ValueError):
+                miner(data_set, 0.5, 0.5, n_jobs=0)
+
+    def test_apriori_update(self):
+        data_set = [
+            {"хлеб", "молоко"},
+            {"хлеб", "печенье", "пиво", "яйца"},
+            {"молоко", "печенье", "пиво", "кола"},
+            {"хлеб", "молоко", "печенье", "пиво"},
+            {"хлеб", "молоко", "печенье", "кола"},
+        ]
+        increment = [
+            {"кола", "яйца"},
+            {"кола", "яйца", "сок"},
+            {"хлеб", "кола", "сок"},
+        ]
+
+        for min_support in [0.2, 0.3, 0.5]:
+            old_supports, _ = apriori(data_set, min_support, None)
+            supports, rules = apriori_update(
+                old_supports,
+                data_set,
+                increment,
+                min_support,
+                0.5,
+                OrderedType.LEXICAL_ASCENDING,
+            )
+            expected_supports, expected_rules = apriori(
+                data_set + increment, min_support, 0.5, OrderedType.LEXICAL_ASCENDING
+            )
+            self.assertEqual(supports, expected_supports)
+            self.assertEqual(frozenset(rules), frozenset(expected_rules))
+
+    def test_apriori_update_random(self):
+        rng = random.Random(0)
+        items = list(range(12))
+        data_set = [set(rng.sample(items, rng.randint(1, 6))) for _ in range(120)]
+
+        L, _ = apriori(data_set[:80], 0.1, None)
+        for start, stop in [(80, 100), (100, 120)]:
+            L, _ = apriori_update(L, data_set[:start], data_set[start:stop], 0.1, None)
+            expected, _ = apriori(data_set[:stop], 0.1, None)
+            self.assertEqual(L, expected)
+
+        # Обновление пустого результата
+        L, _ = apriori([], 0.1, None)
+        L, _ = apriori_update(L, [], data_set, 0.1, None)
+        expected, _ = apriori(data_set, 0.1, None)
+        self.assertEqual(L, expected)
+
+    def test_stats(self):
+        data_set = [
+            {"хлеб", "молоко"},
+            {"хлеб", "печенье", "пиво", "яйца"},
+            {"молоко", "печенье", "пиво", "кола"},
+            {"хлеб", "молоко", "печенье", "пиво"},
+            {"хлеб", "молоко", "печенье", "кола"},
+        ]
+
+        for counting in CountingType:
+            stats = MiningStats(trace_memory=True)
+            levels = []
+            supports, _ = apriori(
+                data_set,
+                0.4,
+                0.5,
+                counting=counting,
+                stats=stats,
+                callback=levels.append,
+            )
+            self.assertEqual(levels, stats.levels)
+            self.assertEqual(set(stats.times), set(PHASES))
+            # Последний уровень не дал частых наборов
+            self.assertEqual(len(stats.levels), len(supports) + 1)
+            self.assertEqual(stats.levels[-1].n_frequent, 0)
+            for level, Lk in zip(stats.levels, supports):
+                self.assertEqual(level.n_frequent, len(Lk))
+            for level in stats.levels:
+                self.assertEqual(level.n_counted, level.n_generated - level.n_pruned)
+                self.assertIsNotNone(level.peak_memory)
+            self.assertEqual(stats.levels[0].n_counted, 6)
+
+    def test_fpgrowth_stats(self):
+        data_set = [{"хлеб", "молоко"}, {"хлеб", "пиво"}, {"хлеб", "молоко"}]
+        stats = MiningStats()
+        fpgrowth(data_set, 0.5, 0.5, stats=stats)
+        self.assertEqual(set(stats.times), set(PHASES))
+        self.assertGreater(stats.times["mining"], 0.0)
+        self.assertEqual(stats.levels, [])
+
+    def test_trim_transactions(self):
+        rows = [
+            (frozenset([1, 2, 3]), 1),
+            (frozenset([1, 2, 4]), 1),
+            (frozenset([1, 4]), 1),
+            (frozenset([2]), 1),
+        ]
+        frequent = [(1, 2), (2, 3)]
+        self.assertEqual(
+            _trim_transactions(rows, frequent, 2, False),
+            [(frozenset([1, 2, 3]), 1)],
+        )
+        self.assertEqual(
+            _trim_transactions(rows, [(1,), (2,)], 1, True),
+            [(frozenset([1, 2]), 2)],
+        )
+
+    def test_trimming(self):
+        rng = random.Random(1)
+        data_set = [set(rng.sample(range(10), rng.randint(1, 7))) for _ in range(200)]
+        data_set += data_set[:50]
+
+        for min_support in [0.05, 0.1, 0.3]:
+            expected_supports, expected_rules = apriori(
+                data_set, min_support, 0.5, OrderedType.LEXICAL_ASCENDING
+            )
+            for trimming in [TrimmingType.TRIM, TrimmingType.TRIM_WEIGHTED]:
+                supports, rules = apriori(
+                    data_set,
+                    min_support,
+                    0.5,
+                    OrderedType.LEXICAL_ASCENDING,
+                    trimming=trimming,
+                )
+                self.assertEqual(supports, expected_supports)
+                self.assertEqual(rules, expected_rules)
+
+    def test_counting_types(self):
+        rng = random.Random(2)
+        data_set = [set(rng.sample(range(15), rng.randint(1, 8))) for _ in range(300)]
+        data_set += [set(range(7))] * 20
+
+        for min_support in [0.05, 0.2]:
+            expected_supports, expected_rules = apriori(data_set, min_support, 0.5)
+            for counting in [CountingType.TRIE, CountingType.KEYS]:
+                for trimming in [TrimmingType.NONE, TrimmingType.TRIM_WEIGHTED]:
+                    # При малом пороге длинные транзакции при KEYS подсчитываются
+                    # префиксным деревом
+                    with patch("apriori.KEYS_MAX_SUBSETS", 16):
+                        supports, rules = apriori(
+                            data_set,
+                            min_support,
+                            0.5,
+                            counting=counting,
+                            trimming=trimming,
+                        )
+                    self.assertEqual(supports, expected_supports)
+                    self.assertEqual(frozenset(rules), frozenset(expected_rules))
+
+    def test_output_types(self):
+        rng = random.Random(3)
+        data_set = [set(rng.sample(range(10), rng.randint(1, 6))) for _ in range(200)]
+        data_set += [{0, 1, 2, 3}] * 30
+
+        for min_support in [0.05, 0.2]:
+            L, expected_rules = apriori(data_set, min_support, 0.5)
+            item_sets = {s: v for Lk in L for s, v in Lk.items()}
+            supersets = {
+                s: [t for t in item_sets if len(t) == len(s) + 1 and s < t]
+                for s in item_sets
+            }
+            expected_closed = {
+                s
+                for s, v in item_sets.items()
+                if all(item_sets[t] != v for t in supersets[s])
+            }
+            expected_maximal = {s for s in item_sets if not supersets[s]}
+
+            for n_jobs in [1, 2]:
+                closed, rules = apriori(
+                    data_set,
+                    min_support,
+                    0.5,
+                    n_jobs=n_jobs,
+                    output=OutputType.CLOSED,
+                )
+                self.assertEqual({s for Lk in closed for s in Lk}, expected_closed)
+                self.assertEqual(expand_closed(closed), L)
+                self.assertEqual(frozenset(rules), frozenset(expected_rules))
+
+                maximal, _ = apriori(
+                    data_set,
+                    min_support,
+                    None,
+                    n_jobs=n_jobs,
+                    output=OutputType.MAXIMAL,
+                )
+                self.assertEqual({s for Lk in maximal for s in Lk}, expected_maximal)
+
+        with self.assertRaises(ValueError):
+            apriori(data_set, 0.2, 0.5, output=OutputType.MAXIMAL)
+
+    def test_iter_levels(self):
+        rng = random.Random(4)
+        data_set = [set(rng.sample(range(10), rng.randint(1, 6))) for _ in range(200)]
+        expected_supports, expected_rules = apriori(data_set, 0.05, 0.5)
+
+        for counting in [CountingType.SCAN, CountingType.BITSET]:
+            levels = list(iter_levels(data_set, 0.05, counting=counting))
+            self.assertEqual(levels, expected_supports)
+
+        self.assertEqual(
+            list(iter_levels(data_set, 0.05, max_len=2)), expected_supports[:2]
+        )
+        levels = list(iter_levels(data_set, 0.05, max_item_sets=15))
+        self.assertEqual(sum(map(len, levels)), 15)
+        self.assertEqual(levels[0], expected_supports[0])
+        self.assertEqual(len(list(iter_levels(data_set, 0.05, timeout=0))), 1)
+
+        # Обрезанный уровень содержит наборы с наибольшей поддержкой
+        n_first = len(expected_supports[0])
+        levels = list(
+            iter_levels(
+                data_set,
+                0.05,
+                OrderedType.SUPPORT_DESCENDING,
+                max_item_sets=n_first + 5,
+            )
+        )
+        self.assertEqual(len(levels), 2)
+        self.assertEqual(len(levels[1]), 5)
+        strongest = sorted(expected_supports[1].values(), reverse=True)[:5]
+        self.assertEqual(list(levels[1].values()), strongest)
+
+        # Уровни ищутся только по запросу
+        stats = MiningStats()
+        next(iter_levels(data_set, 0.05, stats=stats))
+        self.assertEqual(len(stats.levels), 1)
+
+    def test_iter_rules(self):
+        rng = random.Random(5)
+        data_set = [set(rng.sample(range(10), rng.randint(1, 6))) for _ in range(200)]
+        _, expected_rules = apriori(data_set, 0.05, 0.5)
+
+        rules = list(iter_rules(iter_levels(data_set, 0.05), 0.5))
+        self.assertEqual(len(rules), len(expected_rules))
+        self.assertEqual(frozenset(rules), frozenset(expected_rules))
+
+        best = top_rules(iter_levels(data_set, 0.05), 0.5, 10)
+        self.assertEqual(len(best), 10)
+        self.assertEqual(
+            best.confidence.tolist(),
+            expected_rules.sorted_by("confidence").confidence[:10].tolist(),
+        )
+        best = top_rules(iter_levels(data_set, 0.05), 0.5, 5, "lift")
+        self.assertEqual(
+            best.lift.tolist(), expected_rules.sorted_by("lift").lift[:5].tolist()
+        )
+
+    def test_sampling(self):
+        rng = random.Random(6)
+        data_set = [set(rng.sample(range(12), rng.randint(1, 6))) for _ in range(400)]
+        data_set += [{0, 1, 2}] * 100
+        expected_supports, expected_rules = apriori(data_set, 0.1, 0.5)
+
+        stats = MiningStats()
+        supports, rules = apriori(
+            data_set, 0.1, 0.5, sample_fraction=0.5, seed=0, stats=stats
+        )
+        self.assertTrue(stats.sampling.verified)
+        self.assertGreater(stats.sampling.n_negative_border, 0)
+        # Без промахов результат точный, иначе найдено подмножество точного
+        found = {s: v for Lk in supports for s, v in Lk.items()}
+        expected = {s: v for Lk in expected_supports for s, v in Lk.items()}
+        self.assertTrue(found.items() <= expected.items())
+        if stats.sampling.exact:
+            self.assertEqual(supports, expected_supports)
+            self.assertEqual(frozenset(rules), frozenset(expected_rules))
+        self.assertTrue(all(miss in expected for miss in stats.sampling.misses))
+
+        # В выборку из 5 транзакций не попадает часть частых элементов
+        stats = MiningStats()
+        apriori(data_set, 0.001, None, sample_fraction=0.01, seed=0, stats=stats)
+        self.assertTrue(stats.sampling.misses)
+        self.assertFalse(stats.sampling.exact)
+
+        stats = MiningStats()
+        supports, _ = apriori(
+            data_set,
+            0.1,
+            None,
+            sample_fraction=0.5,
+            sampling=SamplingType.APPROXIMATE,
+            seed=0,
+            stats=stats,
+        )
+        self.assertFalse(stats.sampling.verified)
+        for item_set, support in supports[0].items():
+            self.assertLessEqual(
+                abs(support - expected_supports[0].get(item_set, 0.0)),
+                stats.sampling.epsilon,
+            )
+
+        with self.assertRaises(ValueError):
+            apriori(data_set, 0.1, None, sample_fraction=0)
+
     def _convert_apyori_result(self, apyori_result):
         apyori_adapted = []
         k = 1
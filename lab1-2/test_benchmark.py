@@ -0,0 +1,44 @@
+import unittest
+from apriori import apriori
+from benchmark import compare_results, generate_transactions, run_benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_generate_transactions(self):
+        transactions = generate_transactions(500, 8, 50, seed=1)
+        self.assertEqual(len(transactions), 500)
+        self.assertEqual(transactions, generate_transactions(500, 8, 50, seed=1))
+        self.assertTrue(all(item in range(50) for t in transactions for item in t))
+
+        average = sum(map(len, transactions)) / len(transactions)
+        self.assertGreater(average, 4)
+        self.assertLess(average, 12)
+
+        # Шаблоны дают часто встречающиеся наборы длины больше 1
+        item_sets, _ = apriori(transactions, 0.05, None)
+        self.assertGreater(len(item_sets), 1)
+
+        # Средняя длина больше количества элементов, шаблоны полностью искажаются
+        transactions = generate_transactions(50, 10, 5)
+        self.assertTrue(all(len(t) <= 5 for t in transactions))
+        transactions = generate_transactions(50, 5, 20, corruption=1.0)
+        self.assertEqual(len(transactions), 50)
+
+    def test_compare_results(self):
+        data_sets = [{"n_transactions": 200, "avg_length": 5, "n_items": 20}]
+        baseline = run_benchmark({"apriori": apriori}, data_sets, [0.1], repeat=1)
+        self.assertEqual(len(baseline), 1)
+        self.assertEqual(compare_results(baseline, baseline), [])
+
+        slower = [dict(baseline[0], time=baseline[0]["time"] * 2)]
+        self.assertEqual(compare_results(baseline, slower)[0]["reason"], "time")
+
+        changed = [dict(baseline[0], n_item_sets=[])]
+        self.assertEqual(compare_results(baseline, changed)[0]["reason"], "result")
+
+        other = [dict(baseline[0], min_support=0.2, time=1e9)]
+        self.assertEqual(compare_results(baseline, other), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from apriori import _sort_items, apriori, OrderedType
+from itemsets import ItemSetTable
+
+
+class TestItemSetTable(unittest.TestCase):
+    data_set = [
+        {"a", "b", "c"},
+        {"a", "b"},
+        {"a", "c"},
+        {"b", "c", "d"},
+        {"a", "b", "c", "d"},
+        {"a", "d"},
+    ]
+
+    def test_round_trip(self):
+        L, _ = apriori(self.data_set, 0.3, None)
+        table = ItemSetTable.from_levels(L)
+        self.assertEqual(table.to_levels(), L)
+        self.assertEqual(len(table), sum(len(Lk) for Lk in L))
+        self.assertEqual(
+            dict(table), {item_set: s for Lk in L for item_set, s in Lk.items()}
+        )
+        self.assertEqual(table.vocabulary, ["a", "b", "c", "d"])
+        self.assertGreater(table.nbytes, 0)
+
+    def test_orders(self):
+        L, _ = apriori(self.data_set, 0.3, None)
+        for order in OrderedType:
+            table, rules = apriori(self.data_set, 0.3, 0.5, order, as_table=True)
+            self.assertIsInstance(table, ItemSetTable)
+            levels = table.to_levels()
+            expected = [_sort_items(Lk, order) for Lk in L]
+            self.assertEqual(levels, expected)
+            if order in (OrderedType.LEXICAL_ASCENDING, OrderedType.LEXICAL_DESCENDING):
+                # Порядок наборов внутри уровня тоже должен совпадать
+                self.assertEqual(
+                    [list(Lk) for Lk in levels], [list(Lk) for Lk in expected]
+                )
+            else:
+                # Равные поддержки _sort_items() оставляет в порядке поиска
+                self.assertEqual(
+                    [list(Lk.values()) for Lk in levels],
+                    [list(Lk.values()) for Lk in expected],
+                )
+            self.assertEqual(
+                frozenset(rules), frozenset(apriori(self.data_set, 0.3, 0.5, order)[1])
+            )
+
+    def test_support(self):
+        table, _ = apriori(self.data_set, 0.3, None, as_table=True)
+        self.assertAlmostEqual(table.support({"a", "b"}), 0.5)
+        self.assertAlmostEqual(table.support(["c", "b"]), 0.5)
+        self.assertIsNone(table.support({"a", "d", "b"}))
+        self.assertIsNone(table.support({"x"}))
+        self.assertIsNone(table.support(set()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from apriori import OrderedType, apriori, fpgrowth
+from mining import MiningCache, MiningResult, sweep
+
+
+class TestMining(unittest.TestCase):
+    data_set = [
+        {"хлеб", "молоко"},
+        {"хлеб", "печенье", "пиво", "яйца"},
+        {"молоко", "печенье", "пиво", "кола"},
+        {"хлеб", "молоко", "печенье", "пиво"},
+        {"хлеб", "молоко", "печенье", "кола"},
+    ]
+
+    def test_query(self):
+        result = MiningResult.mine(self.data_set, 0.2)
+        for min_support in [0.2, 0.4, 0.6, 0.8, 1.0]:
+            for confidence_threshold in [0.1, 0.5, 0.9]:
+                supports, rules = result.query(
+                    min_support, confidence_threshold, OrderedType.LEXICAL_ASCENDING
+                )
+                expected_supports, expected_rules = apriori(
+                    self.data_set,
+                    min_support,
+                    confidence_threshold,
+                    OrderedType.LEXICAL_ASCENDING,
+                )
+                self.assertEqual(supports, expected_supports)
+                self.assertEqual(frozenset(rules), frozenset(expected_rules))
+
+        with self.assertRaises(ValueError):
+            result.query(0.1, 0.5)
+
+    def test_sweep(self):
+        results = sweep(self.data_set, [0.4, 0.6], [0.5, 0.9], fpgrowth)
+        self.assertEqual(len(results), 4)
+        supports, rules = results[(0.6, 0.9)]
+        expected_supports, expected_rules = apriori(self.data_set, 0.6, 0.9)
+        self.assertEqual(supports, expected_supports)
+        self.assertEqual(frozenset(rules), frozenset(expected_rules))
+
+    def test_cache(self):
+        cache = MiningCache(maxsize=2)
+        loads = []
+
+        def load():
+            loads.append(1)
+            return self.data_set
+
+        first = cache.get("baskets", load, 0.4)
+        self.assertIs(cache.get("baskets", load, 0.6), first)
+        self.assertEqual(len(loads), 1)
+
+        cache.get("baskets", load, 0.2)
+        cache.get("other", load, 0.2)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(len(loads), 3)
+        # Результат с порогом 0.4 вытеснен, запрос обслуживается порогом 0.2
+        self.assertEqual(cache.get("baskets", load, 0.4).min_support, 0.2)
+
+    def test_update(self):
+        increment = [{"кола", "яйца"}, {"хлеб", "кола", "яйца"}]
+        result = MiningResult.mine(self.data_set, 0.2).update(self.data_set, increment)
+        self.assertEqual(result.n_transactions, 7)
+        with self.assertRaises(ValueError):
+            result.update(self.data_set, increment)
+
+        expected_supports, expected_rules = apriori(self.data_set + increment, 0.4, 0.5)
+        supports, rules = result.query(0.4, 0.5)
+        self.assertEqual(supports, expected_supports)
+        self.assertEqual(frozenset(rules), frozenset(expected_rules))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import numpy as np
+import os
+import tempfile
+import unittest
+from apriori import apriori
+from ruleindex import RuleIndex, load_rule_index
+from rules import RuleSet
+from unittest.mock import patch
+
+
+class TestRuleIndex(unittest.TestCase):
+    data_set = [
+        {"a", "b", "c"},
+        {"a", "b"},
+        {"a", "c"},
+        {"b", "c", "d"},
+        {"a", "b", "c", "d"},
+        {"a", "d"},
+    ]
+    baskets = [{"a"}, {"a", "b"}, {"b", "c", "d"}, {"x", "d"}, set()]
+
+    def setUp(self):
+        _, self.rules = apriori(self.data_set, 0.3, 0.3)
+        self.index = RuleIndex.from_rules(self.rules)
+
+    def expected(self, basket, metric="confidence", skip_owned=False):
+        """Подходящие правила полным перебором."""
+        rules = self.rules.sorted_by(metric)
+        return [
+            rule
+            for rule in rules
+            if rule[0] <= basket and not (skip_owned and rule[1] <= basket)
+        ]
+
+    def test_query(self):
+        for basket in self.baskets:
+            for metric in ("confidence", "lift"):
+                self.assertEqual(
+                    self.index.query(basket, metric), self.expected(basket, metric)
+                )
+            self.assertEqual(
+                self.index.query(basket, skip_owned=True),
+                self.expected(basket, skip_owned=True),
+            )
+        top = self.index.query({"a", "b"}, "lift", n=3)
+        self.assertEqual(top, self.expected({"a", "b"}, "lift")[:3])
+        self.assertTrue(np.all(np.diff(top.lift) <= 0))
+        with self.assertRaises(ValueError):
+            self.index.query({"a"}, "unknown")
+
+    def test_query_batch(self):
+        # Несколько блоков корзин
+        with patch("ruleindex.QUERY_BLOCK_CELLS", 2 * len(self.index)):
+            results = self.index.query_batch(self.baskets * 3, n=4)
+        self.assertEqual(len(results), 15)
+        for basket, result in zip(self.baskets * 3, results):
+            self.assertEqual(result, self.expected(basket)[:4])
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_dir = os.path.join(tmp_dir, "rules.index")
+            self.index.save(index_dir)
+            for mmap in (True, False):
+                loaded = load_rule_index(index_dir, mmap)
+                self.assertEqual(len(loaded), len(self.rules))
+                for basket in self.baskets:
+                    self.assertEqual(loaded.query(basket), self.expected(basket))
+                np.testing.assert_array_equal(
+                    loaded.query({"a", "b"}).lift,
+                    self.index.query({"a", "b"}).lift,
+                )
+
+            RuleIndex.from_rules(RuleSet.empty()).save(index_dir)
+            self.assertEqual(len(load_rule_index(index_dir).query({"a"})), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import math
+import numpy as np
+import unittest
+from apriori import _generate_rules, apriori
+from itertools import combinations
+from rules import RuleSet
+
+
+class TestRuleSet(unittest.TestCase):
+    data_set = [
+        {"a", "b", "c"},
+        {"a", "b"},
+        {"a", "c"},
+        {"b", "c", "d"},
+        {"a", "b", "c", "d"},
+        {"a", "d"},
+    ]
+
+    def test_generate_rules(self):
+        L, _ = apriori(self.data_set, 0.3, None)
+        supports = {
+            item_set: support for level in L for item_set, support in level.items()
+        }
+
+        # Полный перебор всех разбиений каждого набора
+        expected = set()
+        for item_set, support in supports.items():
+            for k in range(1, len(item_set)):
+                for antecedent in map(frozenset, combinations(item_set, k)):
+                    confidence = support / supports[antecedent]
+                    if confidence >= 0.5:
+                        expected.add((antecedent, item_set - antecedent))
+
+        rules = _generate_rules(L, 0.5)
+        self.assertEqual({(a, c) for a, c, _ in rules}, expected)
+
+    def test_metrics(self):
+        L, rules = apriori(self.data_set, 0.3, 0.5)
+        supports = {
+            item_set: support for level in L for item_set, support in level.items()
+        }
+
+        for i, (antecedent, consequent, confidence) in enumerate(rules):
+            s_i = supports[antecedent | consequent]
+            s_a = supports[antecedent]
+            s_c = supports[consequent]
+            self.assertAlmostEqual(rules.support[i], s_i)
+            self.assertAlmostEqual(confidence, s_i / s_a)
+            self.assertAlmostEqual(rules.lift[i], s_i / s_a / s_c)
+            self.assertAlmostEqual(rules.leverage[i], s_i - s_a * s_c)
+            if confidence < 1.0:
+                self.assertAlmostEqual(
+                    rules.conviction[i], (1 - s_c) / (1 - confidence)
+                )
+            else:
+                self.assertTrue(math.isinf(rules.conviction[i]))
+
+    def test_indexing(self):
+        _, rules = apriori(self.data_set, 0.3, 0.5)
+        self.assertIsInstance(rules, RuleSet)
+        self.assertEqual(rules[0], rules.to_list()[0])
+        self.assertEqual(len(rules[:2]), 2)
+        self.assertEqual(len(rules[rules.lift > 1.0]), int(np.sum(rules.lift > 1.0)))
+
+        by_lift = rules.sorted_by("lift")
+        self.assertTrue(np.all(np.diff(by_lift.lift) <= 0))
+        self.assertEqual(frozenset(by_lift), frozenset(rules))
+
+        upper = rules.map_items(str.upper)
+        self.assertEqual(
+            frozenset(upper),
+            frozenset(
+                (frozenset(map(str.upper, a)), frozenset(map(str.upper, c)), conf)
+                for a, c, conf in rules
+            ),
+        )
+
+    def test_empty(self):
+        _, rules = apriori(self.data_set, 0.3, None)
+        self.assertEqual(len(rules), 0)
+        self.assertEqual(rules, [])
+
+    def test_concat(self):
+        _, rules = apriori(self.data_set, 0.3, 0.5)
+        self.assertEqual(RuleSet.concat([rules[:2], rules[2:]]), rules)
+        np.testing.assert_array_equal(
+            RuleSet.concat([rules[2:], rules[:2]]).lift,
+            np.concatenate([rules.lift[2:], rules.lift[:2]]),
+        )
+        self.assertEqual(len(RuleSet.concat([])), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import unittest
+from apriori import apriori, iter_levels, CountingType
+from tabular import ItemMatrix
+from unittest.mock import patch
+
+
+class TestItemMatrix(unittest.TestCase):
+    data = pd.DataFrame(
+        {
+            "color": ["red", "red", "blue", "green", "red", "blue", None, "red"],
+            "size": [1, 2, 3, 4, 5, 6, 7, 8],
+            "flag": [True, False, True, True, False, True, True, False],
+            "grade": [1, 2, 1, 2, 1, 2, 1, 1],
+        }
+    )
+
+    def transactions(self, data, bins=2):
+        """Транзакции таблицы, построенные построчно без битовой матрицы."""
+        size = pd.qcut(data["size"], bins)
+        rows = []
+        for i, row in data.iterrows():
+            row_items = {f"size={size[i]}", f"grade={row['grade']}"}
+            if pd.notna(row["color"]):
+                row_items.add(f"color={row['color']}")
+            if row["flag"]:
+                row_items.add("flag")
+            rows.append(row_items)
+        return rows
+
+    def test_from_frame(self):
+        matrix = ItemMatrix.from_frame(self.data, bins=2)
+        self.assertEqual(len(matrix), len(self.data))
+        self.assertIn("color=red", matrix.vocabulary)
+        self.assertIn("flag", matrix.vocabulary)
+        # Столбец с двумя значениями не разбивается на интервалы
+        self.assertIn("grade=1", matrix.vocabulary)
+        self.assertEqual(
+            sum(label.startswith("size=") for label in matrix.vocabulary), 2
+        )
+
+        expected = self.transactions(self.data)
+        decoded = [{matrix.vocabulary[i] for i in row} for row in matrix]
+        self.assertEqual(decoded, expected)
+        self.assertEqual(matrix[2], list(matrix)[2])
+        self.assertEqual(matrix[-1], list(matrix)[-1])
+        self.assertEqual(matrix[1:3], list(matrix)[1:3])
+        with self.assertRaises(IndexError):
+            matrix[len(self.data)]
+
+        edges = ItemMatrix.from_frame(self.data, bins={"size": [0, 4, 10]})
+        self.assertIn("size=[0, 4)", edges.vocabulary)
+        self.assertIn("size=[4, 10)", edges.vocabulary)
+
+    def test_labels(self):
+        matrix = ItemMatrix.from_frame(self.data[["flag", "grade"]])
+        # Булев столбец даёт предмет без значения, остальные - "столбец=значение"
+        self.assertEqual(matrix.vocabulary, ["flag", "grade=1", "grade=2"])
+
+        data = pd.DataFrame(
+            {"flag": pd.array([True, None, False], dtype="boolean"), "grade": [1, 1, 2]}
+        )
+        matrix = ItemMatrix.from_frame(data)
+        self.assertEqual(matrix.vocabulary, ["flag", "grade=1", "grade=2"])
+        self.assertEqual(list(matrix), [{0, 1}, {1}, {2}])
+
+    def test_iter_chunks(self):
+        with patch("tabular.CHUNK_SIZE", 3):
+            chunked = list(ItemMatrix.from_frame(self.data, bins=2))
+        self.assertEqual(chunked, list(ItemMatrix.from_frame(self.data, bins=2)))
+
+    def test_from_array(self):
+        array = np.array([[1, 1, 0], [1, 0, 1], [1, 1, 1], [0, 0, 0]], dtype=bool)
+        matrix = ItemMatrix.from_array(array, ["a", "b", "c"])
+        self.assertEqual(list(matrix), [{0, 1}, {0, 2}, {0, 1, 2}, set()])
+        self.assertEqual(matrix.tidsets(), {0: 0b0111, 1: 0b0101, 2: 0b0110})
+        with self.assertRaises(ValueError):
+            ItemMatrix.from_array(array, ["a"])
+
+        L, _ = apriori(array, 0.5, None)
+        self.assertEqual(L[1], {frozenset({0, 1}): 0.5, frozenset({0, 2}): 0.5})
+
+    def test_apriori(self):
+        expected_L, expected_rules = apriori(self.transactions(self.data), 0.25, 0.5)
+        matrix = ItemMatrix.from_frame(self.data, bins=2)
+        for counting in CountingType:
+            L, rules = apriori(matrix, 0.25, 0.5, counting=counting)
+            self.assertEqual(L, expected_L)
+            self.assertEqual(frozenset(rules), frozenset(expected_rules))
+        L, _ = apriori(matrix, 0.25, None, n_jobs=2)
+        self.assertEqual(L, expected_L)
+        self.assertEqual(list(iter_levels(matrix, 0.25)), expected_L)
+
+        # Таблица разбивается с DEFAULT_BINS интервалами
+        L, _ = apriori(self.data, 0.25, None)
+        self.assertEqual(L[0][frozenset({"flag"})], 5 / 8)
+        self.assertEqual(L[0][frozenset({"color=red"})], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from apriori import CountingType, apriori
+from transactions import (
+    decode_item_sets,
+    decode_rules,
+    iter_transaction_chunks,
+    load_transaction_store,
+    load_transactions,
+)
+
+
+class TestTransactions(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", encoding="windows-1251", newline="") as file:
+            file.write("заголовок,строка\n")
+            file.write("хлеб,молоко,,\n")
+            file.write("хлеб,печенье,пиво,яйца\n")
+            file.write("\n")
+            file.write("молоко,\n")
+
+    def tearDown(self):
+        os.remove(self.filename)
+        shutil.rmtree(f"{self.filename}.cache", ignore_errors=True)
+
+    def test_load_transactions(self):
+        transactions, items = load_transactions(self.filename)
+        self.assertEqual(items, ["хлеб", "молоко", "печенье", "пиво", "яйца"])
+        self.assertEqual(
+            transactions, [frozenset([0, 1]), frozenset([0, 2, 3, 4]), frozenset([1])]
+        )
+
+    def test_iter_transaction_chunks(self):
+        vocabulary = {}
+        chunks = list(iter_transaction_chunks(self.filename, vocabulary, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(len(vocabulary), 5)
+
+    def test_transaction_store(self):
+        transactions, items = load_transactions(self.filename)
+        store = load_transaction_store(self.filename)
+        self.assertEqual(store.vocabulary, items)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(list(store), transactions)
+        self.assertEqual(store[1], transactions[1])
+        self.assertEqual(store[-1], transactions[-1])
+        self.assertEqual(store[:2], transactions[:2])
+        self.assertEqual(
+            store.tidsets(), {0: 0b011, 1: 0b101, 2: 0b010, 3: 0b010, 4: 0b010}
+        )
+
+        for counting in [CountingType.SCAN, CountingType.BITSET]:
+            self.assertEqual(
+                apriori(store, 0.3, 0.5, counting=counting),
+                apriori(transactions, 0.3, 0.5, counting=counting),
+            )
+
+    def test_transaction_store_cache(self):
+        store_dir = f"{self.filename}.cache"
+        load_transaction_store(self.filename)
+        items_mtime = os.stat(os.path.join(store_dir, "items.bin")).st_mtime_ns
+
+        # Изменилось только время модификации - кэш используется повторно
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        load_transaction_store(self.filename)
+        self.assertEqual(
+            os.stat(os.path.join(store_dir, "items.bin")).st_mtime_ns, items_mtime
+        )
+
+        # Изменилось содержимое - кэш пересоздаётся
+        with open(self.filename, "a", encoding="windows-1251") as file:
+            file.write("кола,хлеб\n")
+        store = load_transaction_store(self.filename)
+        self.assertEqual(len(store), 4)
+        self.assertEqual(store[3], frozenset([store.vocabulary.index("кола"), 0]))
+
+    def test_decode(self):
+        items = ["хлеб", "молоко"]
+        self.assertEqual(
+            decode_item_sets([{frozenset([0]): 0.5}, {frozenset([0, 1]): 0.25}], items),
+            [{frozenset(["хлеб"]): 0.5}, {frozenset(["хлеб", "молоко"]): 0.25}],
+        )
+        self.assertEqual(
+            decode_rules([(frozenset([0]), frozenset([1]), 0.5)], items),
+            [(frozenset(["хлеб"]), frozenset(["молоко"]), 0.5)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
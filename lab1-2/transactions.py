@@ -0,0 +1,422 @@
+import csv
+import hashlib
+import json
+import numpy as np
+import os
+from rules import RuleSet
+import shutil
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+
+DEFAULT_ENCODING: str = "windows-1251"
+
+# Размер буфера чтения файла
+BUFFER_SIZE: int = 1 << 20
+
+# Количество транзакций в одной порции при потоковом чтении
+CHUNK_SIZE: int = 10000
+
+# Формат файлов кэша транзакций (увеличивается при несовместимых изменениях)
+STORE_VERSION: int = 1
+
+
+def iter_transaction_chunks(
+    filename: str,
+    vocabulary: Dict[str, int],
+    chunk_size: int = CHUNK_SIZE,
+    encoding: str = DEFAULT_ENCODING,
+    skip_header: bool = True,
+) -> Iterator[List[FrozenSet[int]]]:
+    """Потоково читает csv-файл с транзакциями разной длины и возвращает их порциями.
+
+    Каждый предмет заменяется целочисленным идентификатором из словаря vocabulary,
+    новые предметы добавляются в словарь с очередным номером. В памяти
+    одновременно находится не больше chunk_size транзакций, поэтому так можно
+    обрабатывать файлы, которые не помещаются в оперативную память.
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+        vocabulary (Dict[str, int]): Словарь предметов, пополняется при чтении.
+        chunk_size (int): Максимальное количество транзакций в порции.
+        encoding (str): Кодировка файла.
+        skip_header (bool): Пропускать первую строку файла (как pd.read_csv).
+
+    Возвращает:
+        Iterator[List[FrozenSet[int]]]: Порции транзакций из идентификаторов предметов.
+    """
+    with open(filename, encoding=encoding, newline="", buffering=BUFFER_SIZE) as file:
+        reader = csv.reader(file)
+        if skip_header:
+            next(reader, None)
+
+        chunk: List[FrozenSet[int]] = []
+        for row in reader:
+            # Пустые строки пропускаются, пустые ячейки - отсутствующие предметы
+            if not row:
+                continue
+            chunk.append(
+                frozenset(
+                    vocabulary.setdefault(item, len(vocabulary)) for item in row if item
+                )
+            )
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def iter_transactions(
+    filename: str,
+    vocabulary: Dict[str, int],
+    encoding: str = DEFAULT_ENCODING,
+    skip_header: bool = True,
+) -> Iterator[FrozenSet[int]]:
+    """Потоково читает csv-файл и возвращает транзакции по одной.
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+        vocabulary (Dict[str, int]): Словарь предметов, пополняется при чтении.
+        encoding (str): Кодировка файла.
+        skip_header (bool): Пропускать первую строку файла.
+
+    Возвращает:
+        Iterator[FrozenSet[int]]: Транзакции из идентификаторов предметов.
+    """
+    for chunk in iter_transaction_chunks(
+        filename, vocabulary, encoding=encoding, skip_header=skip_header
+    ):
+        yield from chunk
+
+
+def load_transactions(
+    filename: str, encoding: str = DEFAULT_ENCODING, skip_header: bool = True
+) -> Tuple[List[FrozenSet[int]], List[str]]:
+    """Загружает все транзакции csv-файла в память.
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+        encoding (str): Кодировка файла.
+        skip_header (bool): Пропускать первую строку файла.
+
+    Возвращает:
+        Tuple[List[FrozenSet[int]], List[str]]: Транзакции из идентификаторов
+            предметов и список предметов (предмет с идентификатором i на i-й позиции).
+    """
+    vocabulary: Dict[str, int] = {}
+    transactions = list(iter_transactions(filename, vocabulary, encoding, skip_header))
+    return transactions, list(vocabulary)
+
+
+def decode_item_sets(
+    item_sets: List[Dict[FrozenSet[int], float]], items: List[Any]
+) -> List[Dict[FrozenSet[Any], float]]:
+    """Заменяет идентификаторы в часто встречающихся наборах предметами.
+
+    Аргументы:
+        item_sets (List[Dict[FrozenSet[int], float]]): Результат работы алгоритма.
+        items (List[Any]): Список предметов.
+
+    Возвращает:
+        List[Dict[FrozenSet[Any], float]]: Часто встречающиеся наборы предметов.
+    """
+    return [
+        {
+            frozenset(items[item] for item in item_set): support
+            for item_set, support in level.items()
+        }
+        for level in item_sets
+    ]
+
+
+def decode_rules(
+    rules: Union[RuleSet, List[Tuple[FrozenSet[int], FrozenSet[int], float]]],
+    items: List[Any],
+) -> Union[RuleSet, List[Tuple[FrozenSet[Any], FrozenSet[Any], float]]]:
+    """Заменяет идентификаторы в ассоциативных правилах предметами.
+
+    Аргументы:
+        rules (Union[RuleSet, List[Tuple[FrozenSet[int], FrozenSet[int], float]]]): Правила
+            в формате (предпосылка, заключение, уверенность).
+        items (List[Any]): Список предметов.
+
+    Возвращает:
+        Union[RuleSet, List[Tuple[FrozenSet[Any], FrozenSet[Any], float]]]: Правила из
+            предметов (RuleSet, если на входе RuleSet).
+    """
+    if isinstance(rules, RuleSet):
+        return rules.map_items(items.__getitem__)
+    return [
+        (
+            frozenset(items[item] for item in antecedent),
+            frozenset(items[item] for item in consequent),
+            confidence,
+        )
+        for antecedent, consequent, confidence in rules
+    ]
+
+
+class TransactionStore:
+    """Транзакции в сжатом построчном формате (CSR), отображённые в память.
+
+    Предметы i-й транзакции - это items[offsets[i]:offsets[i + 1]], а
+    vocabulary[j] - предмет с идентификатором j. Транзакции читаются с диска
+    по мере обращения к ним, поэтому хранилище может быть больше оперативной памяти.
+    """
+
+    def __init__(self, offsets: np.ndarray, items: np.ndarray, vocabulary: List[str]):
+        self.offsets = offsets
+        self.items = items
+        self.vocabulary = vocabulary
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[FrozenSet[int], List[FrozenSet[int]]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        return frozenset(
+            self.items[self.offsets[index] : self.offsets[index + 1]].tolist()
+        )
+
+    def __iter__(self) -> Iterator[FrozenSet[int]]:
+        for start in range(0, len(self), CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, len(self))
+            offsets = self.offsets[start : stop + 1]
+            items = self.items[offsets[0] : offsets[-1]].tolist()
+            offsets = (offsets - offsets[0]).tolist()
+            for i in range(stop - start):
+                yield frozenset(items[offsets[i] : offsets[i + 1]])
+
+    def tidsets(self) -> Dict[int, int]:
+        """Строит битовые множества идентификаторов транзакций (TID) для каждого
+        предмета напрямую по массивам хранилища, порциями по CHUNK_SIZE транзакций.
+
+        Возвращает:
+            Dict[int, int]: Словарь, где ключи - предметы, а значения - их битовые множества TID.
+        """
+        n_transactions = len(self)
+        n_bytes = (n_transactions + 7) // 8
+        packed: Dict[int, np.ndarray] = {}
+
+        # Размер порции кратен 8, чтобы порции не делили байты битовых множеств
+        chunk_size = (CHUNK_SIZE + 7) // 8 * 8
+        for start in range(0, n_transactions, chunk_size):
+            stop = min(start + chunk_size, n_transactions)
+            offsets = np.asarray(self.offsets[start : stop + 1])
+            items = np.asarray(self.items[offsets[0] : offsets[-1]])
+            tids = np.repeat(np.arange(start, stop, dtype=np.int64), np.diff(offsets))
+
+            order = np.argsort(items, kind="stable")
+            items, tids = items[order], tids[order]
+            unique, bounds = np.unique(items, return_index=True)
+            for item, begin, end in zip(
+                unique.tolist(), bounds, np.append(bounds[1:], len(items))
+            ):
+                if item not in packed:
+                    packed[item] = np.zeros(n_bytes, dtype=np.uint8)
+                item_tids = tids[begin:end]
+                np.bitwise_or.at(
+                    packed[item],
+                    item_tids >> 3,
+                    np.left_shift(1, item_tids & 7).astype(np.uint8),
+                )
+
+        return {
+            item: int.from_bytes(packed.pop(item).tobytes(), "little")
+            for item in sorted(packed)
+        }
+
+
+def _file_hash(filename: str) -> str:
+    """Вычисляет хэш содержимого файла.
+
+    Аргументы:
+        filename (str): Имя файла.
+
+    Возвращает:
+        str: Хэш SHA-256 в шестнадцатеричном виде.
+    """
+    file_hash = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(BUFFER_SIZE), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+def build_transaction_store(
+    filename: str,
+    store_dir: str,
+    encoding: str = DEFAULT_ENCODING,
+    skip_header: bool = True,
+):
+    """Преобразует csv-файл с транзакциями в хранилище формата CSR.
+
+    Файл читается потоково, поэтому его размер не ограничен объёмом памяти.
+    Хранилище состоит из файлов offsets.bin (int64), items.bin (int32),
+    vocabulary.json и meta.json со сведениями об исходном файле.
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+        store_dir (str): Каталог хранилища.
+        encoding (str): Кодировка файла.
+        skip_header (bool): Пропускать первую строку файла.
+    """
+    # Собираем хранилище во временном каталоге и подменяем им старое целиком
+    tmp_dir = f"{store_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    stat = os.stat(filename)
+    vocabulary: Dict[str, int] = {}
+    n_transactions = 0
+    n_items = 0
+    with open(os.path.join(tmp_dir, "offsets.bin"), "wb") as offsets_file, open(
+        os.path.join(tmp_dir, "items.bin"), "wb"
+    ) as items_file:
+        np.zeros(1, dtype=np.int64).tofile(offsets_file)
+        for chunk in iter_transaction_chunks(
+            filename, vocabulary, encoding=encoding, skip_header=skip_header
+        ):
+            lengths = np.fromiter((len(t) for t in chunk), np.int64, len(chunk))
+            (n_items + np.cumsum(lengths)).tofile(offsets_file)
+            np.fromiter(
+                (item for transaction in chunk for item in sorted(transaction)),
+                np.int32,
+                int(lengths.sum()),
+            ).tofile(items_file)
+            n_transactions += len(chunk)
+            n_items += int(lengths.sum())
+
+    with open(os.path.join(tmp_dir, "vocabulary.json"), "w", encoding="utf-8") as file:
+        json.dump(list(vocabulary), file, ensure_ascii=False)
+    meta = {
+        "version": STORE_VERSION,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_size": stat.st_size,
+        "source_hash": _file_hash(filename),
+        "encoding": encoding,
+        "skip_header": skip_header,
+        "n_transactions": n_transactions,
+        "n_items": n_items,
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+
+
+def open_transaction_store(store_dir: str) -> TransactionStore:
+    """Открывает хранилище транзакций без копирования данных в память (np.memmap).
+
+    Аргументы:
+        store_dir (str): Каталог хранилища.
+
+    Возвращает:
+        TransactionStore: Хранилище транзакций.
+    """
+    with open(os.path.join(store_dir, "meta.json"), encoding="utf-8") as file:
+        meta = json.load(file)
+    with open(os.path.join(store_dir, "vocabulary.json"), encoding="utf-8") as file:
+        vocabulary = json.load(file)
+
+    offsets = np.memmap(
+        os.path.join(store_dir, "offsets.bin"),
+        dtype=np.int64,
+        mode="r",
+        shape=(meta["n_transactions"] + 1,),
+    )
+    # Пустой файл нельзя отобразить в память
+    if meta["n_items"]:
+        items = np.memmap(
+            os.path.join(store_dir, "items.bin"),
+            dtype=np.int32,
+            mode="r",
+            shape=(meta["n_items"],),
+        )
+    else:
+        items = np.zeros(0, dtype=np.int32)
+    return TransactionStore(offsets, items, vocabulary)
+
+
+def _is_store_valid(
+    filename: str, store_dir: str, encoding: str, skip_header: bool
+) -> bool:
+    """Проверяет, что хранилище построено по текущему содержимому csv-файла.
+
+    Если время изменения файла не совпадает с сохранённым, но хэш содержимого
+    совпадает, хранилище считается актуальным и сохранённое время обновляется.
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+        store_dir (str): Каталог хранилища.
+        encoding (str): Кодировка файла.
+        skip_header (bool): Пропускать первую строку файла.
+
+    Возвращает:
+        bool: True, если хранилище можно использовать.
+    """
+    meta_path = os.path.join(store_dir, "meta.json")
+    try:
+        with open(meta_path, encoding="utf-8") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return False
+
+    stat = os.stat(filename)
+    if (
+        meta.get("version") != STORE_VERSION
+        or meta.get("encoding") != encoding
+        or meta.get("skip_header") != skip_header
+        or meta.get("source_size") != stat.st_size
+    ):
+        return False
+    if meta.get("source_mtime_ns") == stat.st_mtime_ns:
+        return True
+    if meta.get("source_hash") != _file_hash(filename):
+        return False
+
+    meta["source_mtime_ns"] = stat.st_mtime_ns
+    with open(meta_path, "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+    return True
+
+
+def load_transaction_store(
+    filename: str,
+    encoding: str = DEFAULT_ENCODING,
+    skip_header: bool = True,
+    store_dir: Optional[str] = None,
+) -> TransactionStore:
+    """Открывает кэш транзакций csv-файла, при необходимости (пере)создавая его.
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+        encoding (str): Кодировка файла.
+        skip_header (bool): Пропускать первую строку файла.
+        store_dir (Optional[str]): Каталог хранилища (по умолчанию <filename>.cache).
+
+    Возвращает:
+        TransactionStore: Хранилище транзакций.
+    """
+    if store_dir is None:
+        store_dir = f"{filename}.cache"
+    if not _is_store_valid(filename, store_dir, encoding, skip_header):
+        build_transaction_store(filename, store_dir, encoding, skip_header)
+    return open_transaction_store(store_dir)
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import numpy as np
+import os
+import pandas as pd
+from typing import Dict, List, Optional
+
+
+# Формат кэша закодированных данных (увеличивается при несовместимых изменениях)
+CACHE_VERSION: int = 1
+
+# Размер буфера чтения файла при вычислении хэша
+BUFFER_SIZE: int = 1 << 20
+
+# Значения категориальных столбцов. Значение кодируется своей позицией в списке,
+# увеличенной на единицу, а пропуск "?" - нулём
+NON_DUMMY_COLUMNS: Dict[str, List[str]] = {
+    "workclass": [
+        "Private",
+        "Self-emp-not-inc",
+        "Self-emp-inc",
+        "Federal-gov",
+        "Local-gov",
+        "State-gov",
+        "Without-pay",
+        "Never-worked",
+    ],
+    "education": [
+        "Bachelors",
+        "Some-college",
+        "11th",
+        "HS-grad",
+        "Prof-school",
+        "Assoc-acdm",
+        "Assoc-voc",
+        "9th",
+        "7th-8th",
+        "12th",
+        "Masters",
+        "1st-4th",
+        "10th",
+        "Doctorate",
+        "5th-6th",
+        "Preschool",
+    ],
+    "marital-status": [
+        "Married-civ-spouse",
+        "Divorced",
+        "Never-married",
+        "Separated",
+        "Widowed",
+        "Married-spouse-absent",
+        "Married-AF-spouse",
+    ],
+    "occupation": [
+        "Tech-support",
+        "Craft-repair",
+        "Other-service",
+        "Sales",
+        "Exec-managerial",
+        "Prof-specialty",
+        "Handlers-cleaners",
+        "Machine-op-inspct",
+        "Adm-clerical",
+        "Farming-fishing",
+        "Transport-moving",
+        "Priv-house-serv",
+        "Protective-serv",
+        "Armed-Forces",
+    ],
+    "relationship": [
+        "Wife",
+        "Own-child",
+        "Husband",
+        "Not-in-family",
+        "Other-relative",
+        "Unmarried",
+    ],
+    "race": ["White", "Asian-Pac-Islander", "Amer-Indian-Eskimo", "Other", "Black"],
+    "sex": ["Female", "Male"],
+    "native-country": [
+        "United-States",
+        "Cambodia",
+        "England",
+        "Puerto-Rico",
+        "Canada",
+        "Germany",
+        "Outlying-US(Guam-USVI-etc)",
+        "India",
+        "Japan",
+        "Greece",
+        "South",
+        "China",
+        "Cuba",
+        "Iran",
+        "Honduras",
+        "Philippines",
+        "Italy",
+        "Poland",
+        "Jamaica",
+        "Vietnam",
+        "Mexico",
+        "Portugal",
+        "Ireland",
+        "France",
+        "Dominican-Republic",
+        "Laos",
+        "Ecuador",
+        "Taiwan",
+        "Haiti",
+        "Columbia",
+        "Hungary",
+        "Guatemala",
+        "Nicaragua",
+        "Scotland",
+        "Thailand",
+        "Yugoslavia",
+        "El-Salvador",
+        "Trinadad&Tobago",
+        "Peru",
+        "Hong",
+        "Holand-Netherlands",
+    ],
+    "salary": ["<=50K", ">50K"],
+}
+
+NON_DUMMY_COLUMNS_MAPPINGS: Dict[str, Dict[str, int]] = {
+    col: {value: idx for idx, value in enumerate(["?"] + values)}
+    for col, values in NON_DUMMY_COLUMNS.items()
+}
+
+
+def read_adult(filename: str) -> pd.DataFrame:
+    """Читает csv-файл набора adult.
+
+    Значения в файле разделены запятой с пробелом. Разделитель ", " pandas
+    разбирает только медленным движком python, поэтому файл читается движком C
+    с разделителем "," и пропуском начальных пробелов. Категориальные столбцы
+    сразу получают тип category с категориями из NON_DUMMY_COLUMNS.
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+
+    Возвращает:
+        pd.DataFrame: Исходные данные.
+    """
+    return pd.read_csv(
+        filename,
+        sep=",",
+        skipinitialspace=True,
+        engine="c",
+        dtype={
+            col: pd.CategoricalDtype(["?"] + values)
+            for col, values in NON_DUMMY_COLUMNS.items()
+        },
+    )
+
+
+def encode_adult(data: pd.DataFrame) -> pd.DataFrame:
+    """Заменяет значения категориальных столбцов номерами из
+    NON_DUMMY_COLUMNS_MAPPINGS.
+
+    Номер значения совпадает с кодом категории, поэтому замена выполняется
+    без поиска по словарю: берутся коды cat.codes.
+
+    Аргументы:
+        data (pd.DataFrame): Данные, прочитанные read_adult().
+
+    Возвращает:
+        pd.DataFrame: Данные из целых чисел (int64).
+    """
+    data_dummy = data.copy()
+    for col in NON_DUMMY_COLUMNS:
+        codes = data[col].cat.codes
+        # Значения не из списка стали бы NaN, как и при замене словарём
+        if (codes < 0).any():
+            rows = np.flatnonzero(codes.to_numpy() < 0)
+            raise ValueError(
+                f"column {col} has values missing from NON_DUMMY_COLUMNS "
+                f"in rows {rows[:5].tolist()}"
+            )
+        data_dummy[col] = codes.astype(np.int64)
+    return data_dummy.astype(np.int64)
+
+
+def _cache_key(filename: str) -> str:
+    """Вычисляет ключ кэша: хэш содержимого файла, формата и словарей кодирования.
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+
+    Возвращает:
+        str: Хэш SHA-256 в шестнадцатеричном виде.
+    """
+    key = hashlib.sha256()
+    key.update(json.dumps([CACHE_VERSION, NON_DUMMY_COLUMNS]).encode("utf-8"))
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(BUFFER_SIZE), b""):
+            key.update(block)
+    return key.hexdigest()
+
+
+def load_adult_dummy(filename: str, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """Возвращает закодированные данные набора adult, используя кэш.
+
+    Матрица данных хранится в <cache_dir>/<ключ>.npy, имена столбцов - в
+    <cache_dir>/<ключ>.json, где ключ - хэш содержимого файла (см. _cache_key()).
+    При совпадении ключа матрица отображается в память (np.load(mmap_mode="r")),
+    поэтому повторная загрузка не разбирает csv-файл. Таблица только для чтения:
+    для изменения её нужно скопировать (data.copy()).
+
+    Аргументы:
+        filename (str): Имя csv-файла.
+        cache_dir (Optional[str]): Каталог кэша (по умолчанию <filename>.cache).
+
+    Возвращает:
+        pd.DataFrame: Данные из целых чисел (int64), как encode_adult().
+    """
+    if cache_dir is None:
+        cache_dir = f"{filename}.cache"
+    key = _cache_key(filename)
+    matrix_path = os.path.join(cache_dir, f"{key}.npy")
+    columns_path = os.path.join(cache_dir, f"{key}.json")
+
+    if not (os.path.exists(matrix_path) and os.path.exists(columns_path)):
+        data_dummy = encode_adult(read_adult(filename))
+        # Записи для прежнего содержимого файла больше не нужны
+        if os.path.isdir(cache_dir):
+            for name in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, name))
+        os.makedirs(cache_dir, exist_ok=True)
+        # Столбцы записываются последними: их наличие означает, что запись полная
+        np.save(matrix_path, data_dummy.to_numpy())
+        with open(columns_path, "w", encoding="utf-8") as file:
+            json.dump(list(data_dummy.columns), file)
+
+    with open(columns_path, encoding="utf-8") as file:
+        columns = json.load(file)
+    return pd.DataFrame(
+        np.load(matrix_path, mmap_mode="r"), columns=columns, copy=False
+    )
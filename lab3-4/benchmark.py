@@ -0,0 +1,153 @@
+from adult import load_adult_dummy
+import argparse
+from experiments import TECHNIQUES
+from models import MODEL_DIR, load_or_train_model
+import numpy as np
+import pandas as pd
+import sys
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+
+# Размеры порций предсказания по умолчанию (1 - задержка одной строки)
+BATCH_SIZES: List[int] = [1, 10, 100, 1000, 10000]
+
+# Значения n_jobs моделей по умолчанию (-1 - все ядра)
+N_JOBS: List[int] = [1, 2, -1]
+
+# Наибольшее количество измеряемых порций для одного размера
+MAX_BATCHES: int = 100
+
+
+def measure_inference(
+    model: Any, x: np.ndarray, batch_size: int, max_batches: int = MAX_BATCHES
+) -> Dict[str, float]:
+    """Измеряет время предсказания модели порциями по batch_size строк.
+
+    Перед измерением выполняется одно предсказание, чтобы исключить из
+    времени запуск пула потоков или процессов модели.
+
+    Аргументы:
+        model (Any): Обученный классификатор.
+        x (np.ndarray): Признаки тестовых данных.
+        batch_size (int): Количество строк в порции.
+        max_batches (int): Наибольшее количество порций.
+
+    Возвращает:
+        Dict[str, float]: Количество порций n_batches, медианное latency и
+            95-процентильное p95_latency время порции (секунды) и пропускная
+            способность throughput (строк в секунду).
+    """
+    starts = range(0, min(len(x), batch_size * max_batches), batch_size)
+    model.predict(x[:batch_size])
+
+    times = []
+    n_rows = 0
+    for start in starts:
+        batch = x[start : start + batch_size]
+        begin = perf_counter()
+        model.predict(batch)
+        times.append(perf_counter() - begin)
+        n_rows += len(batch)
+
+    return {
+        "n_batches": len(times),
+        "latency": float(np.median(times)),
+        "p95_latency": float(np.percentile(times, 95)),
+        "throughput": n_rows / sum(times),
+    }
+
+
+def run_benchmark(
+    models: Dict[str, Any],
+    x: np.ndarray,
+    batch_sizes: List[int] = BATCH_SIZES,
+    n_jobs: List[int] = N_JOBS,
+    max_batches: int = MAX_BATCHES,
+    verbose: bool = False,
+) -> pd.DataFrame:
+    """Перебирает модели, значения n_jobs и размеры порций и измеряет каждое
+    сочетание.
+
+    Модели без параметра n_jobs (бустинг, дерево решений) измеряются один раз
+    для каждого размера порции, их n_jobs в результатах равен None.
+
+    Аргументы:
+        models (Dict[str, Any]): Обученные классификаторы по названиям.
+        x (np.ndarray): Признаки тестовых данных.
+        batch_sizes (List[int]): Размеры порций.
+        n_jobs (List[int]): Значения параметра n_jobs моделей.
+        max_batches (int): Наибольшее количество порций одного размера.
+        verbose (bool): Выводить результаты по мере измерения.
+
+    Возвращает:
+        pd.DataFrame: Строки с названием модели technique, n_jobs, batch_size и
+            результатами measure_inference().
+    """
+    records = []
+    for name, model in models.items():
+        parallel = "n_jobs" in model.get_params()
+        for jobs in n_jobs if parallel else [None]:
+            if parallel:
+                model.set_params(n_jobs=jobs)
+            for batch_size in batch_sizes:
+                record = {"technique": name, "n_jobs": jobs, "batch_size": batch_size}
+                record.update(measure_inference(model, x, batch_size, max_batches))
+                if verbose:
+                    print(
+                        f"{name:14} n_jobs={jobs} batch_size={batch_size}: "
+                        f"{record['latency'] * 1000:.3f} мс, "
+                        f"{record['throughput']:.0f} строк/с"
+                    )
+                records.append(record)
+    # Столбец n_jobs с None остаётся целочисленным
+    return pd.DataFrame(records).astype({"n_jobs": "Int64"})
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Замер времени предсказания ансамблей на adult.test.csv"
+    )
+    parser.add_argument("--train", default="adult.data.csv", help="обучающие данные")
+    parser.add_argument("--test", default="adult.test.csv", help="тестовые данные")
+    parser.add_argument(
+        "-e",
+        "--technique",
+        action="append",
+        choices=TECHNIQUES,
+        help="классификатор (по умолчанию все ансамбли)",
+    )
+    parser.add_argument("-n", "--n-estimators", type=int, default=100)
+    parser.add_argument("-b", "--batch-size", type=int, action="append")
+    parser.add_argument("-j", "--n-jobs", type=int, action="append")
+    parser.add_argument("-m", "--max-batches", type=int, default=MAX_BATCHES)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("-o", "--output", help="csv-файл для сохранения результатов")
+    args = parser.parse_args(argv)
+
+    data = load_adult_dummy(args.train)
+    x = load_adult_dummy(args.test).drop("salary", axis=1).to_numpy()
+
+    models = {}
+    for technique in args.technique or ["bagging", "random_forest", "boosting"]:
+        start = perf_counter()
+        models[technique] = load_or_train_model(
+            data, technique, args.n_estimators, model_dir=args.model_dir
+        )
+        print(f"{technique:14} загрузка/обучение: {perf_counter() - start:.3f} с")
+
+    results = run_benchmark(
+        models,
+        x,
+        args.batch_size or BATCH_SIZES,
+        args.n_jobs or N_JOBS,
+        args.max_batches,
+        verbose=True,
+    )
+    if args.output:
+        results.to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product, repeat
+import numpy as np
+import os
+import pandas as pd
+from sklearn.ensemble import (
+    BaggingClassifier,
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+from sklearn.model_selection import train_test_split
+from sklearn.tree import DecisionTreeClassifier
+import tempfile
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+
+# Классификаторы: одиночное дерево решений и ансамбли из lab4
+TECHNIQUES: List[str] = ["tree", "bagging", "random_forest", "boosting"]
+
+# Метрики качества классификатора в результатах run_experiments()
+SCORES: List[str] = ["accuracy", "precision", "recall", "f1"]
+
+# Части разбиения, сохраняемые в отдельные файлы <номер разбиения>_<часть>.npy
+_SPLIT_PARTS: List[str] = ["x_train", "x_test", "y_train", "y_test"]
+
+
+class Experiment(NamedTuple):
+    """Конфигурация эксперимента. Параметр, не влияющий на классификатор
+    (критерий у ансамблей, количество деревьев у дерева), равен None."""
+
+    criterion: Optional[str]
+    test_size: float
+    technique: str
+    n_estimators: Optional[int]
+
+
+def make_model(
+    technique: str,
+    criterion: Optional[str] = None,
+    n_estimators: Optional[int] = None,
+    random_state: Optional[int] = None,
+) -> Any:
+    """Создаёт классификатор.
+
+    Аргументы:
+        technique (str): Классификатор из TECHNIQUES.
+        criterion (Optional[str]): Критерий разбиения дерева решений.
+        n_estimators (Optional[int]): Количество классификаторов ансамбля.
+        random_state (Optional[int]): Начальное значение генератора классификатора.
+
+    Возвращает:
+        Any: Необученный классификатор scikit-learn.
+    """
+    if technique == "tree":
+        return DecisionTreeClassifier(criterion=criterion, random_state=random_state)
+    elif technique == "bagging":
+        return BaggingClassifier(n_estimators=n_estimators, random_state=random_state)
+    elif technique == "random_forest":
+        return RandomForestClassifier(
+            n_estimators=n_estimators, random_state=random_state
+        )
+    elif technique == "boosting":
+        return GradientBoostingClassifier(
+            n_estimators=n_estimators, random_state=random_state
+        )
+    raise ValueError(f"unknown technique: {technique}")
+
+
+def make_grid(
+    criteria: Iterable[str],
+    test_sizes: Iterable[float],
+    techniques: Iterable[str],
+    n_estimators: Iterable[int],
+) -> List[Experiment]:
+    """Строит сетку экспериментов без повторов.
+
+    Критерий используется только деревом решений, а количество классификаторов -
+    только ансамблями, поэтому остальные сочетания совпадают и выполняются один раз.
+
+    Аргументы:
+        criteria (Iterable[str]): Критерии разбиения дерева решений.
+        test_sizes (Iterable[float]): Доли тестовой выборки.
+        techniques (Iterable[str]): Классификаторы из TECHNIQUES.
+        n_estimators (Iterable[int]): Количества классификаторов ансамбля.
+
+    Возвращает:
+        List[Experiment]: Конфигурации экспериментов.
+    """
+    grid: Dict[Experiment, None] = {}
+    for criterion, test_size, technique, n in product(
+        criteria, test_sizes, techniques, n_estimators
+    ):
+        if technique not in TECHNIQUES:
+            raise ValueError(f"unknown technique: {technique}")
+        tree = technique == "tree"
+        experiment = Experiment(
+            criterion if tree else None, test_size, technique, None if tree else n
+        )
+        grid.setdefault(experiment)
+    return list(grid)
+
+
+def _load_split(split_prefix: str) -> Dict[str, np.ndarray]:
+    """Отображает в память части разбиения, сохранённые _save_splits().
+
+    Аргументы:
+        split_prefix (str): Путь к файлам разбиения без суффикса _<часть>.npy.
+
+    Возвращает:
+        Dict[str, np.ndarray]: Части разбиения (только для чтения).
+    """
+    return {
+        part: np.load(f"{split_prefix}_{part}.npy", mmap_mode="r")
+        for part in _SPLIT_PARTS
+    }
+
+
+def _run_experiment(
+    split_prefix: str, experiment: Experiment, random_state: Optional[int]
+) -> Dict[str, Any]:
+    """Обучает и проверяет классификатор одной конфигурации (в процессе пула).
+
+    Аргументы:
+        split_prefix (str): Путь к файлам разбиения для experiment.test_size.
+        experiment (Experiment): Конфигурация эксперимента.
+        random_state (Optional[int]): Начальное значение генератора классификатора.
+
+    Возвращает:
+        Dict[str, Any]: Конфигурация, время обучения и предсказания, метрики.
+    """
+    split = _load_split(split_prefix)
+    model = make_model(
+        experiment.technique,
+        experiment.criterion,
+        experiment.n_estimators,
+        random_state,
+    )
+
+    start = perf_counter()
+    model.fit(split["x_train"], split["y_train"])
+    fit_end = perf_counter()
+    y_pred = model.predict(split["x_test"])
+    predict_end = perf_counter()
+
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        split["y_test"], y_pred, average="binary"
+    )
+    return {
+        **experiment._asdict(),
+        "fit_time": fit_end - start,
+        "predict_time": predict_end - fit_end,
+        "accuracy": accuracy_score(split["y_test"], y_pred),
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+    }
+
+
+def _save_splits(
+    data: pd.DataFrame,
+    test_sizes: Iterable[float],
+    split_dir: str,
+    target: str,
+    random_state: Optional[int],
+) -> Dict[float, str]:
+    """Разбивает данные на обучающую и тестовую выборки по одному разу для
+    каждой доли тестовой выборки и сохраняет части в файлы .npy.
+
+    Аргументы:
+        data (pd.DataFrame): Данные.
+        test_sizes (Iterable[float]): Доли тестовой выборки.
+        split_dir (str): Каталог файлов разбиений.
+        target (str): Столбец с классом.
+        random_state (Optional[int]): Начальное значение генератора разбиения.
+
+    Возвращает:
+        Dict[float, str]: Путь к файлам разбиения (без суффикса) для каждой доли.
+    """
+    x = data.drop(target, axis=1).to_numpy()
+    y = data[target].to_numpy()
+    prefixes: Dict[float, str] = {}
+    for i, test_size in enumerate(dict.fromkeys(test_sizes)):
+        prefixes[test_size] = os.path.join(split_dir, str(i))
+        parts = train_test_split(x, y, test_size=test_size, random_state=random_state)
+        for part, array in zip(_SPLIT_PARTS, parts):
+            np.save(f"{prefixes[test_size]}_{part}.npy", array)
+    return prefixes
+
+
+def run_experiments(
+    data: pd.DataFrame,
+    criteria: Iterable[str] = ("log_loss",),
+    test_sizes: Iterable[float] = (0.2,),
+    techniques: Iterable[str] = ("tree",),
+    n_estimators: Iterable[int] = (100,),
+    n_jobs: Optional[int] = None,
+    target: str = "salary",
+    split_random_state: Optional[int] = 42,
+    model_random_state: Optional[int] = None,
+) -> pd.DataFrame:
+    """Проводит эксперименты по сетке конфигураций в пуле процессов.
+
+    Каждая доля тестовой выборки разбивается один раз (как train_test_split в
+    train_decision_tree() и calculate_metrics() с тем же random_state), части
+    разбиения сохраняются во временный каталог, и процессы пула отображают их
+    в память, не копируя данные при передаче.
+
+    Аргументы:
+        data (pd.DataFrame): Закодированные данные (например, load_adult_dummy()).
+        criteria (Iterable[str]): Критерии разбиения дерева решений.
+        test_sizes (Iterable[float]): Доли тестовой выборки.
+        techniques (Iterable[str]): Классификаторы из TECHNIQUES.
+        n_estimators (Iterable[int]): Количества классификаторов ансамбля.
+        n_jobs (Optional[int]): Количество процессов (None или -1 - все ядра,
+            1 - без пула процессов).
+        target (str): Столбец с классом.
+        split_random_state (Optional[int]): Начальное значение генератора разбиения.
+        model_random_state (Optional[int]): Начальное значение генератора
+            классификаторов.
+
+    Возвращает:
+        pd.DataFrame: Строка для каждой конфигурации из make_grid(): параметры,
+            время обучения fit_time и предсказания predict_time (секунды),
+            accuracy, precision, recall, f1.
+    """
+    grid = make_grid(criteria, test_sizes, techniques, n_estimators)
+    if n_jobs is None or n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs must be positive, got {n_jobs}")
+
+    # Под Windows файл, ещё отображённый в память, нельзя удалить сразу
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as split_dir:
+        prefixes = _save_splits(
+            data,
+            [experiment.test_size for experiment in grid],
+            split_dir,
+            target,
+            split_random_state,
+        )
+        args = (
+            [prefixes[experiment.test_size] for experiment in grid],
+            grid,
+            repeat(model_random_state),
+        )
+        if n_jobs == 1 or len(grid) <= 1:
+            results = list(map(_run_experiment, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(grid))) as executor:
+                results = list(executor.map(_run_experiment, *args))
+
+    return pd.DataFrame(
+        results,
+        columns=list(Experiment._fields) + ["fit_time", "predict_time"] + SCORES,
+    )
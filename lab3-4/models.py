@@ -0,0 +1,81 @@
+from experiments import make_model
+import joblib
+import os
+import pandas as pd
+from typing import Any, Optional
+
+
+# Каталог сохранённых моделей по умолчанию
+MODEL_DIR: str = "models"
+
+
+def save_model(model: Any, filename: str):
+    """Сохраняет обученную модель в файл joblib.
+
+    Файл записывается без сжатия: только тогда массивы NumPy модели можно
+    отобразить в память при загрузке (см. load_model()).
+
+    Аргументы:
+        model (Any): Обученный классификатор scikit-learn.
+        filename (str): Имя файла.
+    """
+    # Записываем во временный файл и подменяем им старый целиком
+    tmp_filename = f"{filename}.tmp"
+    joblib.dump(model, tmp_filename)
+    os.replace(tmp_filename, filename)
+
+
+def load_model(filename: str, mmap: bool = True) -> Any:
+    """Загружает модель, сохранённую save_model().
+
+    Аргументы:
+        filename (str): Имя файла.
+        mmap (bool): Отображать массивы NumPy модели в память (mmap_mode="r")
+            вместо чтения. Узлы деревьев scikit-learn при восстановлении всё
+            равно копируются, а массивы вне деревьев (например, веса и
+            признаки ансамбля) остаются в файле.
+
+    Возвращает:
+        Any: Обученный классификатор.
+    """
+    return joblib.load(filename, mmap_mode="r" if mmap else None)
+
+
+def load_or_train_model(
+    data: pd.DataFrame,
+    technique: str,
+    n_estimators: Optional[int] = 100,
+    criterion: Optional[str] = "log_loss",
+    model_dir: str = MODEL_DIR,
+    target: str = "salary",
+    random_state: Optional[int] = None,
+) -> Any:
+    """Загружает сохранённую модель или обучает её на всех данных и сохраняет.
+
+    Файл модели <model_dir>/<technique>_<ключ>.joblib, где ключ - хэш
+    joblib.hash() данных и параметров модели, поэтому при изменении данных
+    или параметров модель обучается заново. Модель обучается на массиве
+    NumPy, без имён признаков.
+
+    Аргументы:
+        data (pd.DataFrame): Закодированные данные (например, load_adult_dummy()).
+        technique (str): Классификатор из TECHNIQUES (см. make_model()).
+        n_estimators (Optional[int]): Количество классификаторов ансамбля.
+        criterion (Optional[str]): Критерий разбиения дерева решений.
+        model_dir (str): Каталог сохранённых моделей.
+        target (str): Столбец с классом.
+        random_state (Optional[int]): Начальное значение генератора классификатора.
+
+    Возвращает:
+        Any: Обученный классификатор.
+    """
+    key = joblib.hash((data, target, technique, criterion, n_estimators, random_state))
+    filename = os.path.join(model_dir, f"{technique}_{key}.joblib")
+    if os.path.exists(filename):
+        return load_model(filename)
+
+    model = make_model(technique, criterion, n_estimators, random_state)
+    model.fit(data.drop(target, axis=1).to_numpy(), data[target].to_numpy())
+    os.makedirs(model_dir, exist_ok=True)
+    save_model(model, filename)
+    return model
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+import adult
+from adult import NON_DUMMY_COLUMNS_MAPPINGS, load_adult_dummy
+from unittest.mock import patch
+
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def encode_adult_mapping(filename):
+    """Кодирование из исходных тетрадей: разделитель ", " и замена словарём."""
+    data_dummy = pd.read_csv(filename, sep=", ", engine="python")
+    for col, mapping in NON_DUMMY_COLUMNS_MAPPINGS.items():
+        data_dummy[col] = data_dummy[col].map(mapping)
+    return data_dummy
+
+
+class TestAdult(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_mapping_equivalence(self):
+        for name in ["adult.data.csv", "adult.test.csv"]:
+            with self.subTest(name=name):
+                filename = os.path.join(DATA_DIR, name)
+                cache_dir = os.path.join(self.tmp_dir, name)
+                pd.testing.assert_frame_equal(
+                    load_adult_dummy(filename, cache_dir),
+                    encode_adult_mapping(filename),
+                )
+
+    def test_cache(self):
+        filename = os.path.join(self.tmp_dir, "adult.csv")
+        with open(os.path.join(DATA_DIR, "adult.data.csv"), encoding="utf-8") as src:
+            lines = src.readlines()[:101]
+        with open(filename, "w", encoding="utf-8") as file:
+            file.writelines(lines)
+
+        expected = load_adult_dummy(filename, self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        # Повторная загрузка не разбирает csv-файл
+        with patch("adult.read_adult", wraps=adult.read_adult) as read_adult:
+            data = load_adult_dummy(filename, self.cache_dir)
+        read_adult.assert_not_called()
+        pd.testing.assert_frame_equal(data, expected)
+        del data, expected
+
+        # После изменения файла кэш строится заново, старые записи удаляются
+        old_entries = set(os.listdir(self.cache_dir))
+        with open(filename, "w", encoding="utf-8") as file:
+            file.writelines(lines[:51])
+        with patch("adult.read_adult", wraps=adult.read_adult) as read_adult:
+            data = load_adult_dummy(filename, self.cache_dir)
+        read_adult.assert_called_once()
+        self.assertEqual(len(data), 50)
+        entries = set(os.listdir(self.cache_dir))
+        self.assertEqual(len(entries), 2)
+        self.assertFalse(entries & old_entries)
+        pd.testing.assert_frame_equal(data, encode_adult_mapping(filename))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import unittest
+import experiments
+from adult import load_adult_dummy
+from experiments import make_grid, run_experiments
+from unittest.mock import patch
+
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestExperiments(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = load_adult_dummy(os.path.join(DATA_DIR, "adult.data.csv"))[:2000]
+
+    def test_make_grid(self):
+        grid = make_grid(["gini", "entropy"], [0.2], ["tree", "bagging"], [5, 10])
+        self.assertEqual(len(grid), 4)
+        with self.assertRaises(ValueError):
+            make_grid(["gini"], [0.2], ["svm"], [5])
+
+    def test_n_jobs(self):
+        kwargs = dict(
+            criteria=["gini", "entropy"],
+            test_sizes=[0.2, 0.5, 0.2],
+            techniques=["tree", "random_forest"],
+            n_estimators=[5],
+            model_random_state=0,
+        )
+        results = {}
+        for n_jobs in [1, 2]:
+            with patch(
+                "experiments.train_test_split", wraps=experiments.train_test_split
+            ) as split:
+                results[n_jobs] = run_experiments(self.data, n_jobs=n_jobs, **kwargs)
+            # Каждая доля тестовой выборки разбивается один раз
+            self.assertEqual(split.call_count, 2)
+
+        self.assertEqual(len(results[1]), 6)
+        columns = ["criterion", "test_size", "technique", "n_estimators"]
+        columns += experiments.SCORES
+        self.assertTrue(results[1][columns].equals(results[2][columns]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import models
+from adult import load_adult_dummy
+from benchmark import run_benchmark
+from experiments import make_model
+from models import load_model, load_or_train_model, save_model
+from unittest.mock import patch
+
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestModels(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data = load_adult_dummy(os.path.join(DATA_DIR, "adult.data.csv"))
+        cls.data = data[:2000]
+        cls.x = data.drop("salary", axis=1).to_numpy()[2000:2500]
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def test_save_load(self):
+        model = make_model("random_forest", n_estimators=5, random_state=0)
+        model.fit(self.data.drop("salary", axis=1).to_numpy(), self.data["salary"])
+        filename = os.path.join(self.model_dir, "model.joblib")
+        save_model(model, filename)
+        self.assertEqual(os.listdir(self.model_dir), ["model.joblib"])
+
+        expected = model.predict_proba(self.x)
+        for mmap in [True, False]:
+            with self.subTest(mmap=mmap):
+                loaded = load_model(filename, mmap)
+                np.testing.assert_array_equal(loaded.predict_proba(self.x), expected)
+
+    def test_load_or_train(self):
+        model = load_or_train_model(
+            self.data, "bagging", 5, model_dir=self.model_dir, random_state=0
+        )
+        self.assertEqual(len(os.listdir(self.model_dir)), 1)
+        # Повторный вызов с теми же параметрами загружает модель из файла
+        with patch("models.make_model", wraps=models.make_model) as make:
+            loaded = load_or_train_model(
+                self.data, "bagging", 5, model_dir=self.model_dir, random_state=0
+            )
+        make.assert_not_called()
+        np.testing.assert_array_equal(loaded.predict(self.x), model.predict(self.x))
+
+        load_or_train_model(
+            self.data, "bagging", 6, model_dir=self.model_dir, random_state=0
+        )
+        self.assertEqual(len(os.listdir(self.model_dir)), 2)
+
+    def test_benchmark(self):
+        trained = {
+            technique: load_or_train_model(
+                self.data, technique, 5, model_dir=self.model_dir, random_state=0
+            )
+            for technique in ["random_forest", "boosting"]
+        }
+        results = run_benchmark(trained, self.x, [1, 100], [1, 2], max_batches=3)
+        self.assertEqual(
+            list(results.columns),
+            [
+                "technique",
+                "n_jobs",
+                "batch_size",
+                "n_batches",
+                "latency",
+                "p95_latency",
+                "throughput",
+            ],
+        )
+        # Бустинг без параметра n_jobs измеряется один раз для каждого размера
+        self.assertEqual(len(results), 6)
+        boosting = results[results["technique"] == "boosting"]
+        self.assertTrue(boosting["n_jobs"].isna().all())
+        self.assertEqual(str(results["n_jobs"].dtype), "Int64")
+        self.assertEqual(results["n_batches"].tolist(), [3, 3, 3, 3, 3, 3])
+        for column in ["latency", "p95_latency", "throughput"]:
+            self.assertTrue((results[column] > 0).all())
+        self.assertTrue((results["p95_latency"] >= results["latency"]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()